@@ -0,0 +1,319 @@
+# bid_document.py
+import os
+import re
+import subprocess
+import sys
+import csv
+import io
+from xml.sax.saxutils import escape
+from concurrent.futures import ThreadPoolExecutor, CancelledError, as_completed
+from datetime import datetime
+from docx import Document
+from docx.shared import Inches
+from docx.enum.text import WD_ALIGN_PARAGRAPH
+from docx.oxml import parse_xml
+from docx.oxml.ns import nsdecls
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+
+class ExportCancelled(Exception):
+    """Raised inside a render when the user cancels the export."""
+
+
+def _check(cancel_event):
+    if cancel_event is not None and cancel_event.is_set():
+        raise ExportCancelled()
+
+
+def _report(progress, fraction, message):
+    if progress:
+        progress(fraction, message)
+
+
+# Column widths of the bid table in twentieths of a point (0.5", 3.5", 2.0")
+BID_TABLE_COLUMN_TWIPS = (720, 5040, 2880)
+
+_INVALID_XML_CHARS = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f]")
+
+
+def _run_xml(text, run_properties=""):
+    """Returns a ``w:r`` for ``text`` with tabs and line breaks like ``cell.text``."""
+    parts = []
+    for line_index, line in enumerate(re.split(r"\r\n|\r|\n", _INVALID_XML_CHARS.sub("", text))):
+        if line_index:
+            parts.append("<w:br/>")
+        for tab_index, chunk in enumerate(line.split("\t")):
+            if tab_index:
+                parts.append("<w:tab/>")
+            if chunk:
+                parts.append(f'<w:t xml:space="preserve">{escape(chunk)}</w:t>')
+    return f"<w:r>{run_properties}{''.join(parts)}</w:r>"
+
+
+def _bid_table_xml(rows, style_id, header_color_hex):
+    """Generates the whole bid table as one ``w:tbl`` string.
+
+    Building the XML in a single pass and parsing it once keeps large WOs
+    linear, instead of python-docx re-walking the tree for every cell.
+    """
+    widths = BID_TABLE_COLUMN_TWIPS
+    header_rpr = '<w:rPr><w:b/><w:color w:val="FFFFFF"/></w:rPr>'
+    header_cells = "".join(
+        f'<w:tc><w:tcPr><w:tcW w:type="dxa" w:w="{width}"/>'
+        f'<w:shd w:val="clear" w:color="auto" w:fill="{header_color_hex}"/></w:tcPr>'
+        f'<w:p>{_run_xml(text, header_rpr)}</w:p></w:tc>'
+        for width, text in zip(widths, ['SL No.', 'Bids', 'Photos'])
+    )
+
+    parts = [
+        f'<w:tbl {nsdecls("w")}><w:tblPr><w:tblStyle w:val="{escape(style_id)}"/>'
+        '<w:tblW w:type="auto" w:w="0"/><w:tblLayout w:type="fixed"/>'
+        '<w:tblLook w:firstColumn="1" w:firstRow="1" w:lastColumn="0" w:lastRow="0" '
+        'w:noHBand="0" w:noVBand="1" w:val="04A0"/></w:tblPr><w:tblGrid>',
+        "".join(f'<w:gridCol w:w="{width}"/>' for width in widths),
+        f'</w:tblGrid><w:tr>{header_cells}</w:tr>',
+    ]
+    for number, text in rows:
+        parts.append(
+            f'<w:tr><w:tc><w:tcPr><w:tcW w:type="dxa" w:w="{widths[0]}"/></w:tcPr><w:p>{_run_xml(number)}</w:p></w:tc>'
+            f'<w:tc><w:tcPr><w:tcW w:type="dxa" w:w="{widths[1]}"/></w:tcPr><w:p>{_run_xml(text)}</w:p></w:tc>'
+            f'<w:tc><w:tcPr><w:tcW w:type="dxa" w:w="{widths[2]}"/></w:tcPr><w:p/></w:tc></w:tr>'
+        )
+    parts.append('</w:tbl>')
+    return "".join(parts)
+
+
+def build_bid_document(bids, wo_number="", header_color_hex="1e3a5f", progress=None, cancel_event=None):
+    """Builds the bid proposal Word document without touching any Tk widgets.
+
+    ``bids`` is a list of ``(bid_text, photo)`` pairs where ``bid_text`` is the
+    numbered bid ("1. ...") and ``photo`` is a PIL image or None.
+    """
+    doc = Document()
+
+    if wo_number:
+        doc.add_heading(f"Techvengers Bid Proposal - WO# {wo_number}", 0)
+    else:
+        doc.add_heading('Techvengers Bid Proposal', 0)
+
+    doc.paragraphs[-1].alignment = WD_ALIGN_PARAGRAPH.CENTER
+
+    date_paragraph = doc.add_paragraph(f'Date: {datetime.now().strftime("%B %d, %Y")}')
+    date_paragraph.alignment = WD_ALIGN_PARAGRAPH.CENTER
+    doc.add_paragraph()
+
+    rows = []
+    for bid_text in (bid_text for bid_text, _ in bids):
+        match = re.match(r"(\d+)\. ", bid_text)
+        if match:
+            rows.append((match.group(1), bid_text[len(match.group(0)):]))
+        else:
+            rows.append(("", bid_text))
+
+    _check(cancel_event)
+    _report(progress, 0.1, f"Building table of {len(rows)} bids")
+    table = parse_xml(_bid_table_xml(rows, doc.styles['Table Grid'].style_id, header_color_hex))
+    doc.element.body._insert_tbl(table)
+
+    # Pictures need image parts and relationships, so only these go through python-docx
+    photo_rows = [(index, photo) for index, (_, photo) in enumerate(bids) if photo is not None]
+    table_rows = table.tr_lst
+    for done, (index, photo) in enumerate(photo_rows, 1):
+        _check(cancel_event)
+        _report(progress, 0.1 + 0.9 * done / (len(photo_rows) + 1), f"Adding photo {done} of {len(photo_rows)}")
+        paragraph = table_rows[index + 1].tc_lst[2].p_lst[0]
+        try:
+            stream = io.BytesIO()
+            photo.save(stream, format="PNG")
+            stream.seek(0)
+            inline = doc.part.new_pic_inline(stream, width=Inches(1.5))
+            paragraph.add_r().add_drawing(inline)
+        except Exception as e:
+            print(f"Error adding image: {e}")
+            paragraph.add_r().text = "Error loading image"
+
+    doc.add_paragraph()
+    footer = doc.add_paragraph('Generated by Techvengers Bid Writer')
+    footer.alignment = WD_ALIGN_PARAGRAPH.CENTER
+    footer_run = footer.runs[0]
+    footer_run.italic = True
+    return doc
+
+
+def save_bid_document(file_path, bids, wo_number="", header_color_hex="1e3a5f", progress=None, cancel_event=None):
+    """Renders the bids to a .docx file at ``file_path``."""
+    doc = build_bid_document(bids, wo_number, header_color_hex, progress, cancel_event)
+    _check(cancel_event)
+    _report(progress, 1.0, "Saving document")
+    doc.save(file_path)
+    return file_path
+
+
+def save_bid_text(file_path, bids, progress=None, cancel_event=None):
+    """Writes the plain-text fallback of the bid proposal."""
+    lines = [
+        "TECHVENGERS BID PROPOSAL\n",
+        "=" * 50 + "\n",
+        f"Date: {datetime.now().strftime('%B %d, %Y')}\n\n",
+    ]
+
+    total = len(bids)
+    for index, (bid_text, photo) in enumerate(bids, 1):
+        _check(cancel_event)
+        _report(progress, index / (total + 1), f"Writing bid {index} of {total}")
+        lines.append(f"{bid_text}\n")
+        if photo is not None:
+            lines.append("[Photo attached - see Word version for images]\n")
+        lines.append("\n")
+        if index != total:
+            lines.append("─" * 50 + "\n\n")
+
+    lines.append("\nGenerated by Techvengers Bid Writer\n")
+
+    _check(cancel_event)
+    with open(file_path, 'w', encoding='utf-8') as file:
+        file.writelines(lines)
+    return file_path
+
+
+def open_file(file_path):
+    """Opens a saved document with the platform's default application."""
+    if os.name == 'nt':
+        os.startfile(file_path)
+    elif sys.platform == 'darwin':
+        subprocess.Popen(['open', file_path])
+    else:
+        subprocess.Popen(['xdg-open', file_path])
+
+
+def _float(value):
+    try:
+        return float(str(value).strip().replace(",", "") or 0)
+    except ValueError:
+        return 0.0
+
+
+def _format_template(template, qty, location, add_info, total):
+    """Fills a catalog template the same way the Live Preview does."""
+    try:
+        return template.format(quantity=qty, location=location, info=add_info, total=total, cause=add_info)
+    except (KeyError, IndexError, ValueError):
+        try:
+            return template.format(quantity=qty, location=location, info=add_info, total=total)
+        except Exception:
+            return template
+
+
+def bids_from_state(state):
+    """Rebuilds the numbered bid texts of a saved WO state without any widgets.
+
+    Returns a list of ``(bid_text, photo_path)`` in the same order and with the
+    same conjunction numbering the Bid Writer uses when saving to docs.
+    """
+    selected = []
+    for category, items in state.get("selected_items", {}).items():
+        for item_key, item in items.items():
+            if item.get("selected"):
+                selected.append((category, item_key, item))
+
+    def instance_key(entry):
+        return entry[2].get("instance_info", {}).get("key", entry[1])
+
+    conjunction_groups = {}
+    standalone = []
+    for entry in selected:
+        key = str(entry[2].get("conjunction_key", "")).strip().upper()
+        if key:
+            conjunction_groups.setdefault(key, []).append(entry)
+        else:
+            standalone.append(entry)
+
+    ordered = []
+    for key in sorted(conjunction_groups):
+        ordered.extend((key, entry) for entry in sorted(conjunction_groups[key], key=instance_key))
+    ordered.extend(("", entry) for entry in sorted(standalone, key=instance_key))
+
+    photos = state.get("item_photos", {})
+    bids = []
+    for number, (conjunction_key, (category, item_key, item)) in enumerate(ordered, 1):
+        qty = str(item.get("qty", "")).strip() or "0"
+        total = round(_float(item.get("qty")) * _float(item.get("unit_price")), 2)
+        # A Live Preview the user edited wins over the template, as in the Bid Writer. It
+        # already holds the conjunction prefix and footer the preview showed when edited.
+        edited_preview = item.get("edited_preview")
+        bid_text = edited_preview or _format_template(item.get("template", ""), qty,
+                                                      str(item.get("location", "")).strip() or "N/A",
+                                                      str(item.get("add_info", "")).strip(), total)
+
+        if not edited_preview and conjunction_key and len(conjunction_groups[conjunction_key]) > 1:
+            group = sorted(conjunction_groups[conjunction_key], key=instance_key)
+            index = next(i for i, entry in enumerate(group) if entry[2] is item) + 1
+            bid_text = (f"{conjunction_key}{index}: {bid_text}\n"
+                        f"** {conjunction_key}1 to {conjunction_key}{len(group)} must be approved together **").strip()
+
+        photo_path = photos.get(f"{category}_{instance_key((category, item_key, item))}")
+        bids.append((f"{number}. {bid_text}", photo_path))
+    return bids
+
+
+def _render_wo(wo_number, load_state, out_dir, header_color_hex, cancel_event):
+    state = load_state(wo_number)
+    bids = []
+    for bid_text, photo_path in bids_from_state(state):
+        photo = None
+        if photo_path and Image and os.path.exists(photo_path):
+            try:
+                photo = Image.open(photo_path)
+            except Exception as e:
+                print(f"Error loading photo {photo_path}: {e}")
+        bids.append((bid_text, photo))
+
+    if not bids:
+        return {"wo": wo_number, "status": "Skipped", "bids": 0, "file": "", "error": "No bids selected"}
+
+    file_path = os.path.join(out_dir, f"WO_{wo_number}.docx")
+    save_bid_document(file_path, bids, wo_number, header_color_hex, cancel_event=cancel_event)
+    return {"wo": wo_number, "status": "Exported", "bids": len(bids), "file": os.path.basename(file_path), "error": ""}
+
+
+def export_wo_batch(wo_numbers, load_state, out_dir, header_color_hex="1e3a5f",
+                    progress=None, cancel_event=None, max_workers=None):
+    """Renders many saved WOs to .docx files in ``out_dir`` in parallel.
+
+    ``load_state(wo_number)`` returns the saved state dict of a WO. A summary
+    report (Export_Summary.csv) is written next to the documents and the list
+    of per-WO result rows is returned.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    max_workers = max_workers or min(4, os.cpu_count() or 1)
+    results = []
+    total = len(wo_numbers)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = {
+            pool.submit(_render_wo, wo, load_state, out_dir, header_color_hex, cancel_event): wo
+            for wo in wo_numbers
+        }
+        for future in as_completed(futures):
+            wo = futures[future]
+            try:
+                results.append(future.result())
+            except (ExportCancelled, CancelledError):
+                results.append({"wo": wo, "status": "Cancelled", "bids": 0, "file": "", "error": ""})
+            except Exception as e:
+                results.append({"wo": wo, "status": "Failed", "bids": 0, "file": "", "error": str(e)})
+            _report(progress, len(results) / total, f"{len(results)} of {total} WOs")
+            if cancel_event is not None and cancel_event.is_set():
+                for pending in futures:
+                    pending.cancel()
+
+    results.sort(key=lambda r: r["wo"])
+    with open(os.path.join(out_dir, "Export_Summary.csv"), 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=["wo", "status", "bids", "file", "error"])
+        writer.writeheader()
+        writer.writerows(results)
+    return results
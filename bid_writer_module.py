@@ -2,21 +2,19 @@ import tkinter as tk
 from tkinter import messagebox, filedialog
 import os
 import time
-import sys
 from datetime import datetime
-import tempfile
 import csv
 import io
 import requests
-import json
-from docx import Document
-from docx.shared import Inches, Cm
-from docx.enum.text import WD_ALIGN_PARAGRAPH
+from docx.shared import Cm
 from docx.oxml.ns import nsdecls
 from docx.oxml import parse_xml
-from docx.shared import RGBColor
-from utils import set_cell_background
 from theme_manager import theme_manager
+from bid_document import save_bid_document, save_bid_text, open_file, ExportCancelled
+from export_queue import ExportJob, ExportJobQueue
+from wo_store import wo_store
+from sheet_data import sheet_data
+from utils import TkDispatcher
 import re
 
 try:
@@ -27,7 +25,28 @@ except ImportError:
     ImageTk = None
     ImageGrab = None
 
+
+def parse_bid_catalog(csv_text):
+    """Parses the bid catalog sheet into ``{category: [item, ...]}``."""
+    categories = {}
+    for row in csv.DictReader(io.StringIO(csv_text)):
+        if 'Category' in row and 'Item' in row and 'Template' in row:
+            category = row['Category']
+            if category not in categories:
+                categories[category] = []
+            categories[category].append({'item_name': row['Item'], 'template': row['Template'],
+                                         'unit_price': row.get('Unit Price', '0.00')})
+    return categories
+
+
 class BidWriterApp:
+    # Autosave is a no-op while nothing has changed, so it can run often
+    AUTO_SAVE_INTERVAL_MS = 15000
+    # Edits are journaled in one transaction per this many milliseconds
+    JOURNAL_FLUSH_MS = 500
+    # Journals being written by windows of this process, never offered for replay
+    open_journals = set()
+
     def __init__(self, root, username, wo_number_to_load=None, on_save_callback=None):
         self.root = root
         self.root.title("Techvengers Bid Writer")
@@ -86,7 +105,7 @@ class BidWriterApp:
 
         self.categories = {}
         self.all_items = {}
-        self.bid_data_url = "https://docs.google.com/spreadsheets/d/1sBPUtZqtoPREX2STfjBIs_kNF4HE4kCvsyloL9oC-tY/gviz/tq?tqx=out:csv&sheet=Sheet1"
+        self.dispatcher = TkDispatcher(self.root)
         
         self.selected_items = {}
         self.item_photos = {}
@@ -219,6 +238,17 @@ class BidWriterApp:
                                          font=("Arial", 11, "bold"), bg=self.colors['gray_light'],
                                          fg=self.colors['gray_dark'], anchor="w")
         self.bid_count_label.pack(side="left", padx=(8, 0))
+
+        self.cancel_export_button = tk.Button(self.output_header_frame, text="Cancel Export",
+                                              font=("Arial", 9), bg="#dc3545", fg="white",
+                                              relief="flat", cursor="hand2", state=tk.DISABLED,
+                                              command=self.cancel_exports)
+        self.cancel_export_button.pack(side="right", padx=(0, 8))
+
+        self.export_status_label = tk.Label(self.output_header_frame, text="",
+                                            font=("Arial", 9), bg=self.colors['gray_light'],
+                                            fg=self.colors['gray_dark'], anchor="e")
+        self.export_status_label.pack(side="right", padx=(0, 8))
         
         self.output_scrollbar = tk.Scrollbar(self.output_frame)
         self.output_scrollbar.pack(side="right", fill="y")
@@ -246,13 +276,26 @@ class BidWriterApp:
         self.root.bind('<Control-s>', self.focus_search_bar)
 
         self.on_save_callback = on_save_callback
-
-        self.load_bids_from_url(self.bid_data_url)
+        # Dirty tracking: only rows touched since the last save are written
+        self.saved_wo_number = None
+        self.dirty_items = set()
+        self.removed_items = set()
+        self.photos_dirty = False
+        self.catalog_hash = None
+        self.journal_buffer = {}
+        self.journal_flush_job = None
+        self.replaying_journal = False
+        self.export_queue = ExportJobQueue(self.root, on_status=self.update_export_status)
+
+        # Opening a WO merges catalog and saved state first, then renders once
+        self.load_bids(render=not wo_number_to_load)
         if wo_number_to_load:
             self.wo_entry.insert(0, wo_number_to_load)
-            self.load_state()
+            if not self.load_state():
+                self.render_active_category()
+        self.root.after_idle(self.offer_journal_replay)
 
-        self.root.after(300000, self.auto_save)
+        self.root.after(self.AUTO_SAVE_INTERVAL_MS, self.auto_save)
 
     def on_theme_changed(self, theme_name, colors):
         """Called when theme is changed globally."""
@@ -494,6 +537,7 @@ class BidWriterApp:
         self.username_label.configure(bg=self.colors['primary_blue'], fg=self.colors['button_text'])
         self.wo_label.configure(bg=self.colors['background'], fg=self.colors['primary_blue'])
         self.bid_count_label.configure(bg=self.colors['gray_light'], fg=self.colors['gray_dark'])
+        self.export_status_label.configure(bg=self.colors['gray_light'], fg=self.colors['gray_dark'])
         self.footer_label.configure(bg=self.colors['primary_blue'], fg=self.colors['button_text'])
         
         # Update search elements
@@ -536,20 +580,213 @@ class BidWriterApp:
 
     def auto_save(self):
         try:
-            wo_number = self.wo_entry.get().strip()
-            if not wo_number:
-                # Keep a stable autosave name across this session
-                if not hasattr(self, '_autosave_name'):
-                    self._autosave_name = f"AutoSave_{int(time.time())}"
-                wo_number = self._autosave_name
-                self.wo_entry.delete(0, tk.END)
-                self.wo_entry.insert(0, wo_number)
+            if not self.is_dirty():
+                return
+            if not self.wo_entry.get().strip():
+                self.wo_entry.insert(0, self.journal_name())
             self.save_state(silent=True)
         except Exception:
             # Avoid crashing autosave on transient widget errors
             pass
         finally:
-            self.root.after(300000, self.auto_save)
+            self.root.after(self.AUTO_SAVE_INTERVAL_MS, self.auto_save)
+
+    def mark_dirty(self, category, item_key):
+        self.dirty_items.add((category, item_key))
+
+    def mark_photos_dirty(self):
+        self.photos_dirty = True
+
+    def journal_name(self):
+        """WO number that edits are journaled (and autosaved) under."""
+        wo_number = self.wo_entry.get().strip()
+        if wo_number:
+            return wo_number
+        # Keep a stable autosave name across this session
+        if not hasattr(self, '_autosave_name'):
+            self._autosave_name = f"AutoSave_{int(time.time())}"
+        return self._autosave_name
+
+    def record_edit(self, category, item_key, field, value=None):
+        """Marks a row dirty and journals the new value of one of its fields."""
+        self.mark_dirty(category, item_key)
+        if value is None:
+            item = self.selected_items.get(category, {}).get(item_key)
+            if item is None:
+                return
+            value = ("1" if item["selected"] else "0") if field == "selected" else item[field].get()
+        self._journal(category, item_key, field, value)
+
+    def record_photo_edit(self, category, item_key, path):
+        self.mark_photos_dirty()
+        self._journal(category, item_key, "photo", path or "")
+
+    def _journal(self, category, item_key, field, value):
+        if self.replaying_journal:
+            return
+        name = self.journal_name()
+        BidWriterApp.open_journals.add(name)
+        # Only the last value of a field within one flush window is written
+        key = (name, category, item_key, field)
+        self.journal_buffer.pop(key, None)
+        self.journal_buffer[key] = value
+        if self.journal_flush_job is None:
+            self.journal_flush_job = self.root.after(self.JOURNAL_FLUSH_MS, self.flush_journal)
+
+    def flush_journal(self):
+        """Group-commits the buffered edits, one transaction per WO."""
+        self.journal_flush_job = None
+        buffer, self.journal_buffer = self.journal_buffer, {}
+        entries_by_wo = {}
+        for (name, category, item_key, field), value in buffer.items():
+            entries_by_wo.setdefault(name, []).append((category, item_key, field, value))
+        for name, entries in entries_by_wo.items():
+            try:
+                wo_store.append_journal(name, entries)
+            except Exception as e:
+                print(f"Failed to journal edits for {name}: {e}")
+
+    def discard_journal(self, wo_number):
+        """Drops journaled edits once a save has made them redundant."""
+        if self.journal_flush_job is not None:
+            self.root.after_cancel(self.journal_flush_job)
+            self.journal_flush_job = None
+        self.journal_buffer = {}
+        names = {wo_number, getattr(self, '_autosave_name', wo_number)}
+        for name in names:
+            wo_store.clear_journal(name)
+            BidWriterApp.open_journals.discard(name)
+
+    def offer_journal_replay(self):
+        """Offers to restore edits journaled by a session that ended without saving."""
+        wo_number = self.wo_entry.get().strip()
+        try:
+            journals = [j for j in wo_store.journaled_work_orders()
+                        if j[0] not in BidWriterApp.open_journals and (not wo_number or j[0] == wo_number)]
+        except Exception as e:
+            print(f"Could not read the edit journal: {e}")
+            return
+        if not journals:
+            return
+
+        name, edit_count, last_edit = journals[0]
+        when = datetime.fromtimestamp(last_edit).strftime('%Y-%m-%d %H:%M')
+        if not messagebox.askyesno("Restore Unsaved Edits",
+                                   f"Found {edit_count} unsaved edits to WO '{name}' from {when}.\n\n"
+                                   f"Do you want to restore them?"):
+            wo_store.clear_journal(name)
+            return
+
+        if not wo_number:
+            self.wo_entry.insert(0, name)
+            if wo_store.exists(name):
+                self.load_state(silent=True)
+        BidWriterApp.open_journals.add(name)
+        self.apply_journal(wo_store.journal_entries(name))
+
+    def apply_journal(self, entries):
+        """Re-applies journaled ``(category, item_key, field, value)`` edits."""
+        self.replaying_journal = True
+        try:
+            for category, item_key, field, value in entries:
+                photo_key = f"{category}_{item_key}"
+                if field == "instance" and value == "deleted":
+                    for instances in self.item_instances.get(category, {}).values():
+                        instances[:] = [inst for inst in instances if inst['key'] != item_key]
+                    self.selected_items.get(category, {}).pop(item_key, None)
+                    if self.item_photos.pop(photo_key, None):
+                        self.mark_photos_dirty()
+                    self.dirty_items.discard((category, item_key))
+                    self.removed_items.add((category, item_key))
+                    continue
+
+                item = self._ensure_item(category, item_key)
+                if item is None:
+                    continue
+                if field == "selected":
+                    item["selected"] = value == "1"
+                elif field == "photo":
+                    if value and Image and os.path.exists(value):
+                        self.item_photos[photo_key] = {'original': None, 'path': value}
+                    else:
+                        self.item_photos.pop(photo_key, None)
+                    self.mark_photos_dirty()
+                elif field in ("qty", "unit_price", "location", "add_info", "conjunction_key"):
+                    item[field].set(value)
+                elif field == "edited_preview":
+                    item["edited_preview"] = value
+                    item["user_edited"] = bool(value)
+                self.mark_dirty(category, item_key)
+        finally:
+            self.replaying_journal = False
+
+        if self.active_category:
+            self.load_items(self.active_category)
+        self.update_all_previews()
+
+    def _ensure_item(self, category, item_key):
+        """Returns the row of ``item_key``, creating it (and its instance) if needed."""
+        item = self.selected_items.get(category, {}).get(item_key)
+        if item is not None:
+            return item
+
+        instances = self.item_instances.setdefault(category, {})
+        instance_info = next((inst for insts in instances.values() for inst in insts if inst['key'] == item_key), None)
+        if instance_info is None:
+            item_name, _, number = item_key.rpartition('_')
+            if not number.isdigit():
+                return None
+            number = int(number)
+            instance_info = {
+                'instance_id': number,
+                'display_name': item_name if number == 1 else f"{item_name} #{number}",
+                'key': item_key
+            }
+            instances.setdefault(item_name, []).append(instance_info)
+
+        original_name = re.sub(r'#.*', '', instance_info['display_name']).strip()
+        item_data = next((item for item in self.all_items.get(category, []) if item['item_name'] == original_name), None)
+        if item_data is None:
+            return None
+        item = self._new_item_entry(category, original_name, instance_info, item_data)
+        self.selected_items.setdefault(category, {})[item_key] = item
+        return item
+
+    def _new_item_entry(self, category, original_name, instance_info, item_data):
+        item = {
+            "selected": False,
+            "template": item_data['template'],
+            "qty": tk.StringVar(value="0"),
+            "unit_price": tk.StringVar(value=item_data['unit_price']),
+            "location": tk.StringVar(),
+            "add_info": tk.StringVar(),
+            "conjunction_key": tk.StringVar(),
+            "total_price_label": None,
+            "button": None,
+            "preview_text": None,
+            "original_name": original_name,
+            "instance_info": instance_info,
+            "photo_frame": None,
+            "photo_label": None,
+            "user_edited": False,
+            "edited_preview": ""
+        }
+        self.trace_edits(category, instance_info['key'], item)
+        return item
+
+    def trace_edits(self, category, item_key, item):
+        """Journals every write to a row's fields; called once, when its StringVars are created."""
+        for field in ("qty", "unit_price", "location", "add_info", "conjunction_key"):
+            item[field].trace_add("write", lambda *_args, c=category, k=item_key, f=field: self.record_edit(c, k, f))
+
+    def is_dirty(self):
+        return bool(self.dirty_items or self.removed_items or self.photos_dirty)
+
+    def mark_clean(self, wo_number):
+        self.saved_wo_number = wo_number
+        self.dirty_items = set()
+        self.removed_items = set()
+        self.photos_dirty = False
 
     def update_bid_buttons(self):
         """Update category buttons and apply highlights based on search query."""
@@ -607,44 +844,74 @@ class BidWriterApp:
 
     def refresh_bids(self):
         """Refreshes the bids by reloading from the online URL."""
-        self.load_bids_from_url(self.bid_data_url)
-        messagebox.showinfo("Refresh Complete", "Bid list has been refreshed successfully.")
+        if self.load_bids(refresh=True):
+            messagebox.showinfo("Refresh Complete", "Bid list has been refreshed successfully.")
 
-    def load_bids_from_url(self, url):
-        """Loads bid data from a public CSV file URL."""
+    def load_bids(self, render=True, refresh=False):
+        """Loads the bid catalog, from its last good snapshot unless ``refresh`` is set.
+
+        With ``render=False`` the first category is only made active, so a
+        caller that loads a WO next builds the grid a single time. Returns
+        False if the sheet could not be read.
+        """
         try:
-            response = requests.get(url, timeout=10)
-            response.raise_for_status()
-            
-            csv_data = io.StringIO(response.text)
-            reader = csv.DictReader(csv_data)
-            
-            self.categories = {}
-            for row in reader:
-                if 'Category' in row and 'Item' in row and 'Template' in row:
-                    category = row['Category']
-                    item_name = row['Item']
-                    template = row['Template']
-                    unit_price = row.get('Unit Price', '0.00')
-                    
-                    if category not in self.categories:
-                        self.categories[category] = []
-                    self.categories[category].append({'item_name': item_name, 'template': template, 'unit_price': unit_price})
-            
-            self.all_items = self.categories.copy()
+            if refresh:
+                csv_text = sheet_data.fetch("bid_catalog")
+            else:
+                csv_text = sheet_data.get("bid_catalog")
+                # Served from the last good copy; sheet edits arrive through on_bid_catalog_synced
+                sheet_data.sync_in_background("bid_catalog", self.dispatcher, self.on_bid_catalog_synced, current=csv_text)
+            self.apply_bid_catalog(parse_bid_catalog(csv_text))
+            loaded = True
             
         except requests.exceptions.RequestException as e:
-            messagebox.showwarning("Network Error", f"Could not connect to the online file. Using default bids.\nError: {e}")
-            self.load_default_bids()
+            loaded = False
+            if refresh and self.categories:
+                messagebox.showwarning("Network Error", f"Could not connect to the online file. Keeping the current bid list.\nError: {e}")
+            else:
+                messagebox.showwarning("Network Error", f"Could not connect to the online file. Using default bids.\nError: {e}")
+                self.load_default_bids()
         except Exception as e:
+            loaded = False
             messagebox.showwarning("Error", f"Failed to read data from online file. Using default bids.\nError: {e}")
             self.load_default_bids()
         
-        self.update_bid_buttons()
-        if self.categories:
+        if self.categories and (not refresh or self.active_category not in self.categories):
+            self.active_category = list(self.categories.keys())[0]
+        if render:
+            self.render_active_category()
+        return loaded
+
+    def apply_bid_catalog(self, categories):
+        """Makes ``categories`` the current catalog and records it in the WO store."""
+        self.categories = categories
+        self.all_items = self.categories.copy()
+        try:
+            self.catalog_hash = wo_store.set_catalog(self.categories)
+        except Exception as e:
+            print(f"Could not record bid catalog: {e}")
+
+    def on_bid_catalog_synced(self, csv_text):
+        """Applies a catalog that changed on the sheet since the snapshot was taken."""
+        try:
+            categories = parse_bid_catalog(csv_text)
+        except Exception as e:
+            print(f"Could not parse synced bid catalog: {e}")
+            return
+        if not categories or categories == self.categories:
+            return
+        self.apply_bid_catalog(categories)
+        if self.active_category not in self.categories:
             self.active_category = list(self.categories.keys())[0]
-            first_button = self.category_frame.winfo_children()[0]
-            self.load_items_with_highlight(self.active_category, first_button)
+        self.render_active_category()
+
+    def render_active_category(self):
+        """Rebuilds the category buttons and renders the active category's grid."""
+        self.update_bid_buttons()
+        for button in self.category_frame.winfo_children():
+            if button.cget("text") == self.active_category:
+                self.load_items_with_highlight(self.active_category, button)
+                break
 
     def load_default_bids(self):
         """Loads hardcoded default bids as a fallback."""
@@ -714,12 +981,14 @@ class BidWriterApp:
         if category and category in self.all_items:
             for item_data in self.all_items[category]:
                 item_name = item_data['item_name']
-                if item_name not in self.item_instances[category] or not self.item_instances[category][item_name]:
-                    self.item_instances[category][item_name] = [{
+                # Saved WOs do not keep an untouched first instance, so re-create it
+                instances = self.item_instances[category].setdefault(item_name, [])
+                if not any(inst['instance_id'] == 1 for inst in instances):
+                    instances.insert(0, {
                         'instance_id': 1,
                         'display_name': item_name,
                         'key': f"{item_name}_1"
-                    }]
+                    })
 
         row_idx = 1
         if category and category in self.all_items:
@@ -737,23 +1006,7 @@ class BidWriterApp:
                 if not item_data: continue
 
                 if instance_key not in self.selected_items[category]:
-                    self.selected_items[category][instance_key] = {
-                        "selected": False,
-                        "template": item_data['template'],
-                        "qty": tk.StringVar(value="0"),
-                        "unit_price": tk.StringVar(value=item_data['unit_price']),
-                        "location": tk.StringVar(),
-                        "add_info": tk.StringVar(),
-                        "conjunction_key": tk.StringVar(),
-                        "total_price_label": None,
-                        "button": None,
-                        "preview_text": None,
-                        "original_name": original_name,
-                        "instance_info": instance_info,
-                        "photo_frame": None,
-                        "photo_label": None,
-                        "user_edited": False
-                    }
+                    self.selected_items[category][instance_key] = self._new_item_entry(category, original_name, instance_info, item_data)
 
                 item_info = self.selected_items[category][instance_key]
                 
@@ -981,41 +1234,33 @@ class BidWriterApp:
         self.root.after(50, _perform_scroll_reset)
         
     def save_state(self, silent=False):
-        """Saves the current state of selected bids and photos to a JSON file."""
+        """Saves the current state of selected bids and photos to the WO store."""
         wo_number = self.wo_entry.get().strip()
         if not wo_number:
             if not silent:
                 messagebox.showwarning("Warning", "Please enter a Work Order Number to save the state.")
             return
 
-        state = {
-            "selected_items": {},
-            "item_photos": {}
-        }
-
-        for category, items in self.selected_items.items():
-            state["selected_items"][category] = {}
-            for item_key, item_data in items.items():
-                state["selected_items"][category][item_key] = {
-                    "selected": item_data["selected"],
-                    "template": item_data["template"],
-                    "qty": item_data["qty"].get(),
-                    "unit_price": item_data["unit_price"].get(),
-                    "location": item_data["location"].get(),
-                    "add_info": item_data["add_info"].get(),
-                    "original_name": item_data["original_name"],
-                    "instance_info": item_data["instance_info"],
-                    "conjunction_key": item_data["conjunction_key"].get()
-                }
-        
-        for photo_key, photo_data in self.item_photos.items():
-            if photo_data and 'path' in photo_data and photo_data['path']:
-                state["item_photos"][photo_key] = photo_data['path']
-        
-        state_file_path = os.path.join(self.app_data_dir, f"WO_{wo_number}.json")
         try:
-            with open(state_file_path, 'w') as f:
-                json.dump(state, f, indent=4)
+            # Same WO as last save/load: write only the rows that changed since
+            saved = False
+            if wo_number == self.saved_wo_number:
+                changed = {}
+                for position, (category, item_key) in enumerate(
+                        (cat, key) for cat, items in self.selected_items.items() for key in items):
+                    if (category, item_key) in self.dirty_items:
+                        changed[(category, item_key)] = (position, self._item_state(self.selected_items[category][item_key]))
+                photos = self._photo_paths() if self.photos_dirty else None
+                saved = wo_store.save_changes(wo_number, changed, self.removed_items, photos)
+            if not saved:
+                state = {
+                    "selected_items": {category: {item_key: self._item_state(item_data) for item_key, item_data in items.items()}
+                                       for category, items in self.selected_items.items()},
+                    "item_photos": self._photo_paths()
+                }
+                wo_store.save_state(wo_number, state)
+            self.mark_clean(wo_number)
+            self.discard_journal(wo_number)
         except Exception as e:
             if not silent:
                 messagebox.showerror("Error", f"Failed to save state: {e}")
@@ -1024,18 +1269,38 @@ class BidWriterApp:
         # Notify user (only when not silent)
         if not silent:
             try:
-                messagebox.showinfo("Success", f"State saved successfully to:\n{os.path.basename(state_file_path)}")
+                messagebox.showinfo("Success", f"State saved successfully for WO '{wo_number}'.")
             except Exception:
                 pass
 
-        # Fire post-save callback safely (if dashboard is in a state to handle it)
-        if callable(self.on_save_callback):
+        # Fire post-save callback safely (if dashboard is in a state to handle it).
+        # Not for autosaves: reloading Recent Bids every interval would reset its paging and selection.
+        if not silent and callable(self.on_save_callback):
             try:
                 # Defer to event loop to avoid running during widget teardown
                 self.root.after(0, self._safe_post_save_callback)
             except Exception:
                 pass
 
+    @staticmethod
+    def _item_state(item_data):
+        return {
+            "selected": item_data["selected"],
+            "template": item_data["template"],
+            "qty": item_data["qty"].get(),
+            "unit_price": item_data["unit_price"].get(),
+            "location": item_data["location"].get(),
+            "add_info": item_data["add_info"].get(),
+            "original_name": item_data["original_name"],
+            "instance_info": item_data["instance_info"],
+            "conjunction_key": item_data["conjunction_key"].get(),
+            "edited_preview": item_data.get("edited_preview", "") if item_data.get("user_edited") else ""
+        }
+
+    def _photo_paths(self):
+        return {photo_key: photo_data['path'] for photo_key, photo_data in self.item_photos.items()
+                if photo_data and photo_data.get('path')}
+
     def _safe_post_save_callback(self):
         try:
             if callable(self.on_save_callback):
@@ -1044,21 +1309,21 @@ class BidWriterApp:
             # Ignore UI errors from other windows (e.g., when user navigated away)
             pass
 
-    def load_state(self):
-        """Loads a saved state from a JSON file and populates the UI."""
+    def load_state(self, silent=False):
+        """Loads a saved state from the WO store and populates the UI.
+
+        Returns True if the WO was loaded (and the grid rendered).
+        """
         wo_number = self.wo_entry.get().strip()
         if not wo_number:
             messagebox.showwarning("Warning", "Please enter a Work Order Number to load the state.")
-            return
-        
-        state_file_path = os.path.join(self.app_data_dir, f"WO_{wo_number}.json")
-        if not os.path.exists(state_file_path):
-            messagebox.showerror("Error", f"No saved state found for WO '{wo_number}'.")
-            return
+            return False
         
         try:
-            with open(state_file_path, 'r') as f:
-                state = json.load(f)
+            state = wo_store.load_state(wo_number)
+            if state is None:
+                messagebox.showerror("Error", f"No saved state found for WO '{wo_number}'.")
+                return False
             
             self.selected_items = {}
             self.item_photos = {}
@@ -1081,21 +1346,43 @@ class BidWriterApp:
                     item_data["location"] = tk.StringVar(value=item_data.get("location", ""))
                     item_data["add_info"] = tk.StringVar(value=item_data.get("add_info", ""))
                     item_data["conjunction_key"] = tk.StringVar(value=item_data.get("conjunction_key", ""))
+                    for widget_key in ("total_price_label", "button", "preview_text", "photo_frame", "photo_label"):
+                        item_data[widget_key] = None
+                    item_data["user_edited"] = bool(item_data.get("edited_preview"))
+                    self.trace_edits(category, item_key, item_data)
                     self.selected_items[category][item_key] = item_data
             
+            # Photos are decoded on first display (see photo_image)
             for photo_key, photo_path in state.get("item_photos", {}).items():
                 if os.path.exists(photo_path) and Image:
-                    image = Image.open(photo_path)
-                    self.item_photos[photo_key] = {'original': image, 'path': photo_path}
+                    self.item_photos[photo_key] = {'original': None, 'path': photo_path}
             
-            self.update_bid_buttons()
-            if self.active_category:
-                self.load_items(self.active_category)
+            self.mark_clean(wo_number)
+            self.render_active_category()
             
-            messagebox.showinfo("Success", f"State for WO '{wo_number}' loaded successfully.")
+            message = f"State for WO '{wo_number}' loaded successfully."
+            if state.get("catalog_hash") and self.catalog_hash and state["catalog_hash"] != self.catalog_hash:
+                message += "\n\nThe bid list has changed since this WO was saved; its bids keep the wording they were saved with."
+            if not silent:
+                messagebox.showinfo("Success", message)
+            return True
 
         except Exception as e:
             messagebox.showerror("Error", f"Failed to load state: {e}")
+            return False
+
+    def photo_image(self, photo_key):
+        """Returns the PIL image of a photo, decoding it from disk on first use."""
+        photo = self.item_photos.get(photo_key)
+        if not photo:
+            return None
+        if photo['original'] is None and photo.get('path') and Image:
+            try:
+                photo['original'] = Image.open(photo['path'])
+            except Exception as e:
+                print(f"Failed to open photo {photo['path']}: {e}")
+                return None
+        return photo['original']
     
     def select_photo(self, category, item_key):
         file_path = filedialog.askopenfilename(
@@ -1130,6 +1417,7 @@ class BidWriterApp:
                 'original': image,
                 'path': file_path
             }
+            self.record_photo_edit(category, item_key, file_path)
             
             self.load_photo_display(category, item_key)
                 
@@ -1145,7 +1433,10 @@ class BidWriterApp:
             return
             
         try:
-            image_copy = self.item_photos[photo_key]['original'].copy()
+            image = self.photo_image(photo_key)
+            if image is None:
+                return
+            image_copy = image.copy()
             image_copy.thumbnail((180, 100), Image.Resampling.LANCZOS)
             photo = ImageTk.PhotoImage(image_copy)
             
@@ -1166,6 +1457,7 @@ class BidWriterApp:
         photo_key = f"{category}_{item_key}"
         if photo_key in self.item_photos:
             del self.item_photos[photo_key]
+            self.record_photo_edit(category, item_key, None)
         
         item_info = self.selected_items[category][item_key]
         if item_info["photo_label"]:
@@ -1190,6 +1482,7 @@ class BidWriterApp:
                     'original': image,
                     'path': None
                 }
+                self.record_photo_edit(category, item_key, None)
                 
                 self.load_photo_display(category, item_key)
             else:
@@ -1221,6 +1514,7 @@ class BidWriterApp:
         }
         
         self.item_instances[category][item_name].append(new_instance)
+        self.record_edit(category, new_instance['key'], "instance", "added")
         
         self.load_items(category)
 
@@ -1233,10 +1527,14 @@ class BidWriterApp:
             
             if instance_key in self.selected_items[category]:
                 del self.selected_items[category][instance_key]
+            self.dirty_items.discard((category, instance_key))
+            self.removed_items.add((category, instance_key))
+            self._journal(category, instance_key, "instance", "deleted")
             
             photo_key = f"{category}_{instance_key}"
             if photo_key in self.item_photos:
                 del self.item_photos[photo_key]
+                self.mark_photos_dirty()
         
         self.load_items(category)
 
@@ -1278,8 +1576,10 @@ class BidWriterApp:
         # Check if user has manually edited the preview text
         try:
             current_text = item["preview_text"].get("1.0", tk.END).strip()
-            if hasattr(item, 'user_edited') and item['user_edited']:
-                # User has manually edited, don't overwrite
+            if item.get('user_edited'):
+                # User has manually edited, don't overwrite (but show a saved edit on a fresh row)
+                if not current_text and item.get('edited_preview'):
+                    item["preview_text"].insert("1.0", item['edited_preview'])
                 return
         except:
             return
@@ -1360,6 +1660,7 @@ class BidWriterApp:
     def toggle_item(self, category, item_key):
         item = self.selected_items[category][item_key]
         item["selected"] = not item["selected"]
+        self.record_edit(category, item_key, "selected")
         
         if item["button"]:
             item["button"].configure(bg=self.colors['selected'] if item["selected"] else self.colors['white'])
@@ -1382,6 +1683,11 @@ class BidWriterApp:
         """Handle text changes in the Live Preview and update generated bids if they exist."""
         # Mark this item as user-edited
         item_info['user_edited'] = True
+        item_info['edited_preview'] = item_info["preview_text"].get("1.0", tk.END).strip()
+        instance_key = item_info['instance_info']['key']
+        category = next((cat for cat, items in self.selected_items.items() if items.get(instance_key) is item_info), None)
+        if category is not None:
+            self.record_edit(category, instance_key, "edited_preview", item_info['edited_preview'])
         
         # Update the generated bids section if it has content
         if hasattr(self, 'output_text') and self.output_text.get("1.0", tk.END).strip():
@@ -1493,151 +1799,75 @@ class BidWriterApp:
             category_name = next(cat for cat, items in self.selected_items.items() if instance_key in items)
             photo_key = f"{category_name}_{instance_key}"
 
-            if photo_key in self.item_photos and self.item_photos[photo_key]:
-                bid_photos.append(self.item_photos[photo_key])
-            else:
-                bid_photos.append(None)
+            # Snapshot the image so the worker never shares it with the UI
+            image = self.photo_image(photo_key)
+            bid_photos.append(image.copy() if image is not None else None)
+
+        bids = list(zip(final_bids, bid_photos))
+        wo_number = self.wo_entry.get().strip()
+        header_color_hex = self.colors['primary_blue'].lstrip('#')
+        current_time = datetime.now().strftime("%Y%m%d_%H%M%S")
 
         try:
-            from docx import Document
-            from docx.shared import Inches, Cm
-            from docx.enum.text import WD_ALIGN_PARAGRAPH
-            from docx.shared import RGBColor
+            import docx
             use_docx = True
         except ImportError:
             use_docx = False
             messagebox.showinfo("Info", "python-docx not found. Saving as text file instead.\nTo save as Word document, install: pip install python-docx")
 
         if use_docx:
-            doc = Document()
-            
-            wo_number = self.wo_entry.get().strip()
-            if wo_number:
-                doc.add_heading(f"Techvengers Bid Proposal - WO# {wo_number}", 0)
-            else:
-                doc.add_heading('Techvengers Bid Proposal', 0)
-            
-            doc.paragraphs[-1].alignment = WD_ALIGN_PARAGRAPH.CENTER
-            
-            date_paragraph = doc.add_paragraph(f'Date: {datetime.now().strftime("%B %d, %Y")}')
-            date_paragraph.alignment = WD_ALIGN_PARAGRAPH.CENTER
-            doc.add_paragraph()
-            
-            table = doc.add_table(rows=1, cols=3)
-            table.style = 'Table Grid'
-            table.autofit = False
-            
-            table.columns[0].width = Inches(0.5)
-            table.columns[1].width = Inches(3.5)
-            table.columns[2].width = Inches(2.0)
-            
-            hdr_cells = table.rows[0].cells
-            
-            header_color_hex = self.colors['primary_blue'].lstrip('#')
-            set_cell_background(hdr_cells[0], header_color_hex)
-            set_cell_background(hdr_cells[1], header_color_hex)
-            set_cell_background(hdr_cells[2], header_color_hex)
-
-            for cell, text in zip(hdr_cells, ['SL No.', 'Bids', 'Photos']):
-                cell.text = text
-                for paragraph in cell.paragraphs:
-                    for run in paragraph.runs:
-                        run.font.color.rgb = RGBColor(255, 255, 255)
-                        run.font.bold = True
-            
-            for bid_text, photo_data in zip(final_bids, bid_photos):
-                row_cells = table.add_row().cells
-                match = re.match(r"(\d+)\. ", bid_text)
-                if match:
-                    row_cells[0].text = match.group(1)
-                    row_cells[1].text = bid_text[len(match.group(0)):]
-                else:
-                    row_cells[0].text = ""
-                    row_cells[1].text = bid_text
-                
-                if photo_data and photo_data['original']:
-                    try:
-                        with tempfile.NamedTemporaryFile(suffix=".png", delete=False) as temp_file:
-                            temp_path = temp_file.name
-                            photo_data['original'].save(temp_path)
-                        
-                        row_cells[2].paragraphs[0].add_run().add_picture(temp_path, width=Inches(1.5))
-                        
-                        os.remove(temp_path)
-                    except Exception as e:
-                        print(f"Error adding image: {e}")
-                        row_cells[2].text = "Error loading image"
-            
-            doc.add_paragraph()
-            footer = doc.add_paragraph('Generated by Techvengers Bid Writer')
-            footer.alignment = WD_ALIGN_PARAGRAPH.CENTER
-            footer_run = footer.runs[0]
-            footer_run.italic = True
-            
-            current_time = datetime.now().strftime("%Y%m%d_%H%M%S")
-            default_filename = f"Techvengers_Bids_{current_time}.docx"
-            
             file_path = filedialog.asksaveasfilename(
                 defaultextension=".docx",
                 filetypes=[("Word Document", "*.docx"), ("All Files", "*.*")],
-                initialfile=default_filename,
+                initialfile=f"Techvengers_Bids_{current_time}.docx",
                 title="Save Bids Document"
             )
-            
             if file_path:
-                doc.save(file_path)
-                messagebox.showinfo("Success", f"Bids saved successfully to:\n{file_path}")
-                
-                if messagebox.askyesno("Open File", "Would you like to open the saved document?"):
-                    try:
-                        if os.name == 'nt':
-                            os.startfile(file_path)
-                        elif sys.platform == 'darwin':
-                            os.system(f'open "{file_path}"')
-                        else:
-                            os.system(f'xdg-open "{file_path}"')
-                    except Exception as e:
-                        messagebox.showinfo("File Saved", f"Document saved successfully!\nLocation: {file_path}")
-        
+                self.export_queue.submit(ExportJob(
+                    f"Export {os.path.basename(file_path)}",
+                    lambda job, p=file_path: save_bid_document(p, bids, wo_number, header_color_hex,
+                                                               job.report_progress, job.cancel_event),
+                    on_done=self._on_export_done
+                ))
         else:
-            current_time = datetime.now().strftime("%Y%m%d_%H%M%S")
-            default_filename = f"Techvengers_Bids_{current_time}.txt"
-            
             file_path = filedialog.asksaveasfilename(
                 defaultextension=".txt",
                 filetypes=[("Text Document", "*.txt"), ("All Files", "*.*")],
-                initialfile=default_filename,
+                initialfile=f"Techvengers_Bids_{current_time}.txt",
                 title="Save Bids Document"
             )
-            
             if file_path:
-                with open(file_path, 'w', encoding='utf-8') as file:
-                    file.write("TECHVENGERS BID PROPOSAL\n")
-                    file.write("=" * 50 + "\n")
-                    file.write(f"Date: {datetime.now().strftime('%B %d, %Y')}\n\n")
-                    
-                    for bid_text, photo_data in zip(final_bids, bid_photos):
-                        file.write(f"{bid_text}\n")
-                        if photo_data:
-                            file.write("[Photo attached - see Word version for images]\n")
-                        file.write("\n")
-                        if bid_text != final_bids[-1]:
-                            file.write("─" * 50 + "\n\n")
-                    
-                    file.write("\nGenerated by Techvengers Bid Writer\n")
-                
-                messagebox.showinfo("Success", f"Bids saved successfully to:\n{file_path}")
-                
-                if messagebox.askyesno("Open File", "Would you like to open the saved document?"):
-                    try:
-                        if os.name == 'nt':
-                            os.startfile(file_path)
-                        elif sys.platform == 'darwin':
-                            os.system(f'open "{file_path}"')
-                        else:
-                            os.system(f'xdg-open "{file_path}"')
-                    except Exception as e:
-                        messagebox.showinfo("File Saved", f"Document saved successfully!\nLocation: {file_path}")
+                self.export_queue.submit(ExportJob(
+                    f"Export {os.path.basename(file_path)}",
+                    lambda job, p=file_path: save_bid_text(p, bids, job.report_progress, job.cancel_event),
+                    on_done=self._on_export_done
+                ))
+
+    def _on_export_done(self, job, file_path, error):
+        """Reports a finished background export (runs on the Tk thread)."""
+        if isinstance(error, ExportCancelled):
+            return
+        if error is not None:
+            messagebox.showerror("Error", f"Failed to save document: {error}")
+            return
+
+        messagebox.showinfo("Success", f"Bids saved successfully to:\n{file_path}")
+        if messagebox.askyesno("Open File", "Would you like to open the saved document?"):
+            try:
+                open_file(file_path)
+            except Exception as e:
+                messagebox.showinfo("File Saved", f"Document saved successfully!\nLocation: {file_path}")
+
+    def update_export_status(self, text):
+        """Shows background export progress in the output header."""
+        try:
+            self.export_status_label.config(text=text)
+            self.cancel_export_button.config(state=tk.NORMAL if self.export_queue.is_busy() else tk.DISABLED)
+        except tk.TclError:
+            pass
+
+    def cancel_exports(self):
+        self.export_queue.cancel_all()
     
     def generate_bids(self):
         self.output_text.config(state=tk.NORMAL)
@@ -1755,6 +1985,9 @@ class BidWriterApp:
                 # Widget may have been destroyed when switching categories; fall back to template
                 pass
 
+        if item.get("user_edited") and item.get("edited_preview"):
+            return item["edited_preview"], photo_key
+
         # Fallback to constructing from the template
         qty = item["qty"].get().strip().replace(",", "")
         unit_price = item["unit_price"].get().strip().replace(",", "")
@@ -1775,10 +2008,11 @@ class BidWriterApp:
         return bid_text, photo_key
 
     def _insert_photo(self, photo_key):
-        if photo_key in self.item_photos and self.item_photos[photo_key]:
+        image = self.photo_image(photo_key)
+        if image is not None:
             try:
                 self.output_text.insert(tk.END, "\n")
-                image_data = self.item_photos[photo_key]['original'].copy()
+                image_data = image.copy()
                 max_width, max_height = 400, 300
                 image_data.thumbnail((max_width, max_height), Image.Resampling.LANCZOS)
                 photo_for_output = ImageTk.PhotoImage(image_data)
@@ -1800,8 +2034,8 @@ class BidWriterApp:
         
         self.output_text.images = []
         
-        for category_items in self.selected_items.values():
-            for item_info in category_items.values():
+        for category_key, category_items in self.selected_items.items():
+            for item_key, item_info in category_items.items():
                 item_info["selected"] = False
                 if item_info["button"]:
                     item_info["button"].configure(bg=self.colors['white'])
@@ -1818,6 +2052,9 @@ class BidWriterApp:
                 item_info["add_info"].set("")
                 item_info["conjunction_key"].set("")
                 item_info["user_edited"] = False
+                item_info["edited_preview"] = ""
+                for field in ("selected", "qty", "unit_price", "location", "add_info", "conjunction_key", "edited_preview"):
+                    self.record_edit(category_key, item_key, field, "" if field == "edited_preview" else None)
                 self.update_total_and_preview(item_info)
     
     def get_initial_price(self, category_name, item_name):
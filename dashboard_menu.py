@@ -2,18 +2,22 @@
 import tkinter as tk
 from tkinter import messagebox, ttk, filedialog
 from bid_writer_module import BidWriterApp
-from notice_board_module import NoticeBoardModule
+from notice_board_module import NoticeBoardModule, NoticePoller
 from vendor_price_module import VendorPriceModule
+from margin_report_module import MarginReportModule
 from gc_roof_ce_module import GCRoofCEModule
 from todo_module import ToDoModule
 from letterhead_bid_module import LetterheadBidModule
+from wo_history_module import WOHistoryModule
 from theme_manager import theme_manager
+from bid_document import export_wo_batch
+from export_queue import ExportJob, ExportJobQueue
+from wo_store import wo_store
+from sheet_data import sheet_data
 import time
 import os
 import re
 from datetime import datetime
-import json
-import shutil
 
 class DashboardMenu:
     def __init__(self, root, username):
@@ -23,6 +27,12 @@ class DashboardMenu:
         self.username = username
         self.current_module_instance = None
 
+        # Download every stale sheet concurrently now, so modules open on a fresh copy
+        sheet_data.prefetch()
+        self.unseen_notices = 0
+        self.notice_card_subtitle = None
+        self.toast = None
+
         # Use theme manager for colors
         self.colors = theme_manager.get_current_colors()
         
@@ -68,6 +78,10 @@ class DashboardMenu:
         self.app_data_dir = os.path.join(os.path.expanduser("~"), ".techvengers_bidwriter")
         os.makedirs(self.app_data_dir, exist_ok=True)
 
+        self.export_queue = ExportJobQueue(self.root, on_status=self.update_batch_status)
+        self.notice_poller = NoticePoller(self.root, self.on_notices_changed,
+                                          theme_manager.get_setting(NoticePoller.SETTING_KEY, NoticePoller.DEFAULT_MINUTES))
+
     def on_theme_changed(self, theme_name, colors):
         """Called when theme is changed globally."""
         self.colors = colors
@@ -175,6 +189,7 @@ class DashboardMenu:
             ("Templates", "Bid templates", "📄", lambda: self.show_placeholder("Templates")),
             ("GC/Roof CE", "GC/Roof change orders", "🏗️", self.open_gc_roof_ce),
             ("Vendor Price", "Vendor pricing", "💲", self.open_vendor_price),
+            ("Margin Report", "Bid prices vs vendor cost", "📊", self.open_margin_report),
             ("Letterheads", "Letterhead bids", "📝", self.open_letterhead_bid),
             ("Notice Boards", "Announcements", "📢", self.open_notice_board),
             ("To-Do", "Tasks & reminders", "✅", self.open_todo),
@@ -186,11 +201,14 @@ class DashboardMenu:
         # Create cards in a neat grid (up to 4 columns per row)
         row, col = 0, 0
         for title, subtitle, icon, cmd in cards:
-            self._create_dashboard_card(grid, row, col, icon, title, subtitle, cmd)
+            subtitle_label = self._create_dashboard_card(grid, row, col, icon, title, subtitle, cmd)
+            if title == "Notice Boards":
+                self.notice_card_subtitle = subtitle_label
             col += 1
             if col >= 4:
                 col = 0
                 row += 1
+        self.update_notice_badge()
 
     def show_bid_writer_dashboard(self):
         self.clear_content_frame()
@@ -224,108 +242,183 @@ class DashboardMenu:
         # Search bar
         self.search_entry = tk.Entry(recent_header_frame, width=20, font=("Arial", 11), relief="solid", bd=1)
         self.search_entry.pack(side='right', padx=(0, 5), pady=(0, 10))
+        self.search_entry.bind("<KeyRelease>", self._schedule_recent_bids_search)
         self.search_entry.bind("<Return>", lambda e: self.load_recent_bids(search_term=self.search_entry.get()))
 
         search_button = tk.Button(recent_header_frame, text="Search", command=lambda: self.load_recent_bids(search_term=self.search_entry.get()), font=("Arial", 10), bg=self.colors['light_blue'], fg="white", relief="flat", cursor="hand2")
         search_button.pack(side='right', pady=(0, 10))
 
-
-        # Scrollable list for recent bids
-        recent_canvas = tk.Canvas(recent_frame, bg=self.colors['white'], highlightthickness=0)
-        recent_scrollbar = tk.Scrollbar(recent_frame, orient="vertical", command=recent_canvas.yview)
-        recent_scrollable_frame = tk.Frame(recent_canvas, bg=self.colors['white'])
-
-        recent_scrollable_frame.bind(
-            "<Configure>",
-            lambda e: recent_canvas.configure(scrollregion=recent_canvas.bbox("all"))
-        )
-
-        recent_canvas.create_window((0, 0), window=recent_scrollable_frame, anchor="nw")
-        recent_canvas.configure(yscrollcommand=recent_scrollbar.set)
-        
+        batch_export_button = tk.Button(recent_header_frame, text="Export Selected to DOCX", command=self.batch_export_selected, font=("Arial", 10), bg=self.colors['primary_blue'], fg="white", relief="flat", cursor="hand2")
+        batch_export_button.pack(side='right', padx=(0, 10), pady=(0, 10))
+
+        self.batch_status_label = tk.Label(recent_header_frame, text="", font=("Arial", 9), bg=self.colors['gray_light'], fg=self.colors['gray_dark'])
+        self.batch_status_label.pack(side='right', padx=(0, 10), pady=(0, 10))
+
+        # Row actions work on the current selection (Ctrl/Shift-click selects several WOs)
+        actions_frame = tk.Frame(recent_frame, bg=self.colors['gray_light'])
+        actions_frame.pack(side='bottom', fill='x', pady=(10, 0))
+        tk.Button(actions_frame, text="Open", command=self.open_selected_bid, font=("Arial", 9), bg=self.colors['light_blue'], fg='white', relief='flat', cursor="hand2").pack(side='left', padx=(0, 5))
+        tk.Button(actions_frame, text="Delete", command=self.delete_selected_bids, font=("Arial", 9), bg='#dc3545', fg='white', relief='flat', cursor="hand2").pack(side='left', padx=(0, 5))
+        tk.Button(actions_frame, text="Export", command=self.export_selected_bid, font=("Arial", 9), bg=self.colors['primary_blue'], fg='white', relief='flat', cursor="hand2").pack(side='left', padx=(0, 5))
+        tk.Button(actions_frame, text="History", command=self.open_bid_history, font=("Arial", 9), bg=self.colors['gray_dark'], fg='white', relief='flat', cursor="hand2").pack(side='left', padx=(0, 5))
+        self.load_more_button = tk.Button(actions_frame, text="Load More", command=self.load_more_recent_bids, font=("Arial", 9), bg=self.colors['gray_dark'], fg='white', relief='flat', cursor="hand2")
+        self.load_more_button.pack(side='right')
+        self.recent_bids_count_label = tk.Label(actions_frame, text="", font=("Arial", 9), bg=self.colors['gray_light'], fg=self.colors['gray_dark'])
+        self.recent_bids_count_label.pack(side='right', padx=(0, 10))
+
+        # Treeview only draws the rows in view, so thousands of WOs stay cheap
+        tree_frame = tk.Frame(recent_frame, bg=self.colors['white'])
+        tree_frame.pack(fill="both", expand=True)
+        self.recent_bids_tree = ttk.Treeview(tree_frame, columns=("wo_number", "bid_count", "modified", "match"), show="headings", selectmode="extended")
+        for column, heading, width in (("wo_number", "WO", 160), ("bid_count", "Bid Count", 90), ("modified", "Last Modified", 140)):
+            self.recent_bids_tree.heading(column, text=heading, command=lambda c=column: self.sort_recent_bids(c))
+            self.recent_bids_tree.column(column, width=width, anchor='w', stretch=False)
+        self.recent_bids_tree.heading("match", text="Match", command=lambda: self.sort_recent_bids("match"))
+        self.recent_bids_tree.column("match", width=300, anchor='w')
+        recent_scrollbar = tk.Scrollbar(tree_frame, orient="vertical", command=self.recent_bids_tree.yview)
+        self.recent_bids_tree.configure(yscrollcommand=recent_scrollbar.set)
         recent_scrollbar.pack(side="right", fill="y")
-        recent_canvas.pack(side="left", fill="both", expand=True)
-        
-        self.recent_bids_list = recent_scrollable_frame
+        self.recent_bids_tree.pack(side="left", fill="both", expand=True)
+        self.recent_bids_tree.bind("<Double-1>", lambda e: self.open_selected_bid())
+        self.recent_bids_tree.bind("<Delete>", lambda e: self.delete_selected_bids())
+
+        self.recent_bids_sort = ("modified", True)
+        self.recent_bids_search_job = None
         
         # Initial load of bids
         self.load_recent_bids()
 
-    def load_recent_bids(self, search_term=""):
-        for widget in self.recent_bids_list.winfo_children():
-            widget.destroy()
+    RECENT_BIDS_PAGE_SIZE = 200
 
-        # Create table headers with more spacing and the new "Export" column
-        header_frame = tk.Frame(self.recent_bids_list, bg=self.colors['primary_blue'])
-        header_frame.pack(fill='x')
-        
-        headers = ['WO', 'Bid Count', 'Last Modified', 'Delete', 'Export']
-        header_frame.grid_columnconfigure(0, weight=2)
-        header_frame.grid_columnconfigure(1, weight=2)
-        header_frame.grid_columnconfigure(2, weight=3)
-        header_frame.grid_columnconfigure(3, weight=1)
-        header_frame.grid_columnconfigure(4, weight=1)
-
-        for i, header in enumerate(headers):
-            tk.Label(header_frame, text=header, font=("Arial", 11, "bold"), fg='white', bg=self.colors['primary_blue']).grid(row=0, column=i, sticky='nsew', padx=5, pady=5)
+    def load_recent_bids(self, search_term=None):
+        """Reloads the first page of the Recent Bids table from the WO index.
 
+        Called on open, on search and after saves/deletes. Further pages are
+        fetched by load_more_recent_bids.
+        """
+        tree = getattr(self, 'recent_bids_tree', None)
+        if tree is None or not tree.winfo_exists():
+            return
+        if search_term is None:
+            search_term = self.search_entry.get()
+        search_term = search_term.strip()
+        # A new search starts out ranked by best match; plain listing cannot sort by it
+        if search_term and not self.recent_bids_search:
+            self.recent_bids_sort = ("match", False)
+        elif not search_term and self.recent_bids_sort[0] == "match":
+            self.recent_bids_sort = ("modified", True)
+        self.recent_bids_search = search_term
+        tree.delete(*tree.get_children())
         try:
-            files = [f for f in os.listdir(self.app_data_dir) if f.startswith("WO_") and f.endswith(".json")]
+            wo_store.refresh_index()
+            # Searches are ranked, and their size is found while paging
+            self.recent_bids_total = None if self.recent_bids_search else wo_store.count_work_orders()
+        except Exception as e:
+            self.recent_bids_total = 0
+            messagebox.showerror("Error", f"Failed to load recent bids: {e}")
+        self.load_more_recent_bids()
 
-            # Filter files based on search term
-            if search_term:
-                files = [f for f in files if search_term.lower() in f.lower()]
+    def load_more_recent_bids(self):
+        tree = self.recent_bids_tree
+        order_by, descending = self.recent_bids_sort
+        offset = len(tree.get_children())
+        try:
+            if self.recent_bids_search:
+                # Full-text search over WO contents, best matches first unless a column was chosen
+                work_orders = wo_store.search_work_orders(self.recent_bids_search,
+                                                          None if order_by == "match" else order_by, descending,
+                                                          limit=self.RECENT_BIDS_PAGE_SIZE + 1, offset=offset)
+                has_more = len(work_orders) > self.RECENT_BIDS_PAGE_SIZE
+                work_orders = work_orders[:self.RECENT_BIDS_PAGE_SIZE]
+            else:
+                work_orders = wo_store.list_work_orders("", order_by, descending,
+                                                        limit=self.RECENT_BIDS_PAGE_SIZE, offset=offset)
+                has_more = offset + len(work_orders) < self.recent_bids_total
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to load recent bids: {e}")
+            return
 
-            files.sort(key=lambda f: os.path.getmtime(os.path.join(self.app_data_dir, f)), reverse=True)
-            
-            if not files:
-                tk.Label(self.recent_bids_list, text="No matching bids found.", bg=self.colors['white'], fg=self.colors['gray_dark'], font=("Arial", 10, "italic")).pack(padx=10, pady=10)
+        for work_order in work_orders:
+            # A WO saved since the last page shifts the offset; skip rows already shown
+            if tree.exists(work_order['wo_number']):
+                continue
+            modified_time = datetime.fromtimestamp(work_order['modified']).strftime('%Y-%m-%d %H:%M')
+            snippet = " ".join(work_order.get('snippet', '').split())
+            tree.insert('', 'end', iid=work_order['wo_number'],
+                        values=(work_order['wo_number'], work_order['bid_count'], modified_time, snippet))
+
+        shown = len(tree.get_children())
+        if shown == 0:
+            self.recent_bids_count_label.config(text="No matching bids found.")
+        elif self.recent_bids_search:
+            self.recent_bids_count_label.config(text=f"Showing {shown}{'+' if has_more else ''} matches")
+        else:
+            self.recent_bids_count_label.config(text=f"Showing {shown} of {self.recent_bids_total}")
+        self.load_more_button.config(state='normal' if has_more else 'disabled')
+
+    def sort_recent_bids(self, column):
+        """Sorts by ``column``; clicking the same heading again reverses the order.
+
+        "match" orders search results by relevance and only applies while searching.
+        """
+        order_by, descending = self.recent_bids_sort
+        if column == "match":
+            if not self.recent_bids_search or order_by == "match":
                 return
+            self.recent_bids_sort = ("match", False)
+        else:
+            self.recent_bids_sort = (column, not descending if column == order_by else column != "wo_number")
+        self.load_recent_bids(self.recent_bids_search)
+
+    def _schedule_recent_bids_search(self, _event=None):
+        # Wait for a pause in typing before querying
+        if self.recent_bids_search_job is not None:
+            self.root.after_cancel(self.recent_bids_search_job)
+        self.recent_bids_search_job = self.root.after(250, self._run_recent_bids_search)
+
+    def _run_recent_bids_search(self):
+        self.recent_bids_search_job = None
+        if self.search_entry.winfo_exists() and self.search_entry.get().strip() != self.recent_bids_search:
+            self.load_recent_bids(self.search_entry.get())
+
+    def selected_work_orders(self):
+        tree = getattr(self, 'recent_bids_tree', None)
+        if tree is None or not tree.winfo_exists():
+            return []
+        return list(tree.selection())
+
+    def open_selected_bid(self):
+        for wo_number in self.selected_work_orders()[:1]:
+            self.open_existing_bid(wo_number)
+
+    def export_selected_bid(self):
+        selection = self.selected_work_orders()
+        if len(selection) != 1:
+            messagebox.showwarning("Export", "Select one WO to export its saved state.")
+            return
+        self.export_bid_state(selection[0])
 
-            for i, file in enumerate(files):
-                wo_number = file.replace("WO_", "").replace(".json", "")
-                file_path = os.path.join(self.app_data_dir, file)
-                modified_time = datetime.fromtimestamp(os.path.getmtime(file_path)).strftime('%Y-%m-%d %H:%M')
-
-                # Load the JSON to get bid count
-                bid_count = 0
+    def open_bid_history(self):
+        selection = self.selected_work_orders()
+        if len(selection) != 1:
+            messagebox.showwarning("History", "Select one WO to see its version history.")
+            return
+        new_window = tk.Toplevel(self.root)
+        WOHistoryModule(new_window, selection[0], on_restore=self.load_recent_bids)
+
+    def delete_selected_bids(self):
+        selection = self.selected_work_orders()
+        if len(selection) == 1:
+            self.delete_bid_state(selection[0])
+        elif selection:
+            if messagebox.askyesno("Confirm Delete", f"Are you sure you want to permanently delete {len(selection)} bids?"):
                 try:
-                    with open(file_path, 'r') as f:
-                        state = json.load(f)
-                        if 'selected_items' in state:
-                            for category in state['selected_items']:
-                                bid_count += len(state['selected_items'][category])
+                    for wo_number in selection:
+                        wo_store.delete(wo_number)
+                    messagebox.showinfo("Success", f"{len(selection)} bids have been deleted.")
                 except Exception as e:
-                    print(f"Error loading bid count for {file}: {e}")
-                    bid_count = "N/A"
-
-                row_frame = tk.Frame(self.recent_bids_list, bg=self.colors['white'])
-                row_frame.pack(fill='x', pady=1)
-                
-                # Bind the entire row to open the bid
-                row_frame.bind("<Button-1>", lambda e, wo=wo_number: self.open_existing_bid(wo))
-
-                # Create clickable labels for each cell
-                tk.Label(row_frame, text=wo_number, font=("Arial", 10), bg=self.colors['white'], fg=self.colors['primary_blue'], anchor='w', cursor="hand2").grid(row=0, column=0, sticky='nsew', padx=5, pady=5)
-                tk.Label(row_frame, text=bid_count, font=("Arial", 10), bg=self.colors['white'], fg=self.colors['gray_dark'], anchor='w', cursor="hand2").grid(row=0, column=1, sticky='nsew', padx=5, pady=5)
-                tk.Label(row_frame, text=modified_time, font=("Arial", 10), bg=self.colors['white'], fg=self.colors['gray_dark'], anchor='w', cursor="hand2").grid(row=0, column=2, sticky='nsew', padx=5, pady=5)
-                
-                # Delete button
-                delete_button = tk.Button(row_frame, text="Delete", command=lambda wo=wo_number: self.delete_bid_state(wo), font=("Arial", 9), bg='#dc3545', fg='white', relief='flat')
-                delete_button.grid(row=0, column=3, sticky='nsew', padx=5, pady=2)
-
-                # Export button
-                export_button = tk.Button(row_frame, text="Export", command=lambda wo=wo_number: self.export_bid_state(wo), font=("Arial", 9), bg=self.colors['primary_blue'], fg='white', relief='flat')
-                export_button.grid(row=0, column=4, sticky='nsew', padx=5, pady=2)
-                
-                row_frame.grid_columnconfigure(0, weight=2)
-                row_frame.grid_columnconfigure(1, weight=2)
-                row_frame.grid_columnconfigure(2, weight=3)
-                row_frame.grid_columnconfigure(3, weight=1)
-                row_frame.grid_columnconfigure(4, weight=1)
-
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to load recent bids: {e}")
+                    messagebox.showerror("Error", f"Failed to delete bid: {e}")
+                self.load_recent_bids()
 
     # --- Dashboard Card Helper ---
     def _create_dashboard_card(self, parent, row, col, icon, title, subtitle, command):
@@ -353,8 +446,9 @@ class DashboardMenu:
         tk.Label(inner, text=title, font=("Segoe UI", 12, "bold"),
                  bg=card_bg, fg=self.colors['primary_blue']).pack(anchor='w', pady=(6, 2))
         # Subtitle
-        tk.Label(inner, text=subtitle, font=("Segoe UI", 10),
-                 bg=card_bg, fg=self.colors['gray_dark']).pack(anchor='w')
+        subtitle_label = tk.Label(inner, text=subtitle, font=("Segoe UI", 10),
+                                  bg=card_bg, fg=self.colors['gray_dark'])
+        subtitle_label.pack(anchor='w')
 
         # Click handler for all card area
         def handle_click(_e=None):
@@ -365,39 +459,115 @@ class DashboardMenu:
 
         for w in (card, inner):
             w.bind('<Button-1>', handle_click)
+        return subtitle_label
+
+    def on_notices_changed(self, added, changed, removed):
+        """Called by the notice poller when the notice sheet changed."""
+        count = len(added) + len(changed)
+        if not count:
+            return
+        self.unseen_notices += count
+        self.update_notice_badge()
+        self.show_toast(f"📢 {count} new or updated notice{'s' if count != 1 else ''} - click to view",
+                        self.open_notice_board)
+
+    def update_notice_badge(self):
+        label = self.notice_card_subtitle
+        if label is None or not label.winfo_exists():
+            return
+        if self.unseen_notices:
+            label.config(text=f"{self.unseen_notices} new notice{'s' if self.unseen_notices != 1 else ''}",
+                         fg='#dc3545', font=("Segoe UI", 10, "bold"))
+        else:
+            label.config(text="Announcements", fg=self.colors['gray_dark'], font=("Segoe UI", 10))
+
+    def show_toast(self, message, command=None, duration_ms=6000):
+        """Shows a small notification in the bottom-right corner that hides itself."""
+        if self.toast is not None and self.toast.winfo_exists():
+            self.toast.destroy()
+        toast = tk.Label(self.root, text=message, font=("Segoe UI", 10, "bold"),
+                         bg=self.colors['primary_blue'], fg=self.colors['button_text'],
+                         padx=14, pady=8, cursor='hand2')
+        toast.place(relx=1.0, rely=1.0, anchor='se', x=-20, y=-20)
+
+        def on_click(_e=None):
+            toast.destroy()
+            if command:
+                command()
+
+        toast.bind('<Button-1>', on_click)
+        self.root.after(duration_ms, lambda: toast.winfo_exists() and toast.destroy())
+        self.toast = toast
 
     def delete_bid_state(self, wo_number):
         if messagebox.askyesno("Confirm Delete", f"Are you sure you want to permanently delete the bid for WO# {wo_number}?"):
-            file_path = os.path.join(self.app_data_dir, f"WO_{wo_number}.json")
             try:
-                os.remove(file_path)
-                messagebox.showinfo("Success", f"Bid for WO# {wo_number} has been deleted.")
-                self.load_recent_bids()
-            except FileNotFoundError:
-                messagebox.showerror("Error", f"File not found for WO# {wo_number}.")
+                if wo_store.delete(wo_number):
+                    messagebox.showinfo("Success", f"Bid for WO# {wo_number} has been deleted.")
+                    self.load_recent_bids()
+                else:
+                    messagebox.showerror("Error", f"No saved bid found for WO# {wo_number}.")
             except Exception as e:
-                messagebox.showerror("Error", f"Failed to delete file: {e}")
+                messagebox.showerror("Error", f"Failed to delete bid: {e}")
 
     def export_bid_state(self, wo_number):
-        source_path = os.path.join(self.app_data_dir, f"WO_{wo_number}.json")
-        if not os.path.exists(source_path):
-            messagebox.showerror("Error", f"File for WO# {wo_number} not found.")
+        state = wo_store.load_state(wo_number)
+        if state is None:
+            messagebox.showerror("Error", f"Bid for WO# {wo_number} not found.")
             return
 
         file_path = filedialog.asksaveasfilename(
             defaultextension=".json",
-            filetypes=[("JSON File", "*.json"), ("All Files", "*.*")],
+            filetypes=[("JSON File", "*.json"), ("Compressed JSON", "*.json.gz"), ("All Files", "*.*")],
             initialfile=f"WO_{wo_number}.json",
             title="Export Bid State"
         )
         
         if file_path:
             try:
-                shutil.copyfile(source_path, file_path)
+                wo_store.write_state_file(file_path, state)
                 messagebox.showinfo("Success", f"Bid for WO# {wo_number} exported successfully to:\n{file_path}")
             except Exception as e:
                 messagebox.showerror("Error", f"Failed to export file: {e}")
 
+    def batch_export_selected(self):
+        """Renders every checked WO to a .docx file in a folder of the user's choice."""
+        wo_numbers = self.selected_work_orders()
+        if not wo_numbers:
+            messagebox.showwarning("No Bids Selected", "Select the WOs you want to export first (Ctrl/Shift-click for several).")
+            return
+
+        target_dir = filedialog.askdirectory(title="Choose Export Folder")
+        if not target_dir:
+            return
+        out_dir = os.path.join(target_dir, f"Bid_Export_{datetime.now().strftime('%Y%m%d_%H%M%S')}")
+        header_color_hex = self.colors['primary_blue'].lstrip('#')
+
+        self.export_queue.submit(ExportJob(
+            f"Batch export ({len(wo_numbers)} WOs)",
+            lambda job: export_wo_batch(wo_numbers, wo_store.load_state, out_dir, header_color_hex,
+                                        job.report_progress, job.cancel_event),
+            on_done=lambda job, results, error: self._on_batch_export_done(out_dir, results, error)
+        ))
+
+    def _on_batch_export_done(self, out_dir, results, error):
+        if error is not None:
+            messagebox.showerror("Error", f"Batch export failed: {error}")
+            return
+        exported = sum(1 for r in results if r["status"] == "Exported")
+        problems = [f"• WO# {r['wo']}: {r['status']} {r['error']}".rstrip() for r in results if r["status"] != "Exported"]
+        message = f"Exported {exported} of {len(results)} WOs to:\n{out_dir}\n\nSummary: Export_Summary.csv"
+        if problems:
+            message += "\n\n" + "\n".join(problems[:10])
+        messagebox.showinfo("Batch Export", message)
+
+    def update_batch_status(self, text):
+        try:
+            if self.batch_status_label.winfo_exists():
+                self.batch_status_label.config(text=text)
+        except (AttributeError, tk.TclError):
+            pass
+
     def create_new_bid(self):
         new_window = tk.Toplevel(self.root)
         BidWriterApp(new_window, self.username, on_save_callback=self.load_recent_bids)
@@ -411,6 +581,8 @@ class DashboardMenu:
         LetterheadBidModule(new_window)
 
     def open_notice_board(self):
+        self.unseen_notices = 0
+        self.update_notice_badge()
         new_window = tk.Toplevel(self.root)
         NoticeBoardModule(new_window)
 
@@ -418,6 +590,10 @@ class DashboardMenu:
         new_window = tk.Toplevel(self.root)
         VendorPriceModule(new_window)
 
+    def open_margin_report(self):
+        new_window = tk.Toplevel(self.root)
+        MarginReportModule(new_window)
+
     def open_gc_roof_ce(self):
         new_window = tk.Toplevel(self.root)
         GCRoofCEModule(new_window)
@@ -511,8 +687,45 @@ class DashboardMenu:
                 fg=self.colors['text_secondary'], 
                 bg=self.colors['white']).pack(side='left', padx=(10, 0))
         
+        # Notifications section
+        notify_section = tk.Frame(settings_container, bg=self.colors['white'], relief="solid", bd=1)
+        notify_section.pack(fill='x', pady=(0, 20))
+        
+        notify_header = tk.Frame(notify_section, bg=self.colors['primary_blue'], height=50)
+        notify_header.pack(fill='x')
+        notify_header.pack_propagate(False)
+        
+        tk.Label(notify_header, text="Notifications", 
+                font=("Arial", 16, "bold"), 
+                fg=self.colors['button_text'], 
+                bg=self.colors['primary_blue']).pack(side='left', padx=20, pady=15)
+        
+        notify_content = tk.Frame(notify_section, bg=self.colors['white'])
+        notify_content.pack(fill='x', padx=30, pady=20)
+        
+        tk.Label(notify_content, text="Check for new notices:", 
+                font=("Arial", 12, "bold"), 
+                fg=self.colors['text_primary'], 
+                bg=self.colors['white']).pack(side='left')
+        
+        current_label = next((label for label, minutes in self.NOTICE_POLL_CHOICES
+                              if minutes == self.notice_poller.interval_minutes),
+                             f"Every {self.notice_poller.interval_minutes} minutes")
+        self.notice_poll_var = tk.StringVar(value=current_label)
+        poll_menu = tk.OptionMenu(notify_content, self.notice_poll_var,
+                                  *[label for label, _minutes in self.NOTICE_POLL_CHOICES],
+                                  command=self.change_notice_poll_interval)
+        poll_menu.config(font=("Arial", 11), bg=self.colors['white'], fg=self.colors['text_primary'],
+                         relief="solid", bd=1, width=16)
+        poll_menu.pack(side='left', padx=(10, 0))
+        
+        tk.Label(notify_content, text="Shows a notice on the dashboard when the notice board changes", 
+                font=("Arial", 9), 
+                fg=self.colors['text_secondary'], 
+                bg=self.colors['white']).pack(side='left', padx=(10, 0))
+        
         # Additional settings sections can be added here
-        # For example: Language, Notifications, etc.
+        # For example: Language, etc.
         
         # Info section
         info_section = tk.Frame(settings_container, bg=self.colors['white'], relief="solid", bd=1)
@@ -561,6 +774,19 @@ class DashboardMenu:
                      bg=self.colors['background'], fg=self.colors['primary_blue']).pack(side='left', padx=10)
         return bar
 
+    NOTICE_POLL_CHOICES = (
+        ("Off", 0),
+        ("Every 5 minutes", 5),
+        ("Every 15 minutes", 15),
+        ("Every 30 minutes", 30),
+        ("Every hour", 60),
+    )
+
+    def change_notice_poll_interval(self, label):
+        minutes = dict(self.NOTICE_POLL_CHOICES).get(label, NoticePoller.DEFAULT_MINUTES)
+        theme_manager.set_setting(NoticePoller.SETTING_KEY, minutes)
+        self.notice_poller.set_interval(minutes)
+
     def change_theme(self, theme_name):
         """Change the application theme."""
         theme_manager.switch_theme(theme_name)
@@ -0,0 +1,125 @@
+# export_queue.py
+import queue
+import threading
+from bid_document import ExportCancelled
+from utils import TkDispatcher
+
+
+class ExportJob:
+    """A single export queued on an ExportJobQueue.
+
+    ``run`` is called on the worker thread as ``run(job)`` and must not touch
+    Tk widgets. It reports progress with ``job.report_progress`` and should pass
+    ``job.cancel_event`` down to the renderer so a cancel stops it early.
+    ``on_done(job, result, error)`` is called back on the Tk thread.
+    """
+
+    def __init__(self, label, run, on_done=None):
+        self.label = label
+        self.run = run
+        self.on_done = on_done
+        self.cancel_event = threading.Event()
+        self.queue = None
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    @property
+    def cancelled(self):
+        return self.cancel_event.is_set()
+
+    def report_progress(self, fraction, message=""):
+        if self.queue is not None:
+            self.queue._post_status(self, fraction, message)
+
+
+class ExportJobQueue:
+    """Runs document exports one after another on a background worker.
+
+    Jobs run in submission order, so several exports (for example a .docx and a
+    .txt copy) can be queued back to back while the user keeps editing.
+    ``on_status(text)`` receives human-readable progress on the Tk thread.
+    """
+
+    def __init__(self, root, on_status=None):
+        self.root = root
+        self.on_status = on_status
+        self.dispatcher = TkDispatcher(root)
+        self._jobs = queue.Queue()
+        self._pending = []
+        self._current = None
+        self._lock = threading.Lock()
+        self._worker = threading.Thread(target=self._run_worker, name="ExportWorker", daemon=True)
+        self._worker.start()
+
+    def submit(self, job):
+        """Queues a job and returns it."""
+        job.queue = self
+        with self._lock:
+            self._pending.append(job)
+        self._jobs.put(job)
+        self._post_status(job, 0.0, "Queued")
+        return job
+
+    def cancel_all(self):
+        """Cancels the running job and every job still waiting."""
+        with self._lock:
+            jobs = list(self._pending)
+            if self._current is not None:
+                jobs.append(self._current)
+        for job in jobs:
+            job.cancel()
+
+    def is_busy(self):
+        with self._lock:
+            return self._current is not None or bool(self._pending)
+
+    def shutdown(self):
+        self.cancel_all()
+        self._jobs.put(None)
+
+    def _post_status(self, job, fraction, message):
+        if not self.on_status:
+            return
+        with self._lock:
+            waiting = len(self._pending) - (1 if job in self._pending else 0)
+        text = f"{job.label}: {message} ({int(fraction * 100)}%)"
+        if waiting > 0:
+            text += f" — {waiting} more queued"
+        self.dispatcher.post(self.on_status, text)
+
+    def _run_worker(self):
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                return
+            with self._lock:
+                if job in self._pending:
+                    self._pending.remove(job)
+                self._current = job
+
+            result, error = None, None
+            if job.cancelled:
+                error = ExportCancelled()
+            else:
+                try:
+                    result = job.run(job)
+                except ExportCancelled as e:
+                    error = e
+                except Exception as e:
+                    error = e
+
+            with self._lock:
+                self._current = None
+                idle = not self._pending
+
+            if isinstance(error, ExportCancelled):
+                status = f"{job.label}: Cancelled"
+            elif error is not None:
+                status = f"{job.label}: Failed ({error})"
+            else:
+                status = f"{job.label}: Done"
+            if self.on_status:
+                self.dispatcher.post(self.on_status, status if idle else status + " — next export starting")
+            if job.on_done:
+                self.dispatcher.post(job.on_done, job, result, error)
@@ -6,6 +6,46 @@ import requests
 import csv
 import io
 import re
+from sheet_data import sheet_data
+from utils import TkDispatcher
+
+
+def parse_gc_roof_pricing(csv_text):
+    """Parses the combined pricing sheet into ``(gc_pricing, roof_pricing, warnings)``.
+
+    A bad row empties that service's table and stops the parse; its
+    ``(title, message)`` ends up in ``warnings`` for the caller to show.
+    """
+    gc_pricing_data = {}
+    roof_pricing_data = {}
+    warnings = []
+    for row in csv.DictReader(io.StringIO(csv_text)):
+        service_type = row.get('Service Type', '').strip()
+        if service_type == 'Grass Cut':
+            try:
+                base_price = float(re.sub(r'[^\d.]', '', row['Base Price']))
+                additional_price = float(re.sub(r'[^\d.]', '', row['Additional Price per 1000 SF']))
+                template = row.get('Template', "")
+                gc_pricing_data[row['Grass Height']] = {'base': base_price, 'additional': additional_price, 'template': template}
+            except (ValueError, KeyError) as e:
+                warnings.append(("GC Data Error", f"Failed to parse GC pricing data for a row. Check column names and values. Error: {e}"))
+                gc_pricing_data = {}
+                break
+        elif service_type == 'Roofing':
+            try:
+                service = row['Service']
+                storey = int(row['Storey'])
+                client = row['Client']
+                rate = float(row['Rate'])
+                if service not in roof_pricing_data: roof_pricing_data[service] = {}
+                if storey not in roof_pricing_data[service]: roof_pricing_data[service][storey] = {}
+                roof_pricing_data[service][storey][client] = rate
+            except (ValueError, KeyError) as e:
+                warnings.append(("Roof Data Error", f"Failed to parse Roof pricing data for a row. Check column names and values. Error: {e}"))
+                roof_pricing_data = {}
+                break
+    return gc_pricing_data, roof_pricing_data, warnings
+
 
 class GCRoofCEModule:
     def __init__(self, root):
@@ -31,7 +71,7 @@ class GCRoofCEModule:
         
         self.gc_pricing_data = {}
         self.roof_pricing_data = {}
-        self.combined_pricing_data_url = "https://docs.google.com/spreadsheets/d/e/2PACX-1vRJEpqzTtW-2qqxzkI_QMkwwaYIEEHid_3j1blvxwovK7aVXWB0411eBZVjKZCEKFYaQ8VcLdPe_IU6/pub?output=csv"
+        self.dispatcher = TkDispatcher(self.root)
         
         self.load_all_pricing_data()
         
@@ -46,7 +86,7 @@ class GCRoofCEModule:
         self.refresh_button = tk.Button(self.title_frame, text="Refresh Prices",
                                         font=("Arial", 10, "bold"), bg=self.colors['light_blue'], 
                                         fg="white", relief="flat", cursor="hand2",
-                                        command=self.load_all_pricing_data)
+                                        command=self.refresh_pricing_data)
         self.refresh_button.pack(side="right", padx=(0, 20))
         
         self.main_content_frame = tk.Frame(self.root, bg=self.colors['background'], padx=20, pady=10)
@@ -188,41 +228,17 @@ class GCRoofCEModule:
         self.selected_storey.trace("w", lambda *args: self.live_update_bid())
         self.selected_client.trace("w", lambda *args: self.live_update_bid())
 
-    def load_all_pricing_data(self):
+    def load_all_pricing_data(self, refresh=False):
         try:
-            response = requests.get(self.combined_pricing_data_url, timeout=10)
-            response.raise_for_status()
-            csv_data = io.StringIO(response.text)
-            reader = csv.DictReader(csv_data)
-            
-            self.gc_pricing_data = {}
-            self.roof_pricing_data = {}
-
-            for row in reader:
-                service_type = row.get('Service Type', '').strip()
-                if service_type == 'Grass Cut':
-                    try:
-                        base_price = float(re.sub(r'[^\d.]', '', row['Base Price']))
-                        additional_price = float(re.sub(r'[^\d.]', '', row['Additional Price per 1000 SF']))
-                        template = row.get('Template', "")
-                        self.gc_pricing_data[row['Grass Height']] = {'base': base_price, 'additional': additional_price, 'template': template}
-                    except (ValueError, KeyError) as e:
-                        messagebox.showwarning("GC Data Error", f"Failed to parse GC pricing data for a row. Check column names and values. Error: {e}")
-                        self.gc_pricing_data = {}
-                        break
-                elif service_type == 'Roofing':
-                    try:
-                        service = row['Service']
-                        storey = int(row['Storey'])
-                        client = row['Client']
-                        rate = float(row['Rate'])
-                        if service not in self.roof_pricing_data: self.roof_pricing_data[service] = {}
-                        if storey not in self.roof_pricing_data[service]: self.roof_pricing_data[service][storey] = {}
-                        self.roof_pricing_data[service][storey][client] = rate
-                    except (ValueError, KeyError) as e:
-                        messagebox.showwarning("Roof Data Error", f"Failed to parse Roof pricing data for a row. Check column names and values. Error: {e}")
-                        self.roof_pricing_data = {}
-                        break
+            if refresh:
+                csv_text = sheet_data.fetch("gc_roof_rates")
+            else:
+                csv_text = sheet_data.get("gc_roof_rates")
+                # Served from the last good copy; sheet edits arrive through on_pricing_data_synced
+                sheet_data.sync_in_background("gc_roof_rates", self.dispatcher, self.on_pricing_data_synced, current=csv_text)
+            self.gc_pricing_data, self.roof_pricing_data, warnings = parse_gc_roof_pricing(csv_text)
+            for title, message in warnings:
+                messagebox.showwarning(title, message)
             
             if not self.gc_pricing_data and not self.roof_pricing_data:
                 messagebox.showwarning("Data Error", "Both pricing data sheets are empty or have incorrect headers. Using default fallback.")
@@ -230,10 +246,23 @@ class GCRoofCEModule:
 
         except requests.exceptions.RequestException as e:
             messagebox.showerror("Network Error", f"Could not load pricing data. Please check the URL and internet connection. Error: {e}")
-            self.set_default_fallback_data()
+            if not refresh or not (self.gc_pricing_data or self.roof_pricing_data):
+                self.set_default_fallback_data()
         
         self.live_update_bid()
 
+    def refresh_pricing_data(self):
+        self.load_all_pricing_data(refresh=True)
+
+    def on_pricing_data_synced(self, csv_text):
+        """Applies rates that changed on the sheet since the snapshot was taken."""
+        gc_pricing_data, roof_pricing_data, warnings = parse_gc_roof_pricing(csv_text)
+        if warnings or not (gc_pricing_data or roof_pricing_data):
+            # Keep the working rates; the problem surfaces on the next explicit refresh
+            return
+        self.gc_pricing_data, self.roof_pricing_data = gc_pricing_data, roof_pricing_data
+        self.live_update_bid()
+
     def set_default_fallback_data(self):
         self.gc_pricing_data = {
             "2\"-12\"": {"base": 79.68, "additional": 8.74, "template": "Perform initial grass cut of [{grass_condition}] grass measuring up to {grass_height} inch on {maintainable_lot} sq ft area. Price includes equipment, labor and removal of generated debris. (Total lot size: {total_lot} SF, Maintainable area: {maintainable_lot} SF) {disclaimer}"},
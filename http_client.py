@@ -0,0 +1,141 @@
+# http_client.py
+import asyncio
+import functools
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import requests
+from requests.adapters import HTTPAdapter
+
+
+class FetchClient:
+    """App-wide HTTP client for the Google Sheet CSVs and notice photos.
+
+    One pooled ``requests.Session`` is shared by every module, so repeated
+    loads reuse warm keep-alive connections to docs.google.com instead of
+    paying a new TCP+TLS handshake each time. Connection errors, timeouts and
+    429/5xx responses are retried a bounded number of times with jittered
+    exponential backoff. Errors surface as ``requests.exceptions.RequestException``
+    like a bare ``requests.get`` + ``raise_for_status`` would.
+    """
+
+    DEFAULT_TIMEOUT = (5, 10)  # (connect, read) seconds
+    MAX_RETRIES = 2
+    BACKOFF_BASE = 0.5
+    BACKOFF_MAX = 4.0
+    RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+    def __init__(self, pool_maxsize=10):
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_maxsize, max_retries=0)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update({
+            "Accept-Encoding": "gzip, deflate",
+            "User-Agent": "Techvengers-BidWriter",
+        })
+
+    def _backoff(self, attempt):
+        # "Full jitter": spreads retries out so several loaders do not retry in lockstep
+        return random.uniform(0, min(self.BACKOFF_MAX, self.BACKOFF_BASE * (2 ** attempt)))
+
+    def get(self, url, timeout=None, retries=None, **kwargs):
+        """GETs ``url`` and returns the response, raising for HTTP errors.
+
+        ``timeout`` overrides the default (connect, read) timeout for this URL.
+        """
+        timeout = timeout if timeout is not None else self.DEFAULT_TIMEOUT
+        retries = self.MAX_RETRIES if retries is None else retries
+        for attempt in range(retries + 1):
+            try:
+                response = self.session.get(url, timeout=timeout, **kwargs)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+                if attempt >= retries:
+                    raise
+                time.sleep(self._backoff(attempt))
+                continue
+
+            if response.status_code in self.RETRY_STATUSES and attempt < retries:
+                retry_after = response.headers.get("Retry-After", "")
+                delay = float(retry_after) if retry_after.isdigit() else self._backoff(attempt)
+                response.close()
+                time.sleep(min(delay, self.BACKOFF_MAX))
+                continue
+            response.raise_for_status()
+            return response
+
+    def get_text(self, url, timeout=None, retries=None):
+        return self.get(url, timeout=timeout, retries=retries).text
+
+    def get_bytes(self, url, timeout=None, retries=None):
+        return self.get(url, timeout=timeout, retries=retries).content
+
+
+# Global fetch client instance
+fetch_client = FetchClient()
+
+
+class AsyncFetcher:
+    """Runs blocking fetches concurrently on an asyncio loop in a background thread.
+
+    ``submit`` schedules ``func(*args)`` (typically a ``fetch_client`` call)
+    through ``run_in_executor`` and returns a ``concurrent.futures.Future``;
+    a semaphore caps how many run at once, so a board full of photos cannot
+    open dozens of connections. ``submit_to_tk`` posts the outcome back to
+    the Tk thread through a utils.TkDispatcher, so widgets fill in as each
+    result arrives.
+    """
+
+    MAX_CONCURRENT = 6
+
+    def __init__(self, max_concurrent=None):
+        self.max_concurrent = max_concurrent or self.MAX_CONCURRENT
+        self._loop = None
+        self._semaphore = None
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def _ensure_loop(self):
+        with self._lock:
+            if self._loop is not None:
+                return self._loop
+            ready = threading.Event()
+
+            def run_loop():
+                asyncio.set_event_loop(loop)
+                self._semaphore = asyncio.Semaphore(self.max_concurrent)
+                ready.set()
+                loop.run_forever()
+
+            loop = asyncio.new_event_loop()
+            self._executor = ThreadPoolExecutor(max_workers=self.max_concurrent, thread_name_prefix="Fetch")
+            threading.Thread(target=run_loop, name="AsyncFetcher", daemon=True).start()
+            ready.wait()
+            self._loop = loop
+            return loop
+
+    async def _run(self, func, args):
+        async with self._semaphore:
+            return await self._loop.run_in_executor(self._executor, functools.partial(func, *args))
+
+    def submit(self, func, *args):
+        """Runs ``func(*args)`` concurrently and returns a Future of its result. Safe from any thread."""
+        loop = self._ensure_loop()
+        return asyncio.run_coroutine_threadsafe(self._run(func, args), loop)
+
+    def submit_to_tk(self, dispatcher, on_done, func, *args):
+        """Like ``submit``, then calls ``on_done(result, error)`` on the Tk thread."""
+        def done(future):
+            try:
+                dispatcher.post(on_done, future.result(), None)
+            except Exception as e:
+                dispatcher.post(on_done, None, e)
+
+        future = self.submit(func, *args)
+        future.add_done_callback(done)
+        return future
+
+
+# Global async fetcher instance
+async_fetcher = AsyncFetcher()
@@ -0,0 +1,175 @@
+# image_cache.py
+import os
+import io
+import json
+import time
+import hashlib
+import threading
+import requests
+from http_client import fetch_client
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+
+class ImageCache:
+    """Disk cache of downloaded photos (notice board images) keyed by URL.
+
+    Each entry keeps the original bytes and a thumbnail per requested size,
+    so a cached photo is shown without any network call or re-decode of the
+    full image. ``revalidate=True`` asks the server with the stored ETag /
+    Last-Modified first and only downloads again if the photo changed.
+    The least recently used entries are dropped once the cache grows past
+    ``max_bytes``. Meant to be called off the Tk thread.
+    """
+
+    CACHE_DIRNAME = "image_cache"
+    INDEX_FILENAME = "index.json"
+    MAX_BYTES = 100 * 1024 * 1024
+    FETCH_TIMEOUT = (3, 5)
+
+    def __init__(self, app_data_dir=None, max_bytes=None):
+        self.app_data_dir = app_data_dir or os.path.join(os.path.expanduser("~"), ".techvengers_bidwriter")
+        self.cache_dir = os.path.join(self.app_data_dir, self.CACHE_DIRNAME)
+        self.max_bytes = max_bytes or self.MAX_BYTES
+        self._index = None
+        self._lock = threading.RLock()
+
+    # --- Index ---
+
+    def _index_path(self):
+        return os.path.join(self.cache_dir, self.INDEX_FILENAME)
+
+    def _load_index(self):
+        if self._index is None:
+            try:
+                with open(self._index_path(), 'r', encoding='utf-8') as f:
+                    self._index = json.load(f)
+            except (OSError, ValueError):
+                self._index = {}
+        return self._index
+
+    def _save_index(self):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        temp_path = self._index_path() + ".tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(self._index, f)
+        os.replace(temp_path, self._index_path())
+
+    @staticmethod
+    def _key(url):
+        return hashlib.sha1(url.encode('utf-8')).hexdigest()
+
+    def _path(self, key, suffix):
+        return os.path.join(self.cache_dir, f"{key}{suffix}")
+
+    @staticmethod
+    def _thumb_suffix(max_size):
+        return f"_{max_size[0]}x{max_size[1]}.png"
+
+    def _remove_entry(self, key):
+        entry = self._load_index().pop(key, None)
+        for suffix in [".orig"] + [self._thumb_suffix(size) for size in (entry or {}).get("thumbs", [])]:
+            try:
+                os.remove(self._path(key, suffix))
+            except OSError:
+                pass
+
+    def _evict(self):
+        """Drops least recently used entries until the cache fits ``max_bytes``."""
+        index = self._load_index()
+        total = sum(entry.get("size", 0) for entry in index.values())
+        for key in sorted(index, key=lambda k: index[k].get("last_used", 0)):
+            if total <= self.max_bytes:
+                break
+            total -= index[key].get("size", 0)
+            self._remove_entry(key)
+
+    # --- Public API ---
+
+    def get_thumbnail(self, url, max_size=(300, 200), revalidate=False):
+        """Returns a PIL image of ``url`` shrunk to fit ``max_size``, from disk when cached.
+
+        A cached photo that cannot be revalidated (offline, server error) is
+        served from disk. Raises RequestException if the photo is not cached
+        and cannot be downloaded.
+        """
+        key = self._key(url)
+        thumb_suffix = self._thumb_suffix(max_size)
+        with self._lock:
+            entry = self._load_index().get(key)
+            cached = entry is not None and os.path.exists(self._path(key, ".orig"))
+
+        if cached and revalidate:
+            headers = {}
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+            try:
+                response = fetch_client.get(url, timeout=self.FETCH_TIMEOUT, headers=headers)
+            except requests.exceptions.RequestException as e:
+                print(f"Could not revalidate {url}, showing the cached copy: {e}")
+                response = None
+            if response is not None and response.status_code != 304:
+                return self._store(url, key, response, max_size)
+
+        if cached:
+            with self._lock:
+                entry["last_used"] = time.time()
+                thumb_path = self._path(key, thumb_suffix)
+                if list(max_size) not in entry.get("thumbs", []) or not os.path.exists(thumb_path):
+                    with open(self._path(key, ".orig"), 'rb') as f:
+                        img = self._write_thumbnail(key, entry, f.read(), max_size)
+                else:
+                    img = Image.open(thumb_path)
+                    img.load()
+                self._save_index()
+            return img
+
+        return self._store(url, key, fetch_client.get(url, timeout=self.FETCH_TIMEOUT), max_size)
+
+    def _store(self, url, key, response, max_size):
+        data = response.content
+        with self._lock:
+            self._remove_entry(key)
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(self._path(key, ".orig"), 'wb') as f:
+                f.write(data)
+            entry = {
+                "url": url,
+                "etag": response.headers.get("ETag"),
+                "last_modified": response.headers.get("Last-Modified"),
+                "size": len(data),
+                "thumbs": [],
+                "last_used": time.time(),
+            }
+            self._load_index()[key] = entry
+            try:
+                img = self._write_thumbnail(key, entry, data, max_size)
+            except Exception:
+                # Not an image (e.g. a sign-in page); do not keep it
+                self._remove_entry(key)
+                raise
+            self._evict()
+            self._save_index()
+        return img
+
+    def _write_thumbnail(self, key, entry, data, max_size):
+        img = Image.open(io.BytesIO(data))
+        # Resize image to fit, maintaining aspect ratio
+        img.thumbnail(max_size, Image.Resampling.LANCZOS)
+        if img.mode not in ("RGB", "RGBA", "L", "LA", "P"):
+            img = img.convert("RGB")
+        thumb_path = self._path(key, self._thumb_suffix(max_size))
+        img.save(thumb_path, "PNG")
+        if list(max_size) not in entry["thumbs"]:
+            entry["thumbs"].append(list(max_size))
+            entry["size"] += os.path.getsize(thumb_path)
+        return img
+
+
+# Global image cache instance
+image_cache = ImageCache()
@@ -1,6 +1,6 @@
 # letterhead_bid_module.py
 import tkinter as tk
-from tkinter import messagebox, filedialog
+from tkinter import messagebox, filedialog, ttk
 import os
 from datetime import datetime
 from docx import Document
@@ -10,7 +10,238 @@ from docx.shared import RGBColor
 from docx.oxml.ns import nsdecls
 from docx.oxml import parse_xml
 import io
+import csv
+import copy
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from PIL import Image
+from export_queue import ExportJob, ExportJobQueue
+
+
+class LetterheadTemplateCache:
+    """Keeps each letterhead template parsed in memory.
+
+    A template is read and scanned once: the positions of the WO / PROPERTY
+    ADDRESS / DATE paragraphs and of the "SL" bid table are recorded, and every
+    generation works on a deep copy of that prepared document. The file is
+    re-read only if it changes on disk.
+    """
+
+    TEMPLATE_PATHS = {
+        "ESUS Property Management LLC": "templates/esus_template.docx",
+        "RAPID CARE Field Services": "templates/rapid_care_template.docx",
+    }
+    PLACEHOLDERS = ('WO:', 'PROPERTY ADDRESS:', 'DATE:')
+
+    def __init__(self):
+        self._templates = {}
+        self._lock = threading.Lock()
+
+    def template_path(self, template_name):
+        return self.TEMPLATE_PATHS.get(template_name, "")
+
+    def _prepare(self, template_path):
+        doc = Document(template_path)
+        # Copy before scanning: python-docx caches proxy objects on first access
+        # and those would be deep-copied as detached trees into every document
+        pristine = copy.deepcopy(doc)
+
+        placeholders = {}
+        for index, para in enumerate(doc.paragraphs):
+            for label in self.PLACEHOLDERS:
+                if label in para.text:
+                    placeholders.setdefault(label, []).append(index)
+
+        table_index = None
+        for index, table in enumerate(doc.tables):
+            # Assuming the first table with a header "SL" is the correct one
+            if table.rows[0].cells[0].text.strip() == 'SL':
+                table_index = index
+                break
+
+        return {
+            'mtime': os.path.getmtime(template_path),
+            'document': pristine,
+            'placeholders': placeholders,
+            'table_index': table_index,
+        }
+
+    def new_document(self, template_name):
+        """Returns ``(document, placeholders, table)`` for a fresh copy of a template.
+
+        ``placeholders`` maps each label to the paragraphs containing it and
+        ``table`` is the bid table, or None if the template has none.
+        """
+        template_path = self.template_path(template_name)
+        mtime = os.path.getmtime(template_path)
+
+        with self._lock:
+            prepared = self._templates.get(template_path)
+            if prepared is None or prepared['mtime'] != mtime:
+                prepared = self._prepare(template_path)
+                self._templates[template_path] = prepared
+            doc = copy.deepcopy(prepared['document'])
+
+        paragraphs = doc.paragraphs
+        placeholders = {label: [paragraphs[i] for i in indexes]
+                        for label, indexes in prepared['placeholders'].items()}
+        table = doc.tables[prepared['table_index']] if prepared['table_index'] is not None else None
+        return doc, placeholders, table
+
+
+letterhead_templates = LetterheadTemplateCache()
+
+
+def parse_amount(value):
+    """Parses a quantity or price typed as "1,200", "$45.00" or left blank."""
+    value = str(value).strip().replace('$', '').replace(',', '')
+    return float(value) if value else 0.0
+
+
+def fill_bid_table(table, line_items):
+    """Fills the SL table with one row per line item followed by the Total row.
+
+    The template's first data row is cloned for every extra line so its
+    formatting carries over; templates that only have a header row get plain
+    rows appended. Returns the grand total.
+    """
+    rows = list(table.rows)
+    data_row = rows[1] if len(rows) > 1 else table.add_row()
+    total_row = rows[-1] if len(rows) > 2 else table.add_row()
+
+    # Drop any sample rows between the first data row and the Total row
+    for row in rows[2:-1]:
+        row._tr.getparent().remove(row._tr)
+
+    prototype = copy.deepcopy(data_row._tr)
+    previous_tr = data_row._tr
+    for _ in line_items[1:]:
+        new_tr = copy.deepcopy(prototype)
+        previous_tr.addnext(new_tr)
+        previous_tr = new_tr
+
+    grand_total = 0.0
+    data_rows = list(table.rows)[1:1 + len(line_items)]
+    for number, (row, item) in enumerate(zip(data_rows, line_items), 1):
+        qty = parse_amount(item['qty'])
+        price = parse_amount(item['price'])
+        line_total = qty * price
+        grand_total += line_total
+
+        cells = row.cells
+        cells[0].text = str(number)
+        cells[1].text = item['description']
+        cells[2].text = str(item['qty']).strip()
+        cells[3].text = f"${price:.2f}"
+        cells[4].text = f"${line_total:.2f}"
+
+    total_row_cells = total_row.cells
+    total_row_cells[3].text = 'Total'
+    total_row_cells[3].paragraphs[0].runs[0].font.bold = True
+    total_row_cells[3].paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.RIGHT
+    total_row_cells[4].text = f"${grand_total:.2f}"
+    total_row_cells[4].paragraphs[0].runs[0].font.bold = True
+    return grand_total
+
+
+def build_letterhead_document(template_name, wo, address, date, line_items):
+    """Builds a letterhead bid from the cached template without any widgets.
+
+    Raises ValueError if the template has no bid table.
+    """
+    doc, placeholders, table = letterhead_templates.new_document(template_name)
+
+    # Replace the placeholders found when the template was cached
+    for para in placeholders.get('WO:', []):
+        para.text = ''
+        para.add_run(f'WO: {wo}').bold = True
+    for para in placeholders.get('PROPERTY ADDRESS:', []):
+        para.text = ''
+        para.add_run(f'PROPERTY ADDRESS: {address}').bold = True
+    for para in placeholders.get('DATE:', []):
+        para.text = ''
+        para.add_run(f'DATE: {date}').bold = True
+
+    if table is None:
+        raise ValueError("No bid table found in the template.")
+    fill_bid_table(table, line_items)
+    return doc
+
+
+def read_letterhead_batch_csv(csv_path, default_template):
+    """Reads a batch CSV into one job per WO.
+
+    Columns (case-insensitive): WO and Address are required; Date,
+    Description, Qty, Price and Template are optional. Rows sharing a WO become
+    line items of the same document, in file order.
+    """
+    aliases = {
+        'wo': 'wo', 'address': 'address', 'property address': 'address', 'date': 'date',
+        'description': 'description', 'qty': 'qty', 'quantity': 'qty',
+        'price': 'price', 'cost': 'price', 'template': 'template',
+    }
+    jobs = {}
+    with open(csv_path, 'r', newline='', encoding='utf-8-sig') as f:
+        for row in csv.DictReader(f):
+            row = {aliases.get((key or '').strip().lower()): (value or '').strip()
+                   for key, value in row.items()}
+            wo = row.get('wo', '')
+            if not wo:
+                continue
+            job = jobs.setdefault(wo, {
+                'wo': wo,
+                'address': row.get('address', ''),
+                'date': row.get('date') or datetime.now().strftime("%B %d, %Y"),
+                'template': row.get('template') or default_template,
+                'line_items': [],
+            })
+            if row.get('description'):
+                job['line_items'].append({
+                    'description': row['description'],
+                    'qty': row.get('qty') or '1',
+                    'price': row.get('price') or '0',
+                })
+    return list(jobs.values())
+
+
+def _generate_letterhead(job, out_dir, cancel_event):
+    if cancel_event is not None and cancel_event.is_set():
+        return {'wo': job['wo'], 'status': 'Cancelled', 'file': '', 'error': ''}
+    if job['template'] not in LetterheadTemplateCache.TEMPLATE_PATHS:
+        raise ValueError(f"Unknown template '{job['template']}'")
+    line_items = job['line_items'] or [{'description': '', 'qty': '1', 'price': '0'}]
+    doc = build_letterhead_document(job['template'], job['wo'], job['address'], job['date'], line_items)
+    file_name = f"Bid_{job['wo']}_{datetime.now().strftime('%Y%m%d')}.docx"
+    doc.save(os.path.join(out_dir, file_name))
+    return {'wo': job['wo'], 'status': 'Generated', 'file': file_name, 'error': ''}
+
+
+def generate_letterhead_batch(jobs, out_dir, progress=None, cancel_event=None, max_workers=None):
+    """Generates one letterhead document per job concurrently into ``out_dir``.
+
+    Every document is a copy of the cached template, so the template is parsed
+    once for the whole batch. A Letterhead_Summary.csv is written alongside.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    results = []
+    with ThreadPoolExecutor(max_workers=max_workers or min(4, os.cpu_count() or 1)) as pool:
+        futures = {pool.submit(_generate_letterhead, job, out_dir, cancel_event): job for job in jobs}
+        for future in as_completed(futures):
+            job = futures[future]
+            try:
+                results.append(future.result())
+            except Exception as e:
+                results.append({'wo': job['wo'], 'status': 'Failed', 'file': '', 'error': str(e)})
+            if progress:
+                progress(len(results) / len(jobs), f"{len(results)} of {len(jobs)} documents")
+
+    results.sort(key=lambda r: r['wo'])
+    with open(os.path.join(out_dir, "Letterhead_Summary.csv"), 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=['wo', 'status', 'file', 'error'])
+        writer.writeheader()
+        writer.writerows(results)
+    return results
+
 
 class LetterheadBidModule:
     def __init__(self, root):
@@ -91,10 +322,77 @@ class LetterheadBidModule:
         self.price_entry.grid(row=row, column=1, sticky="ew", pady=5, padx=5)
 
         row += 1
-        generate_button = tk.Button(main_frame, text="Generate Document", command=self.generate_document,
+        line_buttons = tk.Frame(main_frame, bg=self.colors['white'])
+        line_buttons.grid(row=row, column=1, sticky="w", pady=5, padx=5)
+        tk.Button(line_buttons, text="Add Line", command=self.add_line_item,
+                  font=("Arial", 10, "bold"), bg=self.colors['primary_blue'], fg='white',
+                  relief="flat", cursor="hand2").pack(side="left", padx=(0, 5))
+        tk.Button(line_buttons, text="Remove Line", command=self.remove_line_item,
+                  font=("Arial", 10, "bold"), bg='#dc3545', fg='white',
+                  relief="flat", cursor="hand2").pack(side="left")
+
+        row += 1
+        tk.Label(main_frame, text="Line Items:", font=("Arial", 11, "bold"), bg=self.colors['white']).grid(row=row, column=0, sticky="nw", pady=5, padx=5)
+        self.line_items = []
+        self.line_items_tree = ttk.Treeview(main_frame, columns=("description", "qty", "price", "total"),
+                                            show="headings", height=5)
+        for column, heading, width in (("description", "Description", 320), ("qty", "Qty", 60),
+                                       ("price", "Price", 80), ("total", "Total", 90)):
+            self.line_items_tree.heading(column, text=heading)
+            self.line_items_tree.column(column, width=width, stretch=(column == "description"))
+        self.line_items_tree.grid(row=row, column=1, sticky="ew", pady=5, padx=5)
+
+        row += 1
+        buttons_frame = tk.Frame(main_frame, bg=self.colors['white'])
+        buttons_frame.grid(row=row, column=0, columnspan=2, pady=20)
+        generate_button = tk.Button(buttons_frame, text="Generate Document", command=self.generate_document,
                                     font=("Arial", 12, "bold"), bg=self.colors['green'], fg='white',
                                     relief="solid", bd=1, cursor="hand2")
-        generate_button.grid(row=row, column=0, columnspan=2, pady=20)
+        generate_button.pack(side="left", padx=(0, 10))
+        batch_button = tk.Button(buttons_frame, text="Batch from CSV", command=self.generate_batch_from_csv,
+                                 font=("Arial", 12, "bold"), bg=self.colors['primary_blue'], fg='white',
+                                 relief="solid", bd=1, cursor="hand2")
+        batch_button.pack(side="left")
+
+        row += 1
+        self.status_label = tk.Label(main_frame, text="", font=("Arial", 9),
+                                     bg=self.colors['white'], fg=self.colors['gray_dark'])
+        self.status_label.grid(row=row, column=0, columnspan=2)
+        self.export_queue = ExportJobQueue(self.root, on_status=lambda text: self.status_label.config(text=text))
+
+    def _read_line_item_fields(self):
+        """Returns the line item typed in the Description/Quantity/Price fields."""
+        return {
+            'description': self.desc_text.get("1.0", tk.END).strip(),
+            'qty': self.qty_entry.get().strip(),
+            'price': self.price_entry.get().strip(),
+        }
+
+    def add_line_item(self):
+        item = self._read_line_item_fields()
+        if not item['description']:
+            messagebox.showwarning("Warning", "Please enter a description for the line item.")
+            return
+        try:
+            total = parse_amount(item['qty']) * parse_amount(item['price'])
+        except ValueError:
+            messagebox.showerror("Input Error", "Please enter valid numerical values for QTY and Price.")
+            return
+
+        self.line_items.append(item)
+        self.line_items_tree.insert("", tk.END, values=(item['description'].replace("\n", " "), item['qty'],
+                                                        f"${parse_amount(item['price']):.2f}", f"${total:.2f}"))
+        self.desc_text.delete("1.0", tk.END)
+        self.qty_entry.delete(0, tk.END)
+        self.qty_entry.insert(0, "1")
+        self.price_entry.delete(0, tk.END)
+        self.price_entry.insert(0, "0.00")
+
+    def remove_line_item(self):
+        for iid in self.line_items_tree.selection():
+            index = self.line_items_tree.index(iid)
+            self.line_items_tree.delete(iid)
+            del self.line_items[index]
 
     def set_cell_background(self, cell, color):
         shading_elm = parse_xml(r'<w:shd {} w:fill="{}"/>'.format(nsdecls('w'), color))
@@ -106,68 +404,30 @@ class LetterheadBidModule:
             wo = self.wo_entry.get()
             address = self.address_text.get("1.0", tk.END).strip()
             date = self.date_entry.get()
-            description = self.desc_text.get("1.0", tk.END).strip()
-            qty_str = self.qty_entry.get().strip()
-            price_str = self.price_entry.get().strip().replace('$', '').replace(',', '')
-            
-            qty = float(qty_str) if qty_str else 0.0
-            price = float(price_str) if price_str else 0.0
-            total_cost = qty * price
+
+            # A line still sitting in the fields counts as the last line item
+            line_items = list(self.line_items)
+            pending = self._read_line_item_fields()
+            if pending['description'] or not line_items:
+                line_items.append(pending)
+            for item in line_items:
+                parse_amount(item['qty'])
+                parse_amount(item['price'])
 
             if not template_name:
                 messagebox.showwarning("Warning", "Please select a template.")
                 return
 
-            template_path = ""
-            if template_name == "ESUS Property Management LLC":
-                template_path = "templates/esus_template.docx"
-            elif template_name == "RAPID CARE Field Services":
-                template_path = "templates/rapid_care_template.docx"
+            template_path = letterhead_templates.template_path(template_name)
 
             if not os.path.exists(template_path):
                 messagebox.showerror("File Error", f"Template file not found at: {template_path}")
                 return
 
-            doc = Document(template_path)
-            
-            # Find and replace placeholders
-            for para in doc.paragraphs:
-                if 'WO:' in para.text:
-                    para.text = ''
-                    para.add_run(f'WO: {wo}').bold = True
-                if 'PROPERTY ADDRESS:' in para.text:
-                    para.text = ''
-                    para.add_run(f'PROPERTY ADDRESS: {address}').bold = True
-                if 'DATE:' in para.text:
-                    para.text = ''
-                    para.add_run(f'DATE: {date}').bold = True
-
-            # Find the table and populate it
-            table_found = False
-            for table in doc.tables:
-                # Assuming the first table with a header "SL" is the correct one
-                if table.rows[0].cells[0].text.strip() == 'SL':
-                    # Populate the first data row
-                    data_row_cells = table.rows[1].cells
-                    data_row_cells[0].text = '1'
-                    data_row_cells[1].text = description
-                    data_row_cells[2].text = str(qty_str)
-                    data_row_cells[3].text = f"${price:.2f}"
-                    data_row_cells[4].text = f"${total_cost:.2f}"
-                    
-                    # Populate the Total row
-                    total_row_cells = table.rows[2].cells
-                    total_row_cells[3].text = 'Total'
-                    total_row_cells[3].paragraphs[0].runs[0].font.bold = True
-                    total_row_cells[3].paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.RIGHT
-                    total_row_cells[4].text = f"${total_cost:.2f}"
-                    total_row_cells[4].paragraphs[0].runs[0].font.bold = True
-                    
-                    table_found = True
-                    break
-
-            if not table_found:
-                messagebox.showwarning("Warning", "No bid table found in the template.")
+            try:
+                doc = build_letterhead_document(template_name, wo, address, date, line_items)
+            except ValueError as e:
+                messagebox.showwarning("Warning", str(e))
                 return
 
             # Save the document
@@ -185,4 +445,44 @@ class LetterheadBidModule:
         except FileNotFoundError as e:
             messagebox.showerror("File Error", f"Template or logo file not found. Make sure 'templates' folder exists and contains the correct files.")
         except Exception as e:
-            messagebox.showerror("Error", f"An unexpected error occurred: {e}")
\ No newline at end of file
+            messagebox.showerror("Error", f"An unexpected error occurred: {e}")
+
+    def generate_batch_from_csv(self):
+        """Generates a letterhead document for every WO listed in a CSV file."""
+        csv_path = filedialog.askopenfilename(
+            title="Select Batch CSV",
+            filetypes=[("CSV File", "*.csv"), ("All Files", "*.*")]
+        )
+        if not csv_path:
+            return
+
+        try:
+            jobs = read_letterhead_batch_csv(csv_path, self.selected_template.get())
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to read batch CSV: {e}")
+            return
+        if not jobs:
+            messagebox.showwarning("Warning", "The CSV has no rows with a WO column.")
+            return
+
+        target_dir = filedialog.askdirectory(title="Choose Output Folder")
+        if not target_dir:
+            return
+        out_dir = os.path.join(target_dir, f"Letterhead_Bids_{datetime.now().strftime('%Y%m%d_%H%M%S')}")
+
+        self.export_queue.submit(ExportJob(
+            f"Batch ({len(jobs)} WOs)",
+            lambda job: generate_letterhead_batch(jobs, out_dir, job.report_progress, job.cancel_event),
+            on_done=lambda job, results, error: self._on_batch_done(out_dir, results, error)
+        ))
+
+    def _on_batch_done(self, out_dir, results, error):
+        if error is not None:
+            messagebox.showerror("Error", f"Batch generation failed: {error}")
+            return
+        generated = sum(1 for r in results if r['status'] == 'Generated')
+        problems = [f"• WO {r['wo']}: {r['error']}" for r in results if r['status'] == 'Failed']
+        message = f"Generated {generated} of {len(results)} documents in:\n{out_dir}\n\nSummary: Letterhead_Summary.csv"
+        if problems:
+            message += "\n\n" + "\n".join(problems[:10])
+        messagebox.showinfo("Batch Complete", message)
@@ -8,6 +8,18 @@ import csv
 import io
 from dashboard_menu import DashboardMenu # Import the new DashboardMenu
 from theme_manager import theme_manager
+from sheet_data import sheet_data
+from utils import TkDispatcher
+
+
+def parse_credentials(csv_text):
+    """Parses the credentials sheet into ``{username: password}``."""
+    credentials_dict = {}
+    for row in csv.DictReader(io.StringIO(csv_text)):
+        if 'Username' in row and 'Password' in row:
+            credentials_dict[row['Username'].strip()] = row['Password'].strip()
+    return credentials_dict
+
 
 class LoginPage:
     def __init__(self, master):
@@ -86,14 +98,15 @@ class LoginPage:
         )
         login_button_frame.pack(pady=10)
         
-        self.credentials_url = "https://docs.google.com/spreadsheets/d/17ckYvmA47Sa5PJ0-KyqvlyoODMK2bLQWrZx1KofOvrc/gviz/tq?tqx=out:csv&sheet=Sheet1"
-        
+        self.dispatcher = TkDispatcher(master)
+
         self.app_data_dir = os.path.join(os.path.expanduser("~"), ".techvengers_bidwriter")
         os.makedirs(self.app_data_dir, exist_ok=True)
         self.credentials_file = os.path.join(self.app_data_dir, "credentials.json")
 
         self.load_saved_credentials()
-        self.credentials = self.load_credentials_from_url(self.credentials_url)
+        # Credentials are never snapshotted to disk, so this downloads them once per run
+        self.credentials = self.load_credentials()
     
     def create_shadow_button(self, parent, text, command, button_bg, button_fg, shadow_bg, padx=10, pady=5):
         shadow_frame = tk.Frame(parent, bg=shadow_bg, bd=1, relief="solid")
@@ -113,20 +126,15 @@ class LoginPage:
         button.pack(padx=2, pady=2)
         return shadow_frame
         
-    def load_credentials_from_url(self, url):
-        credentials_dict = {}
+    def load_credentials(self, refresh=False):
         try:
-            response = requests.get(url, timeout=10)
-            response.raise_for_status()
-            
-            csv_data = io.StringIO(response.text)
-            reader = csv.DictReader(csv_data)
-            
-            for row in reader:
-                if 'Username' in row and 'Password' in row:
-                    credentials_dict[row['Username'].strip()] = row['Password'].strip()
-            return credentials_dict
-            
+            if refresh:
+                csv_text = sheet_data.fetch("credentials")
+            else:
+                csv_text = sheet_data.get("credentials")
+                sheet_data.sync_in_background("credentials", self.dispatcher, self.on_credentials_synced, current=csv_text)
+            return parse_credentials(csv_text)
+
         except requests.exceptions.RequestException as e:
             messagebox.showerror("Network Error", f"Could not connect to online credentials file. Please check your internet connection.\nError: {e}")
             return None
@@ -134,9 +142,16 @@ class LoginPage:
             messagebox.showerror("Error", f"Failed to parse credentials file.\nError: {e}")
             return None
 
+    def on_credentials_synced(self, csv_text):
+        try:
+            self.credentials = parse_credentials(csv_text)
+        except Exception as e:
+            print(f"Could not parse synced credentials: {e}")
+
     def refresh_credentials(self):
-        self.credentials = self.load_credentials_from_url(self.credentials_url)
-        if self.credentials:
+        credentials = self.load_credentials(refresh=True)
+        if credentials:
+            self.credentials = credentials
             messagebox.showinfo("Refresh Complete", "Credentials have been refreshed successfully.")
     
     def toggle_password(self):
@@ -166,6 +181,10 @@ class LoginPage:
     def login_check(self):
         username = self.username_entry.get()
         password = self.password_entry.get()
+
+        # Never check a password against a copy older than its TTL (it may list revoked users)
+        if not sheet_data.is_fresh("credentials"):
+            self.credentials = self.load_credentials(refresh=True)
         
         if self.credentials and username in self.credentials and self.credentials[username] == password:
             if self.save_password_var.get():
@@ -0,0 +1,224 @@
+# margin_report.py
+import re
+import csv
+import sys
+import math
+import time
+from collections import Counter
+from difflib import SequenceMatcher
+from sheet_data import sheet_data
+from bid_writer_module import parse_bid_catalog
+from vendor_price_module import parse_vendor_prices
+
+# Words that carry no meaning for matching "2x4 Studs" against "Stud, 2 x 4"
+STOP_WORDS = {"a", "an", "and", "the", "of", "for", "with", "to", "on", "per", "each", "ea"}
+UNIT_ALIASES = {"foot": "ft", "feet": "ft", "inch": "in", "inches": "in", "square": "sq",
+                "gallon": "gal", "gallons": "gal", "pound": "lb", "pounds": "lb"}
+
+REPORT_COLUMNS = [
+    ("category", "Bid Category"),
+    ("item_name", "Bid Item"),
+    ("bid_price", "Bid Unit Price"),
+    ("vendor_category", "Vendor Category"),
+    ("vendor_item", "Vendor Item"),
+    ("vendor_price", "Vendor Price"),
+    ("match_score", "Match"),
+    ("margin", "Margin"),
+    ("margin_pct", "Margin %"),
+    ("status", "Status"),
+]
+
+STATUS_BELOW_COST = "Below cost"
+STATUS_OK = "OK"
+STATUS_NO_PRICE = "No price"
+STATUS_NO_MATCH = "No match"
+
+
+def normalize_tokens(name):
+    """The item name as a set of match tokens.
+
+    Words and numbers are split apart ("8ft" and "8 ft" both give 8, ft),
+    stop words are dropped, unit spellings folded and plurals singularized.
+    """
+    tokens = set()
+    for token in re.findall(r"[a-z]+|\d+(?:\.\d+)?", name.lower()):
+        if token in STOP_WORDS:
+            continue
+        token = UNIT_ALIASES.get(token, token)
+        if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+            token = token[:-1]
+        tokens.add(token)
+    return frozenset(tokens)
+
+
+def parse_price(value):
+    """A sheet price (``"$1,250.00"``, ``12.5``) as a float, or None if it is not a number."""
+    if isinstance(value, (int, float)):
+        return float(value)
+    try:
+        return float(re.sub(r'[^\d.]', '', str(value or '')))
+    except ValueError:
+        return None
+
+
+class ItemMatcher:
+    """Matches bid item names to vendor items by their normalized tokens.
+
+    Names with the same token set match exactly (score 1.0). Otherwise the
+    score is the token overlap (shared tokens over all tokens of both
+    names), and ties go to the closer spelling. Matches scoring under
+    ``min_score`` are treated as no match.
+
+    Two names can only reach ``min_score`` if they share one of their
+    ``n - ceil(min_score * n) + 1`` rarest tokens (rarest across the vendor
+    list), so each vendor item is indexed under just those and a bid name
+    only probes its own. Common words ("install", "x") end up in few
+    posting lists and the candidates per name stay small.
+    """
+
+    MIN_SCORE = 0.5
+
+    def __init__(self, vendor_data, min_score=None):
+        self.min_score = self.MIN_SCORE if min_score is None else min_score
+        self.items = []  # (category, item_name, price) by position
+        self.token_sets = []
+        self.exact = {}
+        for category, items in vendor_data.items():
+            for item_data in items:
+                tokens = normalize_tokens(item_data['item'])
+                self.exact.setdefault(tokens, len(self.items))
+                self.items.append((category, item_data['item'], item_data['price']))
+                self.token_sets.append(tokens)
+        self.sizes = [len(tokens) for tokens in self.token_sets]
+        self.frequency = Counter(token for tokens in self.token_sets for token in tokens)
+        self.postings = {}
+        for position, tokens in enumerate(self.token_sets):
+            for token in self._prefix(tokens):
+                self.postings.setdefault(token, []).append(position)
+
+    def _prefix(self, tokens):
+        """The rarest tokens of a name, enough that any good match shares one of them."""
+        required = max(1, math.ceil(self.min_score * len(tokens) - 1e-9))
+        return sorted(tokens, key=lambda token: (self.frequency.get(token, 0), token))[:len(tokens) - required + 1]
+
+    def match(self, name):
+        """Returns ``(position, score)`` of the best vendor item for ``name``, or ``(None, 0.0)``."""
+        tokens = normalize_tokens(name)
+        if not tokens:
+            return None, 0.0
+        if tokens in self.exact:
+            return self.exact[tokens], 1.0
+
+        candidates = set()
+        for token in self._prefix(tokens):
+            candidates.update(self.postings.get(token, ()))
+
+        # The overlap is at most the smaller name, so sizes outside this window cannot reach min_score
+        size = len(tokens)
+        smallest, largest = self.min_score * size, size / self.min_score if self.min_score else math.inf
+        token_sets, sizes = self.token_sets, self.sizes
+        best, best_score = [], 0.0
+        for position in candidates:
+            item_size = sizes[position]
+            if item_size < smallest or item_size > largest:
+                continue
+            shared = len(tokens & token_sets[position])
+            score = shared / (size + item_size - shared)
+            if score > best_score:
+                best, best_score = [position], score
+            elif score == best_score:
+                best.append(position)
+        if not best or best_score < self.min_score:
+            return None, 0.0
+        if len(best) > 1:
+            key = " ".join(sorted(tokens))
+            best.sort(key=lambda p: (-SequenceMatcher(None, key, " ".join(sorted(token_sets[p]))).ratio(), p))
+        return best[0], best_score
+
+
+def build_margin_report(bid_categories, vendor_data, min_score=None):
+    """Joins the bid catalog to the vendor price list, one report row per bid item.
+
+    ``bid_categories`` is the parsed bid catalog (``parse_bid_catalog``) and
+    ``vendor_data`` the parsed vendor sheet (``parse_vendor_prices``). The
+    margin is the bid unit price minus the vendor price, and its percentage
+    is taken of the bid price. Rows are in bid catalog order.
+    """
+    matcher = ItemMatcher(vendor_data, min_score)
+    report = []
+    for category, items in bid_categories.items():
+        for item in items:
+            row = {
+                "category": category,
+                "item_name": item['item_name'],
+                "bid_price": parse_price(item.get('unit_price')),
+                "vendor_category": None,
+                "vendor_item": None,
+                "vendor_price": None,
+                "match_score": None,
+                "margin": None,
+                "margin_pct": None,
+                "status": STATUS_NO_MATCH,
+            }
+            position, score = matcher.match(item['item_name'])
+            if position is not None:
+                vendor_category, vendor_item, vendor_price = matcher.items[position]
+                row.update(vendor_category=vendor_category, vendor_item=vendor_item,
+                           vendor_price=vendor_price if isinstance(vendor_price, float) else None,
+                           match_score=round(score, 2), status=STATUS_NO_PRICE)
+            if row["bid_price"] is not None and row["vendor_price"] is not None:
+                row["margin"] = round(row["bid_price"] - row["vendor_price"], 2)
+                if row["bid_price"]:
+                    row["margin_pct"] = round(row["margin"] / row["bid_price"] * 100, 1)
+                row["status"] = STATUS_BELOW_COST if row["margin"] < 0 else STATUS_OK
+            report.append(row)
+    return report
+
+
+def load_margin_report(refresh=False, min_score=None):
+    """Builds the report from the cached bid catalog and vendor sheets (fetched when ``refresh``).
+
+    Raises RequestException if a sheet has no snapshot and cannot be downloaded.
+    """
+    load = sheet_data.fetch if refresh else sheet_data.get
+    bid_categories = parse_bid_catalog(load("bid_catalog"))
+    vendor_data = parse_vendor_prices(load("vendor_prices"))
+    return build_margin_report(bid_categories, vendor_data, min_score)
+
+
+def sort_report(report, column, descending=False):
+    """Returns the rows sorted by ``column``; empty values always sort last."""
+    filled = [row for row in report if row[column] is not None]
+    empty = [row for row in report if row[column] is None]
+    key = (lambda row: row[column].lower()) if filled and isinstance(filled[0][column], str) else \
+        (lambda row: row[column])
+    return sorted(filled, key=key, reverse=descending) + empty
+
+
+def summarize_report(report):
+    """Counts of report rows by status."""
+    counts = Counter(row["status"] for row in report)
+    return {status: counts.get(status, 0) for status in (STATUS_BELOW_COST, STATUS_OK, STATUS_NO_PRICE, STATUS_NO_MATCH)}
+
+
+def export_report_csv(report, file_path):
+    with open(file_path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow([title for _key, title in REPORT_COLUMNS])
+        for row in report:
+            writer.writerow(["" if row[key] is None else row[key] for key, _title in REPORT_COLUMNS])
+
+
+if __name__ == "__main__":
+    # Headless run: python margin_report.py [report.csv] [sort column]
+    started = time.perf_counter()
+    margin_report = load_margin_report()
+    built = time.perf_counter()
+    sort_column = sys.argv[2] if len(sys.argv) > 2 else "margin"
+    margin_report = sort_report(margin_report, sort_column)
+    file_path = sys.argv[1] if len(sys.argv) > 1 else "margin_report.csv"
+    export_report_csv(margin_report, file_path)
+    counts = summarize_report(margin_report)
+    print(f"{len(margin_report)} bid items in {built - started:.3f}s: " +
+          ", ".join(f"{count} {status.lower()}" for status, count in counts.items()))
+    print(f"Report written to {file_path}")
@@ -0,0 +1,175 @@
+# margin_report_module.py
+import tkinter as tk
+from tkinter import messagebox, ttk, filedialog
+import requests
+from margin_report import (REPORT_COLUMNS, STATUS_BELOW_COST, STATUS_NO_MATCH, load_margin_report,
+                           sort_report, summarize_report, export_report_csv)
+
+
+class MarginReportModule:
+    """Bid unit prices against vendor prices, one row per bid catalog item.
+
+    Click a column heading to sort by it (again to reverse). Items bid
+    below vendor cost are highlighted.
+    """
+
+    COLUMN_WIDTHS = {"category": 120, "item_name": 220, "vendor_category": 120, "vendor_item": 220,
+                     "status": 90}
+    MONEY_COLUMNS = ("bid_price", "vendor_price", "margin")
+
+    def __init__(self, root):
+        self.root = root
+        self.root.title("Margin Report")
+        self.root.geometry("1100x650")
+        self.root.configure(bg='#f8f9fa')
+
+        self.colors = {
+            'primary_blue': '#1e3a5f',
+            'light_blue': '#3498db',
+            'background': '#f8f9fa',
+            'gray_medium': '#6c757d',
+            'gray_dark': '#495057',
+            'below_cost_bg': '#f8d7da',
+            'no_match_fg': '#adb5bd'
+        }
+
+        # Module Title
+        self.module_title_frame = tk.Frame(self.root, bg=self.colors['primary_blue'], height=60)
+        self.module_title_frame.pack(fill='x', pady=(0, 10))
+        self.module_title_frame.pack_propagate(False)
+
+        tk.Label(self.module_title_frame, text="Margin Report",
+                 font=("Arial", 18, "bold"), fg='white',
+                 bg=self.colors['primary_blue']).pack(side="left", padx=20)
+
+        for text, command in (("Export CSV", self.export_report), ("Refresh Sheets", self.refresh_report)):
+            tk.Button(self.module_title_frame, text=text,
+                      font=("Arial", 10, "bold"), bg=self.colors['light_blue'],
+                      fg="white", relief="flat", cursor="hand2",
+                      activebackground=self.colors['primary_blue'],
+                      command=command).pack(side="right", padx=(0, 20))
+
+        # Filter Frame
+        self.filter_frame = tk.Frame(self.root, bg=self.colors['background'])
+        self.filter_frame.pack(fill="x", padx=20, pady=(5, 10))
+
+        self.below_cost_only_var = tk.IntVar()
+        tk.Checkbutton(self.filter_frame, text="Below cost only", font=("Arial", 10),
+                       bg=self.colors['background'], variable=self.below_cost_only_var,
+                       command=self.display_report).pack(side="left", padx=(0, 10))
+        self.show_unmatched_var = tk.IntVar(value=1)
+        tk.Checkbutton(self.filter_frame, text="Show unmatched items", font=("Arial", 10),
+                       bg=self.colors['background'], variable=self.show_unmatched_var,
+                       command=self.display_report).pack(side="left", padx=(0, 10))
+
+        self.summary_label = tk.Label(self.filter_frame, text="", font=("Arial", 9),
+                                      bg=self.colors['background'], fg=self.colors['gray_medium'])
+        self.summary_label.pack(side="right")
+
+        # Report table
+        self.list_frame = tk.Frame(self.root, bg=self.colors['background'])
+        self.list_frame.pack(fill="both", expand=True, padx=20, pady=10)
+
+        style = ttk.Style(self.root)
+        style.configure("MarginReport.Treeview", rowheight=24, font=("Arial", 10))
+        style.configure("MarginReport.Treeview.Heading", font=("Arial", 10, "bold"))
+        self.report_tree = ttk.Treeview(self.list_frame, columns=[key for key, _title in REPORT_COLUMNS],
+                                        show="headings", style="MarginReport.Treeview")
+        for key, title in REPORT_COLUMNS:
+            numeric = key not in self.COLUMN_WIDTHS
+            self.report_tree.heading(key, text=title, anchor="e" if numeric else "w",
+                                     command=lambda k=key: self.sort_by(k))
+            self.report_tree.column(key, width=self.COLUMN_WIDTHS.get(key, 90), anchor="e" if numeric else "w",
+                                    stretch=not numeric)
+        self.report_tree.tag_configure("below_cost", background=self.colors['below_cost_bg'])
+        self.report_tree.tag_configure("no_match", foreground=self.colors['no_match_fg'])
+
+        self.y_scrollbar = ttk.Scrollbar(self.list_frame, orient="vertical", command=self.report_tree.yview)
+        self.x_scrollbar = ttk.Scrollbar(self.list_frame, orient="horizontal", command=self.report_tree.xview)
+        self.report_tree.configure(yscrollcommand=self.y_scrollbar.set, xscrollcommand=self.x_scrollbar.set)
+        self.y_scrollbar.pack(side="right", fill="y")
+        self.x_scrollbar.pack(side="bottom", fill="x")
+        self.report_tree.pack(side="left", fill="both", expand=True)
+
+        self.report = []
+        self.sort_column = "margin"
+        self.sort_descending = False
+        self.load_report()
+
+    def load_report(self, refresh=False):
+        try:
+            self.report = load_margin_report(refresh=refresh)
+            self.display_report()
+            return True
+
+        except requests.exceptions.RequestException as e:
+            messagebox.showwarning("Network Error", f"Could not load the bid catalog or vendor prices. Please check internet connection.\nError: {e}")
+        except Exception as e:
+            messagebox.showwarning("Error", f"Failed to build the margin report.\nError: {e}")
+        return False
+
+    def refresh_report(self):
+        if self.load_report(refresh=True):
+            messagebox.showinfo("Refresh Complete", "Margin report has been rebuilt from the latest sheets.")
+
+    def sort_by(self, column):
+        if column == self.sort_column:
+            self.sort_descending = not self.sort_descending
+        else:
+            self.sort_column, self.sort_descending = column, False
+        self.display_report()
+
+    def visible_rows(self):
+        """The report rows passing the filters, in the current sort order."""
+        rows = self.report
+        if self.below_cost_only_var.get():
+            rows = [row for row in rows if row["status"] == STATUS_BELOW_COST]
+        if not self.show_unmatched_var.get():
+            rows = [row for row in rows if row["status"] != STATUS_NO_MATCH]
+        return sort_report(rows, self.sort_column, self.sort_descending)
+
+    @classmethod
+    def format_value(cls, key, value):
+        if value is None:
+            return ""
+        if key in cls.MONEY_COLUMNS:
+            return f"-${-value:,.2f}" if value < 0 else f"${value:,.2f}"
+        if key == "margin_pct":
+            return f"{value:.1f}%"
+        if key == "match_score":
+            return f"{value:.0%}"
+        return value
+
+    def display_report(self):
+        self.report_tree.delete(*self.report_tree.get_children())
+        for key, title in REPORT_COLUMNS:
+            arrow = (" ▼" if self.sort_descending else " ▲") if key == self.sort_column else ""
+            self.report_tree.heading(key, text=title + arrow)
+
+        rows = self.visible_rows()
+        for row in rows:
+            tags = ("below_cost",) if row["status"] == STATUS_BELOW_COST else \
+                ("no_match",) if row["status"] == STATUS_NO_MATCH else ()
+            self.report_tree.insert("", "end", values=[self.format_value(key, row[key]) for key, _title in REPORT_COLUMNS],
+                                    tags=tags)
+
+        counts = summarize_report(self.report)
+        self.summary_label.config(text=f"Showing {len(rows)} of {len(self.report)} bid items  |  " +
+                                  "  ".join(f"{status}: {count}" for status, count in counts.items()))
+
+    def export_report(self):
+        if not self.report:
+            messagebox.showinfo("Export", "There is nothing to export.")
+            return
+        file_path = filedialog.asksaveasfilename(
+            defaultextension=".csv",
+            filetypes=[("CSV File", "*.csv"), ("All Files", "*.*")],
+            initialfile="Margin_Report.csv",
+            title="Export Margin Report"
+        )
+        if file_path:
+            try:
+                export_report_csv(self.visible_rows(), file_path)
+                messagebox.showinfo("Success", f"Margin report exported successfully to:\n{file_path}")
+            except Exception as e:
+                messagebox.showerror("Error", f"Failed to export file: {e}")
@@ -2,9 +2,15 @@
 import tkinter as tk
 from tkinter import messagebox
 import requests
+from http_client import async_fetcher
+from image_cache import image_cache
 import csv
 import io
+import json
+import hashlib
 from datetime import datetime
+from sheet_data import sheet_data
+from utils import TkDispatcher
 
 try:
     from PIL import Image, ImageTk
@@ -13,7 +19,148 @@ except ImportError:
     Image = None
     ImageTk = None
 
+
+def parse_notices(csv_text):
+    """Parses the notice sheet into a list of ``{'title', 'time', 'text', 'photo_url'}``."""
+    notices = []
+    for row in csv.DictReader(io.StringIO(csv_text)):
+        if 'Title' in row and 'Time' in row and 'Notice' in row:
+            notices.append({
+                'title': row['Title'],
+                'time': row['Time'],
+                'text': row['Notice'],
+                'photo_url': row.get('PhotoURL', '').strip(), # Optional photo URL
+            })
+    return notices
+
+
+NOTICE_TIME_FORMATS = (
+    "%m/%d/%Y %H:%M:%S", "%m/%d/%Y %H:%M", "%m/%d/%Y",
+    "%Y-%m-%d %H:%M:%S", "%Y-%m-%d %H:%M", "%Y-%m-%d",
+    "%d %B %Y %I:%M %p", "%d %B %Y", "%B %d, %Y %I:%M %p", "%B %d, %Y",
+)
+
+
+def parse_notice_time(value):
+    """Parses a notice's Time cell, or returns None if it is in no known format."""
+    value = value.strip()
+    for fmt in NOTICE_TIME_FORMATS:
+        try:
+            return datetime.strptime(value, fmt)
+        except ValueError:
+            continue
+    return None
+
+
+def sort_notices_newest_first(notices):
+    """Orders notices by their Time, newest first.
+
+    Notices whose Time does not parse follow, in reverse sheet order, since
+    new rows are added at the bottom of the sheet.
+    """
+    def sort_key(indexed):
+        index, notice = indexed
+        posted = parse_notice_time(notice['time'])
+        return (posted is not None, posted or datetime.min, index)
+
+    return [notice for _index, notice in sorted(enumerate(notices), key=sort_key, reverse=True)]
+
+
+def notice_hash(notice):
+    """Hash of everything a notice card shows, to tell when it needs updating."""
+    content = json.dumps([notice['title'], notice['time'], notice['text'], notice['photo_url']])
+    return hashlib.sha1(content.encode('utf-8')).hexdigest()
+
+
+def keyed_notices(notices):
+    """Maps each notice by its ``(Title, Time)`` key, in sheet order.
+
+    A repeated Title/Time pair gets its occurrence number appended to stay unique.
+    """
+    keyed = {}
+    for notice in notices:
+        key = (notice['title'], notice['time'])
+        occurrence = 1
+        while key in keyed:
+            occurrence += 1
+            key = (notice['title'], notice['time'], occurrence)
+        keyed[key] = notice
+    return keyed
+
+
+def diff_notices(old_notices, new_notices):
+    """Returns ``(added, changed, removed)`` notice keys between two notice lists."""
+    old, new = keyed_notices(old_notices), keyed_notices(new_notices)
+    added = [key for key in new if key not in old]
+    changed = [key for key in new if key in old and notice_hash(new[key]) != notice_hash(old[key])]
+    removed = [key for key in old if key not in new]
+    return added, changed, removed
+
+
+class NoticePoller:
+    """Checks the notice sheet in the background every few minutes.
+
+    Each poll is a conditional request through sheet_data, so it is a cheap
+    304 while nothing changed. When the sheet did change, the new notices
+    are diffed against the previous snapshot and ``on_changes(added,
+    changed, removed)`` runs on the Tk thread; nothing is rendered here.
+    ``interval_minutes`` of 0 turns polling off.
+    """
+
+    SETTING_KEY = "notice_poll_minutes"
+    DEFAULT_MINUTES = 15
+
+    def __init__(self, root, on_changes, interval_minutes=None):
+        self.root = root
+        self.on_changes = on_changes
+        self.dispatcher = TkDispatcher(root)
+        self.poll_job = None
+        self.interval_minutes = 0
+        self.set_interval(self.DEFAULT_MINUTES if interval_minutes is None else interval_minutes)
+
+    def set_interval(self, minutes):
+        """Reschedules polling every ``minutes`` minutes (0 stops it)."""
+        self.interval_minutes = max(0, int(minutes))
+        if self.poll_job is not None:
+            self.root.after_cancel(self.poll_job)
+            self.poll_job = None
+        self._schedule()
+
+    def _schedule(self):
+        if self.interval_minutes:
+            self.poll_job = self.root.after(self.interval_minutes * 60 * 1000, self.poll)
+
+    def poll(self):
+        self.poll_job = None
+        snapshot = sheet_data.snapshot("notices")
+        previous_text = snapshot[0] if snapshot else None
+        future = sheet_data.fetch_in_background("notices")
+        future.add_done_callback(lambda f: self.dispatcher.post(self.on_polled, previous_text, f))
+
+    def on_polled(self, previous_text, future):
+        if self.poll_job is None:
+            self._schedule()
+        try:
+            text = future.result()
+        except Exception as e:
+            print(f"Notice poll failed: {e}")
+            return
+        if previous_text is None or text == previous_text:
+            return
+        try:
+            added, changed, removed = diff_notices(parse_notices(previous_text), parse_notices(text))
+        except Exception as e:
+            print(f"Could not parse polled notices: {e}")
+            return
+        if added or changed or removed:
+            self.on_changes(added, changed, removed)
+
+
 class NoticeBoardModule:
+    # Notices rendered up front; older pages load as the user scrolls down
+    PAGE_SIZE = 20
+    PHOTO_SIZE = (300, 200)
+
     def __init__(self, root):
         self.root = root
         self.root.title("Notice Board")
@@ -60,52 +207,132 @@ class NoticeBoardModule:
             lambda e: self.canvas.configure(scrollregion=self.canvas.bbox("all"))
         )
         self.canvas.create_window((0, 0), window=self.scrollable_frame, anchor="nw")
-        self.canvas.configure(yscrollcommand=self.scrollbar.set)
+        self.canvas.configure(yscrollcommand=self.on_canvas_scroll)
+        self.canvas.bind("<Configure>", lambda e: self.schedule_visible_photos())
 
         self.scrollbar.pack(side="right", fill="y")
         self.canvas.pack(side="left", fill="both", expand=True)
 
-        self.notice_data_url = "https://docs.google.com/spreadsheets/d/1lnX9OO9Qq5v6KZmeYTiy5ChwJ8SSDYHyFkIZuxmNABw/edit?usp=sharing" # <<< REPLACE WITH YOUR GOOGLE SHEET URL
+        self.dispatcher = TkDispatcher(self.root)
+        self.notices = []
+        # Cards on screen by notice key, in display order, so a refresh only touches what changed
+        self.notice_cards = {}
+        self.notice_message = None
+        self.visible_count = self.PAGE_SIZE
+        # Photo placeholders whose image is fetched once they scroll into view
+        self.pending_photos = {}
+        self.visible_photos_job = None
         self.load_notices()
 
     def refresh_notices(self):
-        self.load_notices()
-        messagebox.showinfo("Refresh Complete", "Notice board has been refreshed successfully.")
+        # Downloads on the async fetcher so the board stays responsive meanwhile
+        self.refresh_button.config(state=tk.DISABLED, text="Refreshing...")
+        future = sheet_data.fetch_in_background("notices")
+        future.add_done_callback(lambda f: self.dispatcher.post(self.on_refresh_done, f))
 
-    def load_notices(self):
-        # Clear existing notices
-        for widget in self.scrollable_frame.winfo_children():
-            widget.destroy()
+    def on_refresh_done(self, future):
+        if not self.refresh_button.winfo_exists():
+            return
+        self.refresh_button.config(state=tk.NORMAL, text="Refresh Notices")
+        try:
+            csv_text = future.result()
+        except requests.exceptions.RequestException as e:
+            messagebox.showwarning("Network Error", f"Could not load notices from online. Please check internet connection.\nError: {e}")
+            return
+        if self.show_notices(csv_text, revalidate_photos=True):
+            messagebox.showinfo("Refresh Complete", "Notice board has been refreshed successfully.")
 
+    def on_notices_synced(self, csv_text):
+        """Shows notices that changed on the sheet since the snapshot was taken."""
         try:
-            response = requests.get(self.notice_data_url, timeout=10)
-            response.raise_for_status()
-            csv_data = io.StringIO(response.text)
-            reader = csv.DictReader(csv_data)
-
-            notices_found = False
-            for row in reader:
-                if 'Title' in row and 'Time' in row and 'Notice' in row:
-                    title = row['Title']
-                    notice_time = row['Time']
-                    notice_text = row['Notice']
-                    photo_url = row.get('PhotoURL', '').strip() # Optional photo URL
-
-                    self.display_notice(title, notice_time, notice_text, photo_url)
-                    notices_found = True
-            
-            if not notices_found:
-                tk.Label(self.scrollable_frame, text="No notices available.", 
-                         font=("Arial", 12), bg=self.colors['white'], fg=self.colors['gray_medium']).pack(pady=20)
+            self.notices = sort_notices_newest_first(parse_notices(csv_text))
+        except Exception as e:
+            print(f"Could not parse synced notices: {e}")
+            return
+        self.display_notices(self.notices[:self.visible_count])
 
+    def load_notices(self):
+        try:
+            csv_text = sheet_data.get("notices")
+            # Served from the last good copy; sheet edits arrive through on_notices_synced
+            sheet_data.sync_in_background("notices", self.dispatcher, self.on_notices_synced, current=csv_text)
         except requests.exceptions.RequestException as e:
             messagebox.showwarning("Network Error", f"Could not load notices from online. Please check internet connection.\nError: {e}")
             self.display_error_notice("Network Error", "Failed to load notices due to network issues.")
+            return
+        self.show_notices(csv_text)
+
+    def show_notices(self, csv_text, revalidate_photos=False):
+        try:
+            self.notices = sort_notices_newest_first(parse_notices(csv_text))
         except Exception as e:
             messagebox.showwarning("Error", f"Failed to parse notice data.\nError: {e}")
+            self.notices = []
+            self.clear_notices()
             self.display_error_notice("Data Error", "Failed to load notices due to data parsing issues.")
+            return False
+        self.display_notices(self.notices[:self.visible_count], revalidate_photos)
+        return True
+
+    def on_canvas_scroll(self, first, last):
+        self.scrollbar.set(first, last)
+        # Near the bottom (or the page does not fill the window yet): render the next page
+        if float(last) > 0.9 and self.visible_count < len(self.notices):
+            self.visible_count += self.PAGE_SIZE
+            self.display_notices(self.notices[:self.visible_count])
+        self.schedule_visible_photos()
+
+    def clear_notices(self):
+        for widget in self.scrollable_frame.winfo_children():
+            widget.destroy()
+        self.notice_cards = {}
+        self.notice_message = None
+        self.pending_photos = {}
+
+    def display_notices(self, notices, revalidate_photos=False):
+        """Brings the cards in line with ``notices``: adds new ones, updates changed ones
+        and removes deleted ones. Unchanged cards, photos included, are left alone."""
+        if self.notice_message is not None:
+            self.notice_message.destroy()
+            self.notice_message = None
+
+        new_notices = keyed_notices(notices)
+        for key in [key for key in self.notice_cards if key not in new_notices]:
+            self.notice_cards.pop(key)['frame'].destroy()
+
+        for key, notice in new_notices.items():
+            card = self.notice_cards.get(key)
+            if card is None:
+                self.notice_cards[key] = self.display_notice(notice['title'], notice['time'], notice['text'],
+                                                             notice['photo_url'], revalidate_photos)
+            elif card['hash'] != notice_hash(notice):
+                self.update_notice_card(card, notice, revalidate_photos)
 
-    def display_notice(self, title, notice_time, notice_text, photo_url=None):
+        # New cards were packed last; repack only if that put them out of sheet order
+        if list(self.notice_cards) != list(new_notices):
+            self.notice_cards = {key: self.notice_cards[key] for key in new_notices}
+            for card in self.notice_cards.values():
+                card['frame'].pack_forget()
+                card['frame'].pack(fill="x", padx=10, pady=5)
+
+        if not notices:
+            self.notice_message = tk.Label(self.scrollable_frame, text="No notices available.", 
+                                           font=("Arial", 12), bg=self.colors['white'], fg=self.colors['gray_medium'])
+            self.notice_message.pack(pady=20)
+        self.schedule_visible_photos()
+
+    def update_notice_card(self, card, notice, revalidate_photo=False):
+        card['text_label'].config(text=notice['text'])
+        if notice['photo_url'] != card['photo_url']:
+            if card['photo_label'] is not None:
+                card['photo_label'].destroy()
+                card['photo_label'] = None
+            if notice['photo_url'] and Image and ImageTk:
+                card['photo_label'] = self.load_and_display_photo(card['frame'], notice['photo_url'], revalidate_photo)
+            card['photo_url'] = notice['photo_url']
+        card['hash'] = notice_hash(notice)
+
+    def display_notice(self, title, notice_time, notice_text, photo_url=None, revalidate_photo=False):
         notice_frame = tk.Frame(self.scrollable_frame, bg=self.colors['notice_bg'], 
                                 bd=2, relief="groove", padx=15, pady=10)
         notice_frame.pack(fill="x", padx=10, pady=5)
@@ -116,37 +343,76 @@ class NoticeBoardModule:
         tk.Label(notice_frame, text=f"Time: {notice_time}", font=("Arial", 10, "italic"), 
                  bg=self.colors['notice_bg'], fg=self.colors['gray_medium'], anchor="w").pack(fill="x", pady=(2, 5))
         
-        tk.Label(notice_frame, text=notice_text, font=("Arial", 11), wraplength=self.root.winfo_width() - 80,
-                 bg=self.colors['notice_bg'], fg=self.colors['gray_dark'], justify="left", anchor="w").pack(fill="x")
+        text_label = tk.Label(notice_frame, text=notice_text, font=("Arial", 11), wraplength=self.root.winfo_width() - 80,
+                              bg=self.colors['notice_bg'], fg=self.colors['gray_dark'], justify="left", anchor="w")
+        text_label.pack(fill="x")
 
+        photo_label = None
         if photo_url and Image and ImageTk:
-            self.load_and_display_photo(notice_frame, photo_url)
+            photo_label = self.load_and_display_photo(notice_frame, photo_url, revalidate_photo)
+
+        notice = {'title': title, 'time': notice_time, 'text': notice_text, 'photo_url': photo_url or ""}
+        return {'frame': notice_frame, 'text_label': text_label, 'photo_url': notice['photo_url'],
+                'photo_label': photo_label, 'hash': notice_hash(notice)}
+
+    def load_and_display_photo(self, parent_frame, photo_url, revalidate=False):
+        # A fixed-size placeholder holds the photo's spot; the photo is fetched
+        # (from the disk cache when possible) once the card scrolls into view
+        holder = tk.Frame(parent_frame, width=self.PHOTO_SIZE[0], height=self.PHOTO_SIZE[1],
+                          bg=self.colors['gray_light'])
+        holder.pack_propagate(False)
+        holder.pack(pady=10)
+        placeholder = tk.Label(holder, text="Image", font=("Arial", 9, "italic"),
+                               fg=self.colors['gray_medium'], bg=self.colors['gray_light'])
+        placeholder.pack(fill="both", expand=True)
+        self.pending_photos[holder] = (placeholder, photo_url, revalidate)
+        self.schedule_visible_photos()
+        return holder
+
+    def schedule_visible_photos(self):
+        if self.visible_photos_job is None and self.pending_photos:
+            self.visible_photos_job = self.root.after_idle(self.load_visible_photos)
+
+    def load_visible_photos(self):
+        """Starts fetching the photos of placeholders in (or just below) the viewport."""
+        self.visible_photos_job = None
+        view_top = self.canvas.canvasy(0)
+        view_bottom = view_top + self.canvas.winfo_height()
+        margin = self.PHOTO_SIZE[1]
+        frame_top = self.scrollable_frame.winfo_rooty()
+        for holder, (placeholder, photo_url, revalidate) in list(self.pending_photos.items()):
+            if not holder.winfo_exists():
+                del self.pending_photos[holder]
+                continue
+            top = holder.winfo_rooty() - frame_top
+            if top + holder.winfo_height() < view_top - margin or top > view_bottom + margin:
+                continue
+            del self.pending_photos[holder]
+            placeholder.config(text="Loading image...")
+            async_fetcher.submit_to_tk(self.dispatcher,
+                                       lambda img, error, label=placeholder: self.show_photo(label, img, error),
+                                       image_cache.get_thumbnail, photo_url, self.PHOTO_SIZE, revalidate)
 
-    def load_and_display_photo(self, parent_frame, photo_url):
+    def show_photo(self, placeholder, img, error):
+        if not placeholder.winfo_exists():
+            return  # The board was reloaded while the photo downloaded
+        if error is not None:
+            placeholder.config(text=f"Could not load image: {error}", fg="red")
+            return
         try:
-            response = requests.get(photo_url, stream=True, timeout=5)
-            response.raise_for_status()
-            
-            # Read image data into a BytesIO object
-            image_data = io.BytesIO(response.content)
-            img = Image.open(image_data)
-            
-            # Resize image to fit, maintaining aspect ratio
-            max_width = 300
-            max_height = 200
-            img.thumbnail((max_width, max_height), Image.Resampling.LANCZOS)
-            
             photo = ImageTk.PhotoImage(img)
-            
-            img_label = tk.Label(parent_frame, image=photo, bg=self.colors['notice_bg'])
-            img_label.image = photo # Keep a reference!
-            img_label.pack(pady=10)
         except Exception as e:
-            tk.Label(parent_frame, text=f"Could not load image: {e}", 
-                     font=("Arial", 9, "italic"), fg="red", bg=self.colors['notice_bg']).pack(pady=5)
+            placeholder.config(text=f"Could not load image: {e}", fg="red")
+            return
+        placeholder.config(image=photo, text="", bg=self.colors['notice_bg'])
+        placeholder.master.config(bg=self.colors['notice_bg'])
+        placeholder.image = photo # Keep a reference!
 
     def display_error_notice(self, title, message):
+        if self.notice_message is not None:
+            self.notice_message.destroy()
         error_frame = tk.Frame(self.scrollable_frame, bg="#f8d7da", bd=2, relief="groove", padx=15, pady=10) # Light red background
         error_frame.pack(fill="x", padx=10, pady=5)
+        self.notice_message = error_frame
         tk.Label(error_frame, text=title, font=("Arial", 14, "bold"), fg="#721c24", bg="#f8d7da").pack(fill="x")
         tk.Label(error_frame, text=message, font=("Arial", 11), fg="#721c24", bg="#f8d7da").pack(fill="x", pady=(5,0))
\ No newline at end of file
@@ -0,0 +1,200 @@
+# sheet_data.py
+import os
+import json
+import time
+import threading
+from http_client import fetch_client, async_fetcher
+
+# Every Google Sheet the app reads, by name
+SHEET_URLS = {
+    "credentials": "https://docs.google.com/spreadsheets/d/17ckYvmA47Sa5PJ0-KyqvlyoODMK2bLQWrZx1KofOvrc/gviz/tq?tqx=out:csv&sheet=Sheet1",
+    "bid_catalog": "https://docs.google.com/spreadsheets/d/1sBPUtZqtoPREX2STfjBIs_kNF4HE4kCvsyloL9oC-tY/gviz/tq?tqx=out:csv&sheet=Sheet1",
+    "gc_roof_rates": "https://docs.google.com/spreadsheets/d/e/2PACX-1vRJEpqzTtW-2qqxzkI_QMkwwaYIEEHid_3j1blvxwovK7aVXWB0411eBZVjKZCEKFYaQ8VcLdPe_IU6/pub?output=csv",
+    "vendor_prices": "https://docs.google.com/spreadsheets/d/e/2PACX-1vQv3sHuJQ_wjPViqn8-b3pNz8QBH_l-wAllPa-RhCZ8Vlaf9bRltG-WguziYKYn1SMj4D3snIZfn-9w/pub?output=csv",
+    "notices": "https://docs.google.com/spreadsheets/d/1lnX9OO9Qq5v6KZmeYTiy5ChwJ8SSDYHyFkIZuxmNABw/edit?usp=sharing", # <<< REPLACE WITH YOUR GOOGLE SHEET URL
+}
+
+# How long a copy counts as fresh, in seconds, before opening a module re-checks the sheet
+SHEET_TTLS = {
+    "credentials": 300,
+    "notices": 300,
+}
+DEFAULT_TTL = 900
+
+# Sheets kept in memory only: the credentials sheet holds plaintext passwords,
+# and a copy left on disk would also let a revoked user log in offline
+MEMORY_ONLY_SHEETS = {"credentials"}
+
+
+class SheetDataStore:
+    """Offline-first copies of the Google Sheets the app reads.
+
+    The last good download of every sheet is kept in memory and, except for
+    MEMORY_ONLY_SHEETS, on disk (``sheet_snapshots/<name>.json``, with the
+    time it was fetched). Modules
+    ``get`` a sheet instantly from that snapshot and call
+    ``sync_in_background`` to pick up changes; only a sheet that was never
+    downloaded makes ``get`` wait for the network. Parsing stays with each
+    module, in its module-level ``parse_*`` function.
+
+    A copy younger than its TTL is not re-checked, and ``prefetch`` (run when
+    the dashboard opens) downloads every stale sheet concurrently, so modules
+    usually open on a fresh copy without touching the network. Concurrent
+    requests for the same sheet share one download, and all of them run on
+    http_client.async_fetcher's bounded pool.
+    """
+
+    SNAPSHOT_DIRNAME = "sheet_snapshots"
+
+    def __init__(self, app_data_dir=None, urls=None, ttls=None):
+        self.app_data_dir = app_data_dir or os.path.join(os.path.expanduser("~"), ".techvengers_bidwriter")
+        self.snapshot_dir = os.path.join(self.app_data_dir, self.SNAPSHOT_DIRNAME)
+        self.urls = dict(urls or SHEET_URLS)
+        self.ttls = dict(SHEET_TTLS if ttls is None else ttls)
+        self._memory = {}
+        self._validators = {}
+        self._inflight = {}
+        self._lock = threading.Lock()
+
+    def url(self, name):
+        return self.urls[name]
+
+    def _snapshot_path(self, name):
+        return os.path.join(self.snapshot_dir, f"{name}.json")
+
+    def snapshot(self, name):
+        """Returns ``(text, fetched)`` of the last good copy, or None if there is none."""
+        with self._lock:
+            if name in self._memory:
+                return self._memory[name]
+        if name in MEMORY_ONLY_SHEETS:
+            return None
+        try:
+            with open(self._snapshot_path(name), 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            entry = (data["text"], data["fetched"])
+        except (OSError, ValueError, KeyError):
+            return None
+        with self._lock:
+            self._validators.setdefault(name, {"etag": data.get("etag"), "last_modified": data.get("last_modified")})
+            self._memory.setdefault(name, entry)
+            return self._memory[name]
+
+    def fetched_at(self, name):
+        snapshot = self.snapshot(name)
+        return snapshot[1] if snapshot else None
+
+    def is_fresh(self, name):
+        fetched = self.fetched_at(name)
+        return fetched is not None and time.time() - fetched < self.ttls.get(name, DEFAULT_TTL)
+
+    def _store(self, name, text, fetched, validators):
+        with self._lock:
+            self._memory[name] = (text, fetched)
+            self._validators[name] = validators
+        if name in MEMORY_ONLY_SHEETS:
+            return
+        try:
+            os.makedirs(self.snapshot_dir, exist_ok=True)
+            path = self._snapshot_path(name)
+            temp_path = f"{path}.tmp"
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump({"url": self.urls[name], "fetched": fetched, "text": text,
+                           "etag": validators.get("etag"), "last_modified": validators.get("last_modified")}, f)
+            os.replace(temp_path, path)
+        except OSError as e:
+            print(f"Could not write snapshot of {name}: {e}")
+
+    def fetch(self, name):
+        """Downloads a sheet now and makes it the new snapshot. Raises RequestException.
+
+        The request is conditional on the snapshot's ETag / Last-Modified, so
+        an unchanged sheet costs a 304 and only refreshes the fetch time.
+        """
+        snapshot = self.snapshot(name)
+        with self._lock:
+            validators = dict(self._validators.get(name) or {})
+        headers = {}
+        if snapshot is not None:
+            if validators.get("etag"):
+                headers["If-None-Match"] = validators["etag"]
+            if validators.get("last_modified"):
+                headers["If-Modified-Since"] = validators["last_modified"]
+        response = fetch_client.get(self.urls[name], headers=headers)
+        if response.status_code == 304 and snapshot is not None:
+            text = snapshot[0]
+        else:
+            text = response.text
+            validators = {}
+        validators = {
+            "etag": response.headers.get("ETag", validators.get("etag")),
+            "last_modified": response.headers.get("Last-Modified", validators.get("last_modified")),
+        }
+        self._store(name, text, time.time(), validators)
+        return text
+
+    def fetch_in_background(self, name):
+        """Starts downloading a sheet on the async fetcher and returns a Future of its text.
+
+        If that sheet is already being downloaded, the running download's
+        Future is returned instead of starting another.
+        """
+        with self._lock:
+            future = self._inflight.get(name)
+            if future is not None:
+                return future
+            future = self._inflight[name] = async_fetcher.submit(self.fetch, name)
+
+        def forget(done_future):
+            with self._lock:
+                if self._inflight.get(name) is done_future:
+                    del self._inflight[name]
+
+        future.add_done_callback(forget)
+        return future
+
+    def prefetch(self, names=None):
+        """Downloads every stale sheet (or just ``names``) concurrently, without waiting."""
+        for name in names or self.urls:
+            if not self.is_fresh(name):
+                self.fetch_in_background(name)
+
+    def get(self, name):
+        """Returns a sheet's text: the snapshot if there is one, else a fresh download."""
+        snapshot = self.snapshot(name)
+        if snapshot is not None:
+            return snapshot[0]
+        return self.fetch_in_background(name).result()
+
+    def sync_in_background(self, name, dispatcher, on_change=None, on_error=None, current=None, force=False):
+        """Re-downloads a sheet on a worker thread unless its copy is still fresh.
+
+        ``on_change(text)`` is posted to the Tk thread through ``dispatcher``
+        (a utils.TkDispatcher) only if the sheet differs from ``current``, the
+        text the caller is showing (the snapshot by default);
+        ``on_error(exception)`` if the download failed. ``force`` ignores the TTL.
+        """
+        if current is None:
+            snapshot = self.snapshot(name)
+            current = snapshot[0] if snapshot else None
+        if not force and self.is_fresh(name):
+            # A prefetch may have landed after the caller read its copy
+            if on_change and self.snapshot(name)[0] != current:
+                dispatcher.post(on_change, self.snapshot(name)[0])
+            return
+
+        def done(future):
+            error = future.exception()
+            if error is not None:
+                if on_error:
+                    dispatcher.post(on_error, error)
+                return
+            text = future.result()
+            if on_change and text != current:
+                dispatcher.post(on_change, text)
+
+        self.fetch_in_background(name).add_done_callback(done)
+
+
+# Global sheet data instance
+sheet_data = SheetDataStore()
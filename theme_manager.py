@@ -87,6 +87,32 @@ class ThemeManager:
         except Exception as e:
             print(f"Error saving theme preference: {e}")
 
+    def get_setting(self, key: str, default: Any = None) -> Any:
+        """Read one value from the settings file."""
+        try:
+            settings_file = os.path.join(self.app_data_dir, "settings.json")
+            if os.path.exists(settings_file):
+                with open(settings_file, 'r') as f:
+                    return json.load(f).get(key, default)
+        except Exception:
+            pass
+        return default
+
+    def set_setting(self, key: str, value: Any):
+        """Write one value to the settings file, keeping the others."""
+        try:
+            settings_file = os.path.join(self.app_data_dir, "settings.json")
+            settings = {}
+            if os.path.exists(settings_file):
+                with open(settings_file, 'r') as f:
+                    settings = json.load(f)
+
+            settings[key] = value
+            with open(settings_file, 'w') as f:
+                json.dump(settings, f, indent=4)
+        except Exception as e:
+            print(f"Error saving setting {key}: {e}")
+
     def switch_theme(self, theme_name: str):
         """Switch to a different theme and notify all subscribers."""
         self.current_theme = theme_name
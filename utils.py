@@ -1,4 +1,5 @@
 # utils.py
+import queue
 from docx.oxml.ns import nsdecls
 from docx.oxml import parse_xml
 from docx.shared import RGBColor
@@ -6,4 +7,39 @@ from docx.shared import RGBColor
 def set_cell_background(cell, color):
     """Sets the background color of a Word document table cell."""
     shading_elm = parse_xml(r'<w:shd {} w:fill="{}"/>'.format(nsdecls('w'), color))
-    cell._tc.get_or_add_tcPr().append(shading_elm)
\ No newline at end of file
+    cell._tc.get_or_add_tcPr().append(shading_elm)
+
+
+class TkDispatcher:
+    """Runs callbacks posted from worker threads on the Tk thread.
+
+    Tk widgets may only be touched from the thread running the mainloop, so
+    background workers post their results here and the dispatcher drains them
+    with a short ``after`` poll.
+    """
+
+    def __init__(self, root, interval_ms=50):
+        self.root = root
+        self.interval_ms = interval_ms
+        self._queue = queue.Queue()
+        self._poll()
+
+    def post(self, callback, *args):
+        """Schedule ``callback(*args)`` on the Tk thread. Safe from any thread."""
+        self._queue.put((callback, args))
+
+    def _poll(self):
+        while True:
+            try:
+                callback, args = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                callback(*args)
+            except Exception as e:
+                print(f"Error in dispatched callback: {e}")
+        try:
+            self.root.after(self.interval_ms, self._poll)
+        except Exception:
+            # Window was destroyed; stop polling
+            pass
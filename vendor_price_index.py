@@ -0,0 +1,127 @@
+# vendor_price_index.py
+import re
+from bisect import bisect_left, bisect_right
+
+
+def tokenize(text):
+    """Lowercase alphanumeric tokens of an item name or search query."""
+    return re.findall(r"[a-z0-9]+", text.lower())
+
+
+class VendorPriceIndex:
+    """In-memory search index over the vendor price list.
+
+    Items are numbered in display order (category by category, sheet order
+    within each), so a category is a contiguous range of positions. Item
+    names are tokenized into a sorted token list with a posting list per
+    token, so a query word matches every token it prefixes by bisecting
+    that list. All names are also joined, lowercased, into one string, so
+    a plain substring search ("ilz" in "Kilz") is a ``str.find`` scan with a
+    bisect per hit. Numeric prices are kept in a sorted array, so a min/max
+    price range is two bisects. ``query`` combines all of these by starting
+    from the smallest candidate set and checking the others per item.
+    """
+
+    def __init__(self, vendor_data):
+        self.items = []  # (category, item_name, price) by position
+        self.category_ranges = {}
+        for category, items in vendor_data.items():
+            start = len(self.items)
+            for item_data in items:
+                self.items.append((category, item_data['item'], item_data['price']))
+            self.category_ranges[category] = (start, len(self.items))
+
+        postings = {}
+        for position, (_category, item_name, _price) in enumerate(self.items):
+            for token in set(tokenize(item_name)):
+                postings.setdefault(token, []).append(position)
+        self.tokens = sorted(postings)
+        self.postings = [postings[token] for token in self.tokens]
+
+        # Item names separated by newlines, which a search text never contains
+        self.name_offsets = []
+        offset = 0
+        for _category, item_name, _price in self.items:
+            self.name_offsets.append(offset)
+            offset += len(item_name) + 1
+        self.names_text = "\n".join(item_name.lower() for _category, item_name, _price in self.items)
+
+        priced = sorted((price, position) for position, (_c, _i, price) in enumerate(self.items)
+                        if isinstance(price, float))
+        self.prices = [price for price, _position in priced]
+        self.price_positions = [position for _price, position in priced]
+
+    def __len__(self):
+        return len(self.items)
+
+    @property
+    def categories(self):
+        return list(self.category_ranges)
+
+    def _prefix_positions(self, prefix):
+        """Positions of items with a token starting with ``prefix``."""
+        positions = set()
+        index = bisect_left(self.tokens, prefix)
+        while index < len(self.tokens) and self.tokens[index].startswith(prefix):
+            positions.update(self.postings[index])
+            index += 1
+        return positions
+
+    def _substring_positions(self, text):
+        """Positions of items whose name contains ``text`` (lowercase, no newlines)."""
+        positions = set()
+        index = self.names_text.find(text)
+        while index != -1:
+            position = bisect_right(self.name_offsets, index) - 1
+            positions.add(position)
+            if position + 1 >= len(self.name_offsets):
+                break
+            index = self.names_text.find(text, self.name_offsets[position + 1])
+        return positions
+
+    def _text_positions(self, text):
+        """Positions of items matching a search text.
+
+        An item matches if every word of ``text`` prefixes a word of its name,
+        in any order, or if its name contains ``text`` as typed.
+        """
+        positions = None
+        for word in sorted(dict.fromkeys(tokenize(text)), key=len, reverse=True):
+            word_positions = self._prefix_positions(word)
+            positions = word_positions if positions is None else positions & word_positions
+            if not positions:
+                break
+        return (positions or set()) | self._substring_positions(text.strip().lower())
+
+    def _price_range(self, min_price, max_price):
+        low = 0 if min_price is None else bisect_left(self.prices, min_price)
+        high = len(self.prices) if max_price is None else bisect_right(self.prices, max_price)
+        return low, high
+
+    def query(self, text="", category=None, min_price=None, max_price=None):
+        """Returns the positions matching all given filters, in display order.
+
+        ``text`` matches as described in ``_text_positions``. Items without a
+        numeric price are left out once a price bound is given.
+        """
+        candidates = []  # (size, positions, membership test)
+        if text.strip():
+            positions = self._text_positions(text)
+            candidates.append((len(positions), positions, positions.__contains__))
+        if category is not None:
+            start, end = self.category_ranges.get(category, (0, 0))
+            candidates.append((end - start, range(start, end), lambda p, s=start, e=end: s <= p < e))
+        if min_price is not None or max_price is not None:
+            low, high = self._price_range(min_price, max_price)
+            positions = self.price_positions[low:high]
+            in_range = lambda p: isinstance(self.items[p][2], float) and \
+                (min_price is None or self.items[p][2] >= min_price) and \
+                (max_price is None or self.items[p][2] <= max_price)
+            candidates.append((high - low, positions, in_range))
+
+        if not candidates:
+            return list(range(len(self.items)))
+        candidates.sort(key=lambda candidate: candidate[0])
+        _size, smallest, _test = candidates[0]
+        tests = [test for _size, _positions, test in candidates[1:]]
+        return sorted(p for p in smallest if all(test(p) for test in tests))
@@ -1,12 +1,48 @@
 # vendor_price_module.py
 import tkinter as tk
-from tkinter import messagebox
+from tkinter import messagebox, ttk
 import requests
 import csv
 import io
 import re
+from sheet_data import sheet_data
+from vendor_price_index import VendorPriceIndex
+from utils import TkDispatcher
+
+
+def parse_vendor_prices(csv_text):
+    """Parses the vendor sheet into ``{category: [{'item', 'price'}, ...]}``."""
+    vendor_data = {}
+    for row in csv.DictReader(io.StringIO(csv_text)):
+        if 'Category' in row and 'Item' in row and 'Price' in row:
+            category = row['Category'].strip()
+            item_name = row['Item'].strip()
+            price_str = row['Price'].strip()
+            
+            # --- BEGIN DATA CLEANING LOGIC ---
+            # Remove any non-numeric characters except for a dot, and handle empty strings
+            cleaned_price_str = re.sub(r'[^\d.]', '', price_str)
+            
+            try:
+                price = float(cleaned_price_str)
+            except (ValueError, TypeError):
+                # If conversion fails, default to 0.0 or a descriptive string
+                price = "N/A"
+                # Print an error message to the console for debugging
+                print(f"Warning: Could not parse price for item '{item_name}'. Raw value was: '{price_str}'")
+            # --- END DATA CLEANING LOGIC ---
+
+            if category not in vendor_data:
+                vendor_data[category] = []
+            vendor_data[category].append({'item': item_name, 'price': price})
+    return vendor_data
+
 
 class VendorPriceModule:
+    # Typing is debounced; the list is filtered once the user pauses this long
+    FILTER_DELAY_MS = 150
+    ALL_CATEGORIES = "All Categories"
+
     def __init__(self, root):
         self.root = root
         self.root.title("Vendor Price List")
@@ -51,125 +87,179 @@ class VendorPriceModule:
         self.search_entry.pack(side="left", padx=(0, 10))
         self.search_entry.bind("<KeyRelease>", self.filter_prices)
 
-        # Price List Content Frame (with scrollbar)
-        self.canvas_frame = tk.Frame(self.root, bg=self.colors['background'])
-        self.canvas_frame.pack(fill="both", expand=True, padx=20, pady=10)
+        tk.Label(self.filter_frame, text="Category:", font=("Arial", 10), bg=self.colors['background']).pack(side="left", padx=(0, 5))
+        self.category_var = tk.StringVar(value=self.ALL_CATEGORIES)
+        self.category_combo = ttk.Combobox(self.filter_frame, textvariable=self.category_var, state="readonly",
+                                           values=(self.ALL_CATEGORIES,), width=18, font=("Arial", 10))
+        self.category_combo.pack(side="left", padx=(0, 10))
+        self.category_combo.bind("<<ComboboxSelected>>", self.filter_prices)
+
+        tk.Label(self.filter_frame, text="Min $:", font=("Arial", 10), bg=self.colors['background']).pack(side="left", padx=(0, 5))
+        self.min_price_entry = tk.Entry(self.filter_frame, font=("Arial", 10), width=8, bd=1, relief="solid")
+        self.min_price_entry.pack(side="left", padx=(0, 10))
+        self.min_price_entry.bind("<KeyRelease>", self.filter_prices)
 
-        self.canvas = tk.Canvas(self.canvas_frame, bg=self.colors['white'], highlightthickness=0)
-        self.scrollbar = tk.Scrollbar(self.canvas_frame, orient="vertical", command=self.canvas.yview)
-        self.scrollable_frame = tk.Frame(self.canvas, bg=self.colors['white'])
+        tk.Label(self.filter_frame, text="Max $:", font=("Arial", 10), bg=self.colors['background']).pack(side="left", padx=(0, 5))
+        self.max_price_entry = tk.Entry(self.filter_frame, font=("Arial", 10), width=8, bd=1, relief="solid")
+        self.max_price_entry.pack(side="left", padx=(0, 10))
+        self.max_price_entry.bind("<KeyRelease>", self.filter_prices)
 
-        self.scrollable_frame.bind(
-            "<Configure>",
-            lambda e: self.canvas.configure(scrollregion=self.canvas.bbox("all"))
-        )
-        self.canvas.create_window((0, 0), window=self.scrollable_frame, anchor="nw")
-        self.canvas.configure(yscrollcommand=self.scrollbar.set)
+        self.result_count_label = tk.Label(self.filter_frame, text="", font=("Arial", 9),
+                                           bg=self.colors['background'], fg=self.colors['gray_medium'])
+        self.result_count_label.pack(side="left")
 
+        # Price List (a Treeview: rows are built once per load and filtered by detaching them)
+        self.list_frame = tk.Frame(self.root, bg=self.colors['background'])
+        self.list_frame.pack(fill="both", expand=True, padx=20, pady=10)
+
+        self.message_frame = tk.Frame(self.list_frame, bg=self.colors['background'])
+        self.message_frame.pack(fill="x")
+        self.no_match_label = tk.Label(self.message_frame, text="No items found matching your search.",
+                                       font=("Arial", 12), bg=self.colors['background'], fg=self.colors['gray_medium'])
+
+        style = ttk.Style(self.root)
+        style.configure("VendorPrice.Treeview", rowheight=26, font=("Arial", 10))
+        style.configure("VendorPrice.Treeview.Heading", font=("Arial", 10, "bold"))
+        self.price_tree = ttk.Treeview(self.list_frame, columns=("price",), show="tree headings",
+                                       selectmode="browse", style="VendorPrice.Treeview")
+        self.price_tree.heading("#0", text="Item", anchor="w")
+        self.price_tree.heading("price", text="Price", anchor="e")
+        self.price_tree.column("#0", width=500, stretch=True)
+        self.price_tree.column("price", width=120, anchor="e", stretch=False)
+        self.price_tree.tag_configure("category", background=self.colors['category_header_bg'],
+                                      foreground=self.colors['primary_blue'], font=("Arial", 12, "bold"))
+        self.price_tree.tag_configure("item", foreground=self.colors['gray_dark'])
+
+        self.scrollbar = ttk.Scrollbar(self.list_frame, orient="vertical", command=self.price_tree.yview)
+        self.price_tree.configure(yscrollcommand=self.scrollbar.set)
         self.scrollbar.pack(side="right", fill="y")
-        self.canvas.pack(side="left", fill="both", expand=True)
+        self.price_tree.pack(side="left", fill="both", expand=True)
+
+        # Tree rows: {category: iid}, and item iids by VendorPriceIndex position
+        self.category_rows = {}
+        self.item_rows = []
+        self.price_index = VendorPriceIndex({})
+        self.last_query = None
+        self.last_matches = {}
+        self.filter_job = None
 
-        self.vendor_data_url = "https://docs.google.com/spreadsheets/d/e/2PACX-1vQv3sHuJQ_wjPViqn8-b3pNz8QBH_l-wAllPa-RhCZ8Vlaf9bRltG-WguziYKYn1SMj4D3snIZfn-9w/pub?output=csv" 
+        self.dispatcher = TkDispatcher(self.root)
         self.all_vendor_data = {}
         self.load_prices()
 
     def refresh_prices(self):
-        self.load_prices()
-        messagebox.showinfo("Refresh Complete", "Vendor price list has been refreshed successfully.")
+        if self.load_prices(refresh=True):
+            messagebox.showinfo("Refresh Complete", "Vendor price list has been refreshed successfully.")
 
-    def load_prices(self):
-        for widget in self.scrollable_frame.winfo_children():
-            widget.destroy()
-        
-        self.all_vendor_data = {}
+    def on_prices_synced(self, csv_text):
+        """Shows prices that changed on the sheet since the snapshot was taken."""
+        try:
+            self.all_vendor_data = parse_vendor_prices(csv_text)
+        except Exception as e:
+            print(f"Could not parse synced vendor prices: {e}")
+            return
+        self.display_prices(self.all_vendor_data)
 
+    def load_prices(self, refresh=False):
         try:
-            response = requests.get(self.vendor_data_url, timeout=10)
-            response.raise_for_status()
-            csv_data = io.StringIO(response.text)
-            reader = csv.DictReader(csv_data)
-
-            for row in reader:
-                if 'Category' in row and 'Item' in row and 'Price' in row:
-                    category = row['Category'].strip()
-                    item_name = row['Item'].strip()
-                    price_str = row['Price'].strip()
-                    
-                    # --- BEGIN DATA CLEANING LOGIC ---
-                    # Remove any non-numeric characters except for a dot, and handle empty strings
-                    cleaned_price_str = re.sub(r'[^\d.]', '', price_str)
-                    
-                    try:
-                        price = float(cleaned_price_str)
-                    except (ValueError, TypeError):
-                        # If conversion fails, default to 0.0 or a descriptive string
-                        price = "N/A"
-                        # Print an error message to the console for debugging
-                        print(f"Warning: Could not parse price for item '{item_name}'. Raw value was: '{price_str}'")
-                    # --- END DATA CLEANING LOGIC ---
-
-                    if category not in self.all_vendor_data:
-                        self.all_vendor_data[category] = []
-                    self.all_vendor_data[category].append({'item': item_name, 'price': price})
-            
+            if refresh:
+                csv_text = sheet_data.fetch("vendor_prices")
+            else:
+                csv_text = sheet_data.get("vendor_prices")
+                # Served from the last good copy; sheet edits arrive through on_prices_synced
+                sheet_data.sync_in_background("vendor_prices", self.dispatcher, self.on_prices_synced, current=csv_text)
+            self.all_vendor_data = parse_vendor_prices(csv_text)
             self.display_prices(self.all_vendor_data)
+            return True
 
         except requests.exceptions.RequestException as e:
             messagebox.showwarning("Network Error", f"Could not load vendor prices from online. Please check internet connection.\nError: {e}")
-            self.display_error_message("Network Error", "Failed to load vendor prices due to network issues.")
+            if not self.all_vendor_data:
+                self.display_error_message("Network Error", "Failed to load vendor prices due to network issues.")
         except Exception as e:
             messagebox.showwarning("Error", f"Failed to parse vendor price data.\nError: {e}")
+            self.all_vendor_data = {}
+            self.clear_prices()
             self.display_error_message("Data Error", "Failed to load vendor prices due to data parsing issues.")
+        return False
 
-    def display_prices(self, data_to_display):
-        for widget in self.scrollable_frame.winfo_children():
-            widget.destroy()
-
-        if not data_to_display:
-            tk.Label(self.scrollable_frame, text="No items found matching your search.",
-                     font=("Arial", 12), bg=self.colors['white'], fg=self.colors['gray_medium']).pack(pady=20)
-            return
+    def clear_prices(self):
+        self.price_tree.delete(*self.price_tree.get_children())
+        self.category_rows = {}
+        self.item_rows = []
+        self.price_index = VendorPriceIndex({})
+        self.last_query = None
+        self.last_matches = {}
+        for widget in self.message_frame.winfo_children():
+            if widget is not self.no_match_label:
+                widget.destroy()
+        self.no_match_label.pack_forget()
 
-        row_counter = 0
-        for category, items in data_to_display.items():
-            category_frame = tk.Frame(self.scrollable_frame, bg=self.colors['category_header_bg'], bd=1, relief="solid")
-            category_frame.pack(fill="x", padx=5, pady=(10, 2))
-            tk.Label(category_frame, text=category, font=("Arial", 13, "bold"), 
-                     bg=self.colors['category_header_bg'], fg=self.colors['primary_blue'], anchor="w").pack(padx=10, pady=5)
-            
-            for i, item_data in enumerate(items):
-                bg_color = self.colors['item_row_bg_even'] if i % 2 == 0 else self.colors['item_row_bg_odd']
-                item_frame = tk.Frame(self.scrollable_frame, bg=bg_color, bd=1, relief="solid")
-                item_frame.pack(fill="x", padx=5, pady=0)
-
-                tk.Label(item_frame, text=item_data['item'], font=("Arial", 10), 
-                         bg=bg_color, fg=self.colors['gray_dark'], anchor="w").pack(side="left", padx=10, pady=5, expand=True, fill="x")
-                
+    def display_prices(self, data_to_display):
+        """Indexes ``data_to_display`` and builds its tree rows, then applies the current filters."""
+        self.clear_prices()
+        self.price_index = VendorPriceIndex(data_to_display)
+        for category, (start, end) in self.price_index.category_ranges.items():
+            category_iid = self.price_tree.insert("", "end", text=category, open=True, tags=("category",))
+            self.category_rows[category] = category_iid
+            for _category, item_name, price in self.price_index.items[start:end]:
                 # Display price, handling non-numeric values
-                price_display = f"${item_data['price']:.2f}" if isinstance(item_data['price'], float) else str(item_data['price'])
-                tk.Label(item_frame, text=price_display, font=("Arial", 10, "bold"), 
-                         bg=bg_color, fg=self.colors['green'], anchor="e").pack(side="right", padx=10, pady=5)
-                row_counter += 1
+                price_display = f"${price:.2f}" if isinstance(price, float) else str(price)
+                self.item_rows.append(self.price_tree.insert(category_iid, "end", text=item_name,
+                                                             values=(price_display,), tags=("item",)))
+
+        self.category_combo.config(values=(self.ALL_CATEGORIES,) + tuple(self.price_index.categories))
+        if self.category_var.get() not in self.price_index.category_ranges:
+            self.category_var.set(self.ALL_CATEGORIES)
+        self.apply_filter()
 
     def filter_prices(self, event=None):
-        search_term = self.search_entry.get().strip().lower()
-        filtered_data = {}
+        if self.filter_job is not None:
+            self.root.after_cancel(self.filter_job)
+        self.filter_job = self.root.after(self.FILTER_DELAY_MS, self.apply_filter)
 
-        if not search_term:
-            self.display_prices(self.all_vendor_data)
+    @staticmethod
+    def _price_bound(entry):
+        """The entry's price, or None if it is empty or not a number."""
+        try:
+            return float(re.sub(r'[^\d.]', '', entry.get())) if entry.get().strip() else None
+        except ValueError:
+            return None
+
+    def apply_filter(self):
+        """Shows only the rows matching the search, category and price range, by re-attaching/detaching them."""
+        self.filter_job = None
+        category = self.category_var.get()
+        query = (self.search_entry.get().strip(),
+                 None if category == self.ALL_CATEGORIES else category,
+                 self._price_bound(self.min_price_entry),
+                 self._price_bound(self.max_price_entry))
+        if query == self.last_query:
             return
+        self.last_query = query
 
-        for category, items in self.all_vendor_data.items():
-            for item_data in items:
-                if search_term in item_data['item'].lower():
-                    if category not in filtered_data:
-                        filtered_data[category] = []
-                    filtered_data[category].append(item_data)
-        
-        self.display_prices(filtered_data)
+        matches = {}
+        for position in self.price_index.query(*query):
+            matches.setdefault(self.price_index.items[position][0], []).append(self.item_rows[position])
+
+        for category_name, category_iid in self.category_rows.items():
+            rows = matches.get(category_name, [])
+            if rows == self.last_matches.get(category_name, []):
+                continue  # Unchanged since the last filter, nothing to move
+            # One call per category: set_children re-attaches these rows and detaches the rest
+            self.price_tree.set_children(category_iid, *rows)
+        self.price_tree.set_children("", *[iid for category_name, iid in self.category_rows.items() if category_name in matches])
+
+        self.last_matches = matches
+        match_count = sum(len(rows) for rows in matches.values())
+        self.result_count_label.config(text=f"{match_count} of {len(self.price_index)} items")
+        if matches or not self.category_rows:
+            self.no_match_label.pack_forget()
+        else:
+            self.no_match_label.pack(pady=20)
 
     def display_error_message(self, title, message):
-        error_frame = tk.Frame(self.scrollable_frame, bg="#f8d7da", bd=2, relief="groove", padx=15, pady=10)
+        error_frame = tk.Frame(self.message_frame, bg="#f8d7da", bd=2, relief="groove", padx=15, pady=10)
         error_frame.pack(fill="x", padx=10, pady=5)
         tk.Label(error_frame, text=title, font=("Arial", 14, "bold"), fg="#721c24", bg="#f8d7da").pack(fill="x")
         tk.Label(error_frame, text=message, font=("Arial", 11), fg="#721c24", bg="#f8d7da").pack(fill="x", pady=(5,0))
\ No newline at end of file
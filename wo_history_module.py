@@ -0,0 +1,161 @@
+# wo_history_module.py
+import tkinter as tk
+from tkinter import messagebox, ttk
+from datetime import datetime
+from theme_manager import theme_manager
+from wo_store import wo_store
+
+
+class WOHistoryModule:
+    """Version history of one WO: lists saved versions, diffs them and restores one."""
+
+    FIELD_LABELS = {
+        "selected": "Selected",
+        "qty": "Qty",
+        "unit_price": "Unit Price",
+        "location": "Location",
+        "add_info": "Additional Info",
+        "conjunction_key": "Key",
+        "template": "Template",
+        "edited_preview": "Edited Preview",
+        "photo": "Photo",
+    }
+
+    def __init__(self, root, wo_number, on_restore=None):
+        self.root = root
+        self.wo_number = wo_number
+        self.on_restore = on_restore
+        self.root.title(f"History - WO# {wo_number}")
+        self.root.geometry("900x600")
+        self.colors = theme_manager.get_current_colors()
+        self.root.configure(bg=self.colors['background'])
+
+        # Module Title
+        title_frame = tk.Frame(self.root, bg=self.colors['primary_blue'], height=60)
+        title_frame.pack(fill='x', pady=(0, 10))
+        title_frame.pack_propagate(False)
+        tk.Label(title_frame, text=f"WO# {wo_number} History", font=("Arial", 18, "bold"),
+                 fg='white', bg=self.colors['primary_blue']).pack(side="left", padx=20)
+
+        buttons_frame = tk.Frame(self.root, bg=self.colors['background'])
+        buttons_frame.pack(fill='x', padx=20, pady=(0, 10))
+        tk.Button(buttons_frame, text="Compare", command=self.show_diff,
+                  font=("Arial", 10, "bold"), bg=self.colors['light_blue'], fg='white',
+                  relief="flat", cursor="hand2").pack(side="left", padx=(0, 5))
+        tk.Button(buttons_frame, text="Restore Version", command=self.restore_selected,
+                  font=("Arial", 10, "bold"), bg=self.colors['primary_blue'], fg='white',
+                  relief="flat", cursor="hand2").pack(side="left")
+        tk.Label(buttons_frame, text="Select one version to compare it with the one before, or two to compare them.",
+                 font=("Arial", 9), bg=self.colors['background'], fg=self.colors['gray_dark']).pack(side="left", padx=10)
+
+        panes = tk.PanedWindow(self.root, orient="horizontal", bg=self.colors['background'], sashwidth=6)
+        panes.pack(fill="both", expand=True, padx=20, pady=(0, 20))
+
+        self.versions_tree = ttk.Treeview(panes, columns=("version", "saved", "kind"), show="headings", selectmode="extended")
+        for column, heading, width in (("version", "Version", 70), ("saved", "Saved", 140), ("kind", "Stored As", 80)):
+            self.versions_tree.heading(column, text=heading)
+            self.versions_tree.column(column, width=width, anchor='w')
+        self.versions_tree.bind("<<TreeviewSelect>>", lambda e: self.show_diff())
+        panes.add(self.versions_tree, minsize=280)
+
+        self.diff_text = tk.Text(panes, font=("Consolas", 10), wrap=tk.WORD, bg=self.colors['white'],
+                                 fg=self.colors['text_primary'], relief="flat", state=tk.DISABLED)
+        self.diff_text.tag_configure("added", foreground=self.colors['green'])
+        self.diff_text.tag_configure("removed", foreground='#dc3545')
+        self.diff_text.tag_configure("heading", font=("Consolas", 10, "bold"))
+        panes.add(self.diff_text, minsize=300)
+
+        self.load_versions()
+
+    def load_versions(self):
+        self.versions_tree.delete(*self.versions_tree.get_children())
+        try:
+            versions = wo_store.list_versions(self.wo_number)
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to load history: {e}")
+            return
+        for version in versions:
+            saved = datetime.fromtimestamp(version['created']).strftime('%Y-%m-%d %H:%M:%S')
+            kind = "Checkpoint" if version['kind'] == "full" else "Changes"
+            self.versions_tree.insert('', 'end', iid=str(version['version']),
+                                      values=(version['version'], saved, kind))
+        if not versions:
+            self._set_diff_text([("No saved versions for this WO yet.", None)])
+
+    def _selected_versions(self):
+        return sorted(int(iid) for iid in self.versions_tree.selection())
+
+    def show_diff(self):
+        selected = self._selected_versions()
+        if not selected:
+            return
+        if len(selected) == 1:
+            new_version = selected[0]
+            old_version = new_version - 1
+        else:
+            old_version, new_version = selected[0], selected[-1]
+        if old_version < 1:
+            self._set_diff_text([(f"Version {new_version} is the first saved version.", "heading")])
+            return
+
+        try:
+            changes = wo_store.diff_versions(self.wo_number, old_version, new_version)
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to compare versions: {e}")
+            return
+
+        lines = [(f"Changes from version {old_version} to {new_version}\n", "heading")]
+        if not changes:
+            lines.append(("No differences.", None))
+        for change in changes:
+            item = f"{change['category']} / {change['item_key']}" if change['category'] else change['item_key']
+            if change['field'] == "row":
+                if change['new']:
+                    lines.append((f"+ {item} added", "added"))
+                else:
+                    lines.append((f"- {item} removed", "removed"))
+                continue
+            label = self.FIELD_LABELS.get(change['field'], change['field'])
+            old_value = self._format_value(change['field'], change['old'])
+            new_value = self._format_value(change['field'], change['new'])
+            lines.append((f"~ {item}: {label}", None))
+            lines.append((f"    - {old_value}", "removed"))
+            lines.append((f"    + {new_value}", "added"))
+        self._set_diff_text(lines)
+
+    @staticmethod
+    def _format_value(field, value):
+        if field == "selected":
+            return "Yes" if value else "No"
+        if field == "template" and value is None:
+            return "(catalog default)"
+        if value in (None, ""):
+            return "(empty)"
+        return str(value)
+
+    def _set_diff_text(self, lines):
+        self.diff_text.config(state=tk.NORMAL)
+        self.diff_text.delete("1.0", tk.END)
+        for text, tag in lines:
+            self.diff_text.insert(tk.END, text + "\n", tag or ())
+        self.diff_text.config(state=tk.DISABLED)
+
+    def restore_selected(self):
+        selected = self._selected_versions()
+        if len(selected) != 1:
+            messagebox.showwarning("Restore", "Select the one version you want to restore.")
+            return
+        version = selected[0]
+        if not messagebox.askyesno("Confirm Restore",
+                                   f"Restore WO# {self.wo_number} to version {version}?\n\n"
+                                   f"The current state stays in the history as its own version."):
+            return
+        try:
+            wo_store.restore_version(self.wo_number, version)
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to restore version: {e}")
+            return
+        messagebox.showinfo("Success", f"WO# {self.wo_number} restored to version {version}.")
+        self.load_versions()
+        if callable(self.on_restore):
+            self.on_restore()
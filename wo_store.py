@@ -0,0 +1,721 @@
+# wo_store.py
+import os
+import re
+import gzip
+import json
+import time
+import zlib
+import hashlib
+import shutil
+import sqlite3
+import threading
+
+
+class WOStore:
+    """SQLite storage for Bid Writer work orders.
+
+    One database (bid_writer.db, WAL mode) replaces the old one-JSON-file-per-WO
+    layout. WO headers, line items and photo references live in separate
+    tables, and the header table is indexed on WO number, modified time and
+    bid count so the dashboard can list thousands of WOs without reading them.
+
+    ``save_state`` and ``load_state`` take and return the same dict shape the
+    WO_<n>.json files used, so callers did not have to change their model.
+    Storage is compact, though: rows the user never touched are not kept, and
+    a template equal to the catalog's is stored as NULL and filled back in
+    on load from the catalog version the WO was saved against (its
+    ``catalog_hash``; see ``set_catalog``), so a later catalog edit never
+    rewords a saved bid.
+    WO_*.json(.gz) files are imported on first use, and again whenever the
+    dashboard refreshes (``refresh_index``), then moved into ``migrated_json/``.
+    """
+
+    DB_FILENAME = "bid_writer.db"
+    MIGRATED_DIRNAME = "migrated_json"
+
+    ITEM_FIELDS = ("selected", "template", "qty", "unit_price", "location", "add_info",
+                   "original_name", "conjunction_key")
+    SORT_COLUMNS = ("wo_number", "modified", "bid_count")
+    STATE_FILE_EXTENSIONS = (".json", ".json.gz")
+    # Every Nth version is a full snapshot, so rebuilding one applies at most N-1 deltas
+    VERSION_CHECKPOINT_EVERY = 10
+    DIFF_FIELDS = ("selected", "qty", "unit_price", "location", "add_info", "conjunction_key",
+                   "template", "edited_preview")
+    _INSERT_ITEM_SQL = """
+        INSERT OR REPLACE INTO line_items (wo_number, category, item_key, position, selected, original_name, template,
+                                           qty, unit_price, location, add_info, conjunction_key, instance_info, edited_preview)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """
+
+    def __init__(self, app_data_dir=None):
+        self.app_data_dir = app_data_dir or os.path.join(os.path.expanduser("~"), ".techvengers_bidwriter")
+        self.db_path = os.path.join(self.app_data_dir, self.DB_FILENAME)
+        self._local = threading.local()
+        self._ready = False
+        self._ready_lock = threading.Lock()
+        self.fts_enabled = False
+
+    # --- Connection / schema ---
+    def _connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            os.makedirs(self.app_data_dir, exist_ok=True)
+            conn = sqlite3.connect(self.db_path, timeout=10)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA foreign_keys=ON")
+            self._local.conn = conn
+        if not self._ready:
+            with self._ready_lock:
+                if not self._ready:
+                    self._create_schema(conn)
+                    self._ready = True
+                    self.migrate_json_files()
+        return conn
+
+    def _create_schema(self, conn):
+        with conn:
+            conn.executescript("""
+                CREATE TABLE IF NOT EXISTS work_orders (
+                    wo_number TEXT PRIMARY KEY,
+                    created REAL NOT NULL,
+                    modified REAL NOT NULL,
+                    bid_count INTEGER NOT NULL DEFAULT 0,
+                    catalog_hash TEXT
+                );
+                CREATE INDEX IF NOT EXISTS idx_work_orders_modified ON work_orders(modified);
+                CREATE INDEX IF NOT EXISTS idx_work_orders_bid_count ON work_orders(bid_count);
+
+                CREATE TABLE IF NOT EXISTS line_items (
+                    wo_number TEXT NOT NULL REFERENCES work_orders(wo_number) ON DELETE CASCADE,
+                    category TEXT NOT NULL,
+                    item_key TEXT NOT NULL,
+                    position INTEGER NOT NULL,
+                    selected INTEGER NOT NULL DEFAULT 0,
+                    original_name TEXT,
+                    template TEXT,
+                    qty TEXT,
+                    unit_price TEXT,
+                    location TEXT,
+                    add_info TEXT,
+                    conjunction_key TEXT,
+                    instance_info TEXT,
+                    edited_preview TEXT,
+                    PRIMARY KEY (wo_number, category, item_key)
+                );
+
+                CREATE TABLE IF NOT EXISTS photos (
+                    wo_number TEXT NOT NULL REFERENCES work_orders(wo_number) ON DELETE CASCADE,
+                    photo_key TEXT NOT NULL,
+                    path TEXT NOT NULL,
+                    PRIMARY KEY (wo_number, photo_key)
+                );
+
+                CREATE TABLE IF NOT EXISTS wo_versions (
+                    wo_number TEXT NOT NULL REFERENCES work_orders(wo_number) ON DELETE CASCADE,
+                    version INTEGER NOT NULL,
+                    created REAL NOT NULL,
+                    kind TEXT NOT NULL,
+                    data BLOB NOT NULL,
+                    PRIMARY KEY (wo_number, version)
+                );
+
+                CREATE TABLE IF NOT EXISTS catalog_items (
+                    catalog_hash TEXT NOT NULL,
+                    category TEXT NOT NULL,
+                    item_name TEXT NOT NULL,
+                    template TEXT NOT NULL,
+                    unit_price TEXT NOT NULL,
+                    PRIMARY KEY (catalog_hash, category, item_name)
+                );
+
+                CREATE TABLE IF NOT EXISTS edit_journal (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    wo_number TEXT NOT NULL,
+                    category TEXT NOT NULL,
+                    item_key TEXT NOT NULL,
+                    field TEXT NOT NULL,
+                    value TEXT,
+                    recorded REAL NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_edit_journal_wo ON edit_journal(wo_number);
+
+                CREATE TABLE IF NOT EXISTS store_meta (
+                    key TEXT PRIMARY KEY,
+                    value TEXT
+                );
+            """)
+
+        # Full-text index over WO contents; LIKE is used where FTS5 is not compiled in
+        try:
+            with conn:
+                exists = conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'wo_search'").fetchone()
+                conn.execute("CREATE TABLE IF NOT EXISTS search_docs (doc_id INTEGER PRIMARY KEY, wo_number TEXT UNIQUE NOT NULL)")
+                conn.execute("CREATE VIRTUAL TABLE IF NOT EXISTS wo_search USING fts5(content, prefix='2 3')")
+                self.fts_enabled = True
+                if not exists:
+                    self._rebuild_search_index(conn)
+        except sqlite3.OperationalError as e:
+            print(f"Full-text search unavailable, falling back to LIKE: {e}")
+
+    # --- Catalog ---
+    @staticmethod
+    def catalog_hash(categories):
+        """Version hash of a bid catalog ({category: [{'item_name', 'template', 'unit_price'}]})."""
+        payload = json.dumps(categories, sort_keys=True, separators=(",", ":"))
+        return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+    def current_catalog_hash(self):
+        row = self._connection().execute("SELECT value FROM store_meta WHERE key = 'catalog_hash'").fetchone()
+        return row[0] if row else None
+
+    def set_catalog(self, categories):
+        """Records the current bid catalog; new saves are compacted against it.
+
+        Each catalog version is kept under its hash for as long as a stored WO
+        was saved against it, so a WO's compact rows are always filled back in
+        with the wording they were saved with. Versions no WO uses any more are
+        dropped. Returns the catalog hash.
+        """
+        catalog_hash = self.catalog_hash(categories)
+        conn = self._connection()
+        if catalog_hash == self.current_catalog_hash():
+            return catalog_hash
+        rows = [(catalog_hash, category, item['item_name'], item.get('template', ''), str(item.get('unit_price', '0.00')))
+                for category, items in categories.items() for item in items]
+        with conn:
+            conn.executemany("INSERT OR REPLACE INTO catalog_items (catalog_hash, category, item_name, template, unit_price) "
+                             "VALUES (?, ?, ?, ?, ?)", rows)
+            conn.execute("INSERT OR REPLACE INTO store_meta (key, value) VALUES ('catalog_hash', ?)", (catalog_hash,))
+            conn.execute("""
+                DELETE FROM catalog_items WHERE catalog_hash != ?
+                  AND catalog_hash NOT IN (SELECT catalog_hash FROM work_orders WHERE catalog_hash IS NOT NULL)
+            """, (catalog_hash,))
+        return catalog_hash
+
+    # Catalog entry of a line item, in the catalog version its WO was saved against
+    _CATALOG_ENTRY_SQL = """
+        SELECT c.{column} FROM catalog_items c JOIN work_orders w ON w.catalog_hash = c.catalog_hash
+        WHERE w.wo_number = line_items.wo_number
+          AND c.category = line_items.category AND c.item_name = line_items.original_name
+    """
+
+    def _expand_templates(self, conn, wo_number):
+        """Writes out the NULL templates of a WO in full, from the catalog it was saved against.
+
+        Needed before the WO is moved to another catalog version while some of
+        its rows are not rewritten (``save_changes``).
+        """
+        conn.execute(f"""
+            UPDATE line_items SET template = COALESCE(({self._CATALOG_ENTRY_SQL.format(column="template")}), '')
+            WHERE template IS NULL AND wo_number = ?
+        """, (wo_number,))
+
+    def _compact(self, conn, wo_number=None):
+        """Nulls catalog-default templates and drops untouched rows (all WOs, or one).
+
+        Rows are compared with the catalog version of their own WO.
+        """
+        only_wo = " AND line_items.wo_number = ?" if wo_number is not None else ""
+        params = (wo_number,) if wo_number is not None else ()
+        conn.execute(f"""
+            UPDATE line_items SET template = NULL
+            WHERE template = ({self._CATALOG_ENTRY_SQL.format(column="template")}){only_wo}
+        """, params)
+        conn.execute(f"""
+            DELETE FROM line_items
+            WHERE template IS NULL AND selected = 0 AND COALESCE(qty, '') IN ('', '0')
+              AND COALESCE(location, '') = '' AND COALESCE(add_info, '') = '' AND COALESCE(conjunction_key, '') = ''
+              AND COALESCE(edited_preview, '') = ''
+              AND COALESCE(json_extract(instance_info, '$.instance_id'), 1) = 1
+              AND unit_price = ({self._CATALOG_ENTRY_SQL.format(column="unit_price")})
+              AND NOT EXISTS (SELECT 1 FROM photos p WHERE p.wo_number = line_items.wo_number
+                              AND p.photo_key = line_items.category || '_' || line_items.item_key){only_wo}
+        """, params)
+        conn.execute(f"""
+            UPDATE work_orders SET bid_count = (SELECT COUNT(*) FROM line_items WHERE line_items.wo_number = work_orders.wo_number)
+            {"WHERE wo_number = ?" if wo_number is not None else ""}
+        """, params)
+
+    # --- Full-text search ---
+    def _index_wo(self, conn, wo_number):
+        """Re-indexes the searchable text of one WO (item names, locations, info, edited previews)."""
+        if not self.fts_enabled:
+            return
+        conn.execute("INSERT OR IGNORE INTO search_docs (wo_number) VALUES (?)", (wo_number,))
+        doc_id = conn.execute("SELECT doc_id FROM search_docs WHERE wo_number = ?", (wo_number,)).fetchone()[0]
+        rows = conn.execute("""
+            SELECT original_name, location, add_info, edited_preview FROM line_items
+            WHERE wo_number = ? ORDER BY position
+        """, (wo_number,))
+        content = "\n".join(" — ".join(value for value in row if value) for row in rows)
+        conn.execute("DELETE FROM wo_search WHERE rowid = ?", (doc_id,))
+        conn.execute("INSERT INTO wo_search (rowid, content) VALUES (?, ?)", (doc_id, content))
+
+    def _unindex_wo(self, conn, wo_number):
+        if not self.fts_enabled:
+            return
+        row = conn.execute("SELECT doc_id FROM search_docs WHERE wo_number = ?", (wo_number,)).fetchone()
+        if row is not None:
+            conn.execute("DELETE FROM wo_search WHERE rowid = ?", (row[0],))
+            conn.execute("DELETE FROM search_docs WHERE doc_id = ?", (row[0],))
+
+    def _rebuild_search_index(self, conn):
+        if not self.fts_enabled:
+            return
+        conn.execute("DELETE FROM wo_search")
+        conn.execute("DELETE FROM search_docs")
+        for (wo_number,) in conn.execute("SELECT wo_number FROM work_orders").fetchall():
+            self._index_wo(conn, wo_number)
+
+    @staticmethod
+    def _fts_query(text):
+        # Every word must match, as a prefix; quoting keeps FTS syntax out of user input
+        return " ".join(f'"{token}"*' for token in re.findall(r"\w+", text))
+
+    def search_work_orders(self, text, order_by=None, descending=True, limit=None, offset=0):
+        """Ranked search over WO numbers and contents.
+
+        Returns WO headers plus a ``snippet`` of the matching text, best
+        matches first (WO number matches before content matches), or sorted
+        by ``order_by`` (one of SORT_COLUMNS) when given.
+        """
+        if order_by is not None and order_by not in self.SORT_COLUMNS:
+            raise ValueError(f"Cannot sort work orders by {order_by!r}")
+        conn = self._connection()
+        number_clause, params = self._search_clause(text)
+        fts_query = self._fts_query(text)
+        if self.fts_enabled and fts_query:
+            content_matches = """
+                SELECT d.wo_number, bm25(wo_search) AS score, snippet(wo_search, 0, '[', ']', '…', 10) AS snippet
+                FROM wo_search JOIN search_docs d ON d.doc_id = wo_search.rowid
+                WHERE wo_search MATCH ?
+            """
+            params.append(fts_query)
+        else:
+            escaped = params[0] if params else "%"
+            content_matches = """
+                SELECT DISTINCT wo_number, 0 AS score, '' AS snippet FROM line_items
+                WHERE original_name LIKE ? ESCAPE '\\' OR location LIKE ? ESCAPE '\\'
+                   OR add_info LIKE ? ESCAPE '\\' OR edited_preview LIKE ? ESCAPE '\\'
+            """
+            params += [escaped] * 4
+        sql = f"""
+            WITH matches AS (
+                SELECT wo_number, -1e9 AS score, '' AS snippet FROM work_orders{number_clause}
+                UNION ALL
+                {content_matches}
+            )
+            SELECT w.wo_number, w.modified, w.bid_count, MIN(m.score) AS score, MAX(m.snippet) AS snippet
+            FROM matches m JOIN work_orders w ON w.wo_number = m.wo_number
+            GROUP BY w.wo_number
+            ORDER BY {"score, w.modified DESC, w.wo_number" if order_by is None else
+                      f"w.{order_by} {'DESC' if descending else 'ASC'}, w.wo_number"}
+        """
+        if limit is not None:
+            sql += " LIMIT ? OFFSET ?"
+            params += [limit, offset]
+        return [dict(row) for row in conn.execute(sql, params)]
+
+    # --- Work orders ---
+    @staticmethod
+    def _item_row(wo_number, category, item_key, position, item):
+        return (
+            wo_number, category, item_key, position,
+            1 if item.get("selected") else 0,
+            item.get("original_name", ""),
+            item.get("template", ""),
+            str(item.get("qty", "0")),
+            str(item.get("unit_price", "0.00")),
+            item.get("location", ""),
+            item.get("add_info", ""),
+            item.get("conjunction_key", ""),
+            json.dumps(item.get("instance_info", {})),
+            item.get("edited_preview") or None,
+        )
+
+    def save_state(self, wo_number, state, modified=None):
+        """Replaces the stored state of ``wo_number`` in a single transaction."""
+        conn = self._connection()
+        with conn:
+            self._write_state(conn, wo_number, state, modified if modified is not None else time.time())
+
+    def _write_state(self, conn, wo_number, state, now):
+        item_rows = []
+        for category, items in state.get("selected_items", {}).items():
+            for item_key, item in items.items():
+                item_rows.append(self._item_row(wo_number, category, item_key, len(item_rows), item))
+        photo_rows = [(wo_number, key, path) for key, path in state.get("item_photos", {}).items() if path]
+
+        catalog_hash = state.get("catalog_hash") or self.current_catalog_hash()
+
+        conn.execute("""
+            INSERT INTO work_orders (wo_number, created, modified, bid_count, catalog_hash) VALUES (?, ?, ?, 0, ?)
+            ON CONFLICT(wo_number) DO UPDATE SET modified = excluded.modified, catalog_hash = excluded.catalog_hash
+        """, (wo_number, now, now, catalog_hash))
+        conn.execute("DELETE FROM line_items WHERE wo_number = ?", (wo_number,))
+        conn.execute("DELETE FROM photos WHERE wo_number = ?", (wo_number,))
+        conn.executemany(self._INSERT_ITEM_SQL, item_rows)
+        conn.executemany("INSERT INTO photos (wo_number, photo_key, path) VALUES (?, ?, ?)", photo_rows)
+        self._compact(conn, wo_number)
+        self._index_wo(conn, wo_number)
+        self._record_version(conn, wo_number, now)
+
+    def save_changes(self, wo_number, items, removed=(), photos=None, modified=None):
+        """Writes only the changed line items of an existing WO, in one transaction.
+
+        ``items`` maps ``(category, item_key)`` to ``(position, item dict)`` for
+        rows to insert or update, ``removed`` lists ``(category, item_key)``
+        rows to delete, and ``photos`` (``{photo_key: path}``) replaces the photo
+        references when not None. Returns False if the WO is not stored yet,
+        in which case the caller should use ``save_state``.
+        """
+        conn = self._connection()
+        if not self.exists(wo_number):
+            return False
+        now = modified if modified is not None else time.time()
+
+        item_rows = [self._item_row(wo_number, category, item_key, position, item)
+                     for (category, item_key), (position, item) in items.items()]
+        catalog_hash = self.current_catalog_hash()
+        with conn:
+            # Rows not rewritten here must keep the wording of the catalog they were saved against
+            self._expand_templates(conn, wo_number)
+            conn.executemany("DELETE FROM line_items WHERE wo_number = ? AND category = ? AND item_key = ?",
+                             [(wo_number, category, item_key) for category, item_key in removed])
+            conn.executemany(self._INSERT_ITEM_SQL, item_rows)
+            if photos is not None:
+                conn.execute("DELETE FROM photos WHERE wo_number = ?", (wo_number,))
+                conn.executemany("INSERT INTO photos (wo_number, photo_key, path) VALUES (?, ?, ?)",
+                                 [(wo_number, key, path) for key, path in photos.items() if path])
+            conn.execute("UPDATE work_orders SET modified = ?, catalog_hash = ? WHERE wo_number = ?",
+                         (now, catalog_hash, wo_number))
+            self._compact(conn, wo_number)
+            self._index_wo(conn, wo_number)
+            self._record_version(conn, wo_number, now)
+        return True
+
+    def load_state(self, wo_number):
+        """Returns the saved state dict of ``wo_number``, or None if it does not exist.
+
+        Templates stored as NULL come back filled in from the catalog version
+        the WO was saved against, which ``catalog_hash`` names.
+        """
+        conn = self._connection()
+        header = conn.execute("SELECT catalog_hash FROM work_orders WHERE wo_number = ?", (wo_number,)).fetchone()
+        if header is None:
+            return None
+
+        state = {"selected_items": {}, "item_photos": {}, "catalog_hash": header["catalog_hash"]}
+        for row in conn.execute("""
+            SELECT line_items.*, COALESCE(line_items.template, c.template, '') AS full_template
+            FROM line_items
+            LEFT JOIN catalog_items c ON c.catalog_hash = ?
+                AND c.category = line_items.category AND c.item_name = line_items.original_name
+            WHERE wo_number = ? ORDER BY position
+        """, (header["catalog_hash"], wo_number)):
+            state["selected_items"].setdefault(row["category"], {})[row["item_key"]] = {
+                "selected": bool(row["selected"]),
+                "template": row["full_template"],
+                "qty": row["qty"],
+                "unit_price": row["unit_price"],
+                "location": row["location"],
+                "add_info": row["add_info"],
+                "original_name": row["original_name"],
+                "instance_info": json.loads(row["instance_info"] or "{}"),
+                "conjunction_key": row["conjunction_key"],
+                "edited_preview": row["edited_preview"] or "",
+            }
+        for row in conn.execute("SELECT photo_key, path FROM photos WHERE wo_number = ?", (wo_number,)):
+            state["item_photos"][row["photo_key"]] = row["path"]
+        return state
+
+    def exists(self, wo_number):
+        row = self._connection().execute("SELECT 1 FROM work_orders WHERE wo_number = ?", (wo_number,)).fetchone()
+        return row is not None
+
+    def delete(self, wo_number):
+        """Deletes a WO with its line items, photo references, history and journaled edits.
+
+        Returns False if it did not exist.
+        """
+        conn = self._connection()
+        with conn:
+            cursor = conn.execute("DELETE FROM work_orders WHERE wo_number = ?", (wo_number,))
+            conn.execute("DELETE FROM edit_journal WHERE wo_number = ?", (wo_number,))
+            self._unindex_wo(conn, wo_number)
+        return cursor.rowcount > 0
+
+    @staticmethod
+    def _search_clause(search_term):
+        if not search_term:
+            return "", []
+        escaped = search_term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        return " WHERE wo_number LIKE ? ESCAPE '\\'", [f"%{escaped}%"]
+
+    def list_work_orders(self, search_term="", order_by="modified", descending=True, limit=None, offset=0):
+        """Returns WO headers (wo_number, modified, bid_count).
+
+        Sorted by ``order_by`` (one of SORT_COLUMNS), most recently modified
+        first by default. ``limit``/``offset`` page through the result.
+        """
+        if order_by not in self.SORT_COLUMNS:
+            raise ValueError(f"Cannot sort work orders by {order_by!r}")
+        where, params = self._search_clause(search_term)
+        direction = "DESC" if descending else "ASC"
+        sql = f"SELECT wo_number, modified, bid_count FROM work_orders{where} ORDER BY {order_by} {direction}, wo_number"
+        if limit is not None:
+            sql += " LIMIT ? OFFSET ?"
+            params += [limit, offset]
+        return [dict(row) for row in self._connection().execute(sql, params)]
+
+    def count_work_orders(self, search_term=""):
+        where, params = self._search_clause(search_term)
+        return self._connection().execute(f"SELECT COUNT(*) FROM work_orders{where}", params).fetchone()[0]
+
+    # --- Version history ---
+    @staticmethod
+    def _row_key(category, item_key):
+        return f"{category}\t{item_key}"
+
+    def _snapshot(self, conn, wo_number):
+        """Stored rows and photo references of a WO, as plain dicts.
+
+        Templates are written out in full, so a version reads the same after
+        the catalog changes and compacting a row is not a change.
+        """
+        rows = {}
+        for row in conn.execute(f"""
+            SELECT line_items.*, COALESCE(line_items.template, ({self._CATALOG_ENTRY_SQL.format(column="template")}), '')
+                AS full_template
+            FROM line_items WHERE wo_number = ?
+        """, (wo_number,)):
+            data = dict(row)
+            data["template"] = data.pop("full_template")
+            del data["wo_number"]
+            rows[self._row_key(data.pop("category"), data.pop("item_key"))] = data
+        photos = dict(conn.execute("SELECT photo_key, path FROM photos WHERE wo_number = ?", (wo_number,)).fetchall())
+        return {"rows": rows, "photos": photos}
+
+    @staticmethod
+    def _delta(old, new):
+        return {part: {"set": {key: value for key, value in new[part].items() if old[part].get(key) != value},
+                       "del": [key for key in old[part] if key not in new[part]]}
+                for part in ("rows", "photos")}
+
+    @staticmethod
+    def _apply_delta(snapshot, delta):
+        for part in ("rows", "photos"):
+            for key in delta[part]["del"]:
+                snapshot[part].pop(key, None)
+            snapshot[part].update(delta[part]["set"])
+        return snapshot
+
+    def _record_version(self, conn, wo_number, now):
+        """Stores the WO's current rows as a new version, inside the caller's transaction.
+
+        Nothing is stored when the rows did not change since the last version.
+        """
+        snapshot = self._snapshot(conn, wo_number)
+        last = conn.execute("SELECT MAX(version) FROM wo_versions WHERE wo_number = ?", (wo_number,)).fetchone()[0]
+        if last is None:
+            version, kind, payload = 1, "full", snapshot
+        else:
+            delta = self._delta(self._version_snapshot(conn, wo_number, last), snapshot)
+            if not any(delta[part]["set"] or delta[part]["del"] for part in delta):
+                return None
+            version = last + 1
+            if (version - 1) % self.VERSION_CHECKPOINT_EVERY == 0:
+                kind, payload = "full", snapshot
+            else:
+                kind, payload = "delta", delta
+        data = zlib.compress(json.dumps(payload, separators=(",", ":")).encode("utf-8"))
+        conn.execute("INSERT INTO wo_versions (wo_number, version, created, kind, data) VALUES (?, ?, ?, ?, ?)",
+                     (wo_number, version, now, kind, data))
+        return version
+
+    def _version_snapshot(self, conn, wo_number, version):
+        """Rebuilds a version from its nearest full checkpoint and the deltas after it."""
+        rows = conn.execute("""
+            SELECT version, kind, data FROM wo_versions
+            WHERE wo_number = ? AND version <= ?
+              AND version >= (SELECT MAX(version) FROM wo_versions
+                              WHERE wo_number = ? AND version <= ? AND kind = 'full')
+            ORDER BY version
+        """, (wo_number, version, wo_number, version)).fetchall()
+        if not rows or rows[-1]["version"] != version:
+            raise KeyError(f"WO {wo_number} has no version {version}")
+        snapshot = None
+        for row in rows:
+            payload = json.loads(zlib.decompress(row["data"]).decode("utf-8"))
+            snapshot = payload if row["kind"] == "full" else self._apply_delta(snapshot, payload)
+        return snapshot
+
+    def list_versions(self, wo_number):
+        """Returns the saved versions of a WO (version, created, kind, size), newest first."""
+        rows = self._connection().execute("""
+            SELECT version, created, kind, LENGTH(data) AS size FROM wo_versions
+            WHERE wo_number = ? ORDER BY version DESC
+        """, (wo_number,))
+        return [dict(row) for row in rows]
+
+    def version_state(self, wo_number, version):
+        """Returns a past version in the ``load_state`` shape, with the wording it was saved with."""
+        conn = self._connection()
+        snapshot = self._version_snapshot(conn, wo_number, version)
+        state = {"selected_items": {}, "item_photos": dict(snapshot["photos"])}
+        for row_key, row in sorted(snapshot["rows"].items(), key=lambda entry: entry[1]["position"]):
+            category, item_key = row_key.split("\t", 1)
+            state["selected_items"].setdefault(category, {})[item_key] = {
+                "selected": bool(row["selected"]),
+                "template": row["template"],
+                "qty": row["qty"],
+                "unit_price": row["unit_price"],
+                "location": row["location"],
+                "add_info": row["add_info"],
+                "original_name": row["original_name"],
+                "instance_info": json.loads(row["instance_info"] or "{}"),
+                "conjunction_key": row["conjunction_key"],
+                "edited_preview": row.get("edited_preview") or "",
+            }
+        return state
+
+    def diff_versions(self, wo_number, old_version, new_version):
+        """Lists what changed between two versions.
+
+        Each change is a dict with category, item_key, field and the old and
+        new values. Rows added or removed as a whole have field "row".
+        """
+        conn = self._connection()
+        old = self._version_snapshot(conn, wo_number, old_version)
+        new = self._version_snapshot(conn, wo_number, new_version)
+        changes = []
+        for row_key in sorted(set(old["rows"]) | set(new["rows"])):
+            category, item_key = row_key.split("\t", 1)
+            old_row, new_row = old["rows"].get(row_key), new["rows"].get(row_key)
+            if old_row is None or new_row is None:
+                changes.append({"category": category, "item_key": item_key, "field": "row",
+                                "old": "present" if old_row else None, "new": "present" if new_row else None})
+                continue
+            for field in self.DIFF_FIELDS:
+                if old_row.get(field) != new_row.get(field):
+                    changes.append({"category": category, "item_key": item_key, "field": field,
+                                    "old": old_row.get(field), "new": new_row.get(field)})
+        for photo_key in sorted(set(old["photos"]) | set(new["photos"])):
+            if old["photos"].get(photo_key) != new["photos"].get(photo_key):
+                changes.append({"category": "", "item_key": photo_key, "field": "photo",
+                                "old": old["photos"].get(photo_key), "new": new["photos"].get(photo_key)})
+        return changes
+
+    def restore_version(self, wo_number, version):
+        """Makes a past version current again. The restore itself becomes a new version.
+
+        Journaled edits of the WO are dropped with it, so they are not offered
+        for replay on top of the restored version.
+        """
+        state = self.version_state(wo_number, version)
+        conn = self._connection()
+        with conn:
+            self._write_state(conn, wo_number, state, time.time())
+            conn.execute("DELETE FROM edit_journal WHERE wo_number = ?", (wo_number,))
+
+    # --- Edit journal ---
+    def append_journal(self, wo_number, entries):
+        """Appends ``(category, item_key, field, value)`` edits in one transaction.
+
+        Edits not yet covered by a save survive a crash here and can be
+        replayed with ``journal_entries``. ``save_state`` callers clear them.
+        """
+        if not entries:
+            return
+        now = time.time()
+        conn = self._connection()
+        with conn:
+            conn.executemany(
+                "INSERT INTO edit_journal (wo_number, category, item_key, field, value, recorded) VALUES (?, ?, ?, ?, ?, ?)",
+                [(wo_number, category, item_key, field, value, now) for category, item_key, field, value in entries])
+
+    def journal_entries(self, wo_number):
+        """Returns the journaled edits of ``wo_number`` in the order they were made."""
+        rows = self._connection().execute(
+            "SELECT category, item_key, field, value FROM edit_journal WHERE wo_number = ? ORDER BY id", (wo_number,))
+        return [tuple(row) for row in rows]
+
+    def journaled_work_orders(self):
+        """Returns ``(wo_number, edit count, last edit time)`` of every journal, newest first."""
+        rows = self._connection().execute("""
+            SELECT wo_number, COUNT(*) AS edits, MAX(recorded) AS last_edit
+            FROM edit_journal GROUP BY wo_number ORDER BY last_edit DESC
+        """)
+        return [tuple(row) for row in rows]
+
+    def clear_journal(self, wo_number):
+        conn = self._connection()
+        with conn:
+            conn.execute("DELETE FROM edit_journal WHERE wo_number = ?", (wo_number,))
+
+    # --- State files ---
+    @staticmethod
+    def read_state_file(file_path):
+        """Reads a WO state file, gzip-compressed if it ends in .gz."""
+        opener = gzip.open if file_path.endswith(".gz") else open
+        with opener(file_path, 'rt', encoding='utf-8') as f:
+            return json.load(f)
+
+    @staticmethod
+    def write_state_file(file_path, state):
+        """Writes a WO state file; a .gz path is gzip-compressed and not indented."""
+        if file_path.endswith(".gz"):
+            with gzip.open(file_path, 'wt', encoding='utf-8') as f:
+                json.dump(state, f, separators=(",", ":"))
+        else:
+            with open(file_path, 'w', encoding='utf-8') as f:
+                json.dump(state, f, indent=4)
+
+    # --- Migration ---
+    def refresh_index(self):
+        """Picks up WO_*.json(.gz) files dropped into the data folder since the last look.
+
+        Only the directory listing is read when nothing new is there, so the
+        dashboard can call this on every refresh.
+        """
+        self._connection()
+        return self.migrate_json_files()
+
+    def migrate_json_files(self):
+        """Imports WO_*.json(.gz) state files and moves them to ``migrated_json/``.
+
+        A file is imported only if it is newer than the stored copy of the same
+        WO, so an old export dropped back in never overwrites later edits.
+        """
+        try:
+            files = [f for f in os.listdir(self.app_data_dir)
+                     if f.startswith("WO_") and f.endswith(self.STATE_FILE_EXTENSIONS)]
+        except OSError:
+            return 0
+        if not files:
+            return 0
+
+        conn = self._connection()
+        stored_mtimes = dict(conn.execute("SELECT wo_number, modified FROM work_orders").fetchall())
+        migrated_dir = os.path.join(self.app_data_dir, self.MIGRATED_DIRNAME)
+        os.makedirs(migrated_dir, exist_ok=True)
+        imported = 0
+        for file in files:
+            file_path = os.path.join(self.app_data_dir, file)
+            wo_number = file[len("WO_"):].rsplit(".json", 1)[0]
+            try:
+                mtime = os.path.getmtime(file_path)
+                if stored_mtimes.get(wo_number, -1) < mtime:
+                    state = self.read_state_file(file_path)
+                    self.save_state(wo_number, state, modified=mtime)
+                    imported += 1
+                shutil.move(file_path, os.path.join(migrated_dir, file))
+            except Exception as e:
+                print(f"Error migrating {file}: {e}")
+        return imported
+
+
+# Global work order store instance
+wo_store = WOStore()